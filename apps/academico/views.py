@@ -16,9 +16,10 @@ from .serializers import (
     MateriaSerializer,
     MateriaListSerializer
 )
+from common.mixins import AlcanceMixin, ShardUnidadMixin
 
 
-class ProfesorViewSet(viewsets.ModelViewSet):
+class ProfesorViewSet(ShardUnidadMixin, AlcanceMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar Profesores.
 
@@ -36,37 +37,23 @@ class ProfesorViewSet(viewsets.ModelViewSet):
     search_fields = ['nombre', 'email']
     ordering_fields = ['nombre', 'created_at']
     ordering = ['nombre']
+    # Responsables de unidad y de programa ven los profesores de su unidad
+    campo_unidad = 'unidad_academica_id'
 
     def get_serializer_class(self):
         if self.action == 'list':
             return ProfesorListSerializer
         return ProfesorSerializer
 
-    def get_queryset(self):
-        """
-        Filtra profesores según la unidad del usuario.
-        """
-        user = self.request.user
-        queryset = super().get_queryset()
-
-        # Si es responsable de unidad, ver solo profesores de su unidad
-        if hasattr(user, 'unidad_academica') and user.unidad_academica:
-            queryset = queryset.filter(unidad_academica=user.unidad_academica)
-        # Si es responsable de programa, ver profesores de la unidad de su programa
-        elif hasattr(user, 'programa_academico') and user.programa_academico:
-            queryset = queryset.filter(
-                unidad_academica=user.programa_academico.unidad_academica
-            )
-
-        return queryset
-
     @action(detail=True, methods=['get'])
     def cargas(self, request, pk=None):
         """
         Obtiene todas las cargas de un profesor.
+        Incluye las de periodos archivados, que salen de su snapshot.
         GET /api/academico/profesores/{id}/cargas/
         """
         from apps.asignaciones.serializers import CargaListSerializer
+        from apps.asignaciones.services import ArchivoService
 
         profesor = self.get_object()
         cargas = profesor.cargas.all()
@@ -76,8 +63,14 @@ class ProfesorViewSet(viewsets.ModelViewSet):
         if periodo_id:
             cargas = cargas.filter(periodo_id=periodo_id)
 
+        archivadas = ArchivoService.cargas_archivadas(
+            unidad_id=profesor.unidad_academica_id,
+            periodo_id=periodo_id,
+            profesor=profesor.id
+        )
+
         serializer = CargaListSerializer(cargas, many=True)
-        return Response(serializer.data)
+        return Response(serializer.data + ArchivoService.como_lista(archivadas))
 
     @action(detail=True, methods=['get'])
     def disponibilidad(self, request, pk=None):
@@ -115,7 +108,7 @@ class ProfesorViewSet(viewsets.ModelViewSet):
         })
 
 
-class MateriaViewSet(viewsets.ModelViewSet):
+class MateriaViewSet(ShardUnidadMixin, AlcanceMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar Materias.
 
@@ -133,37 +126,23 @@ class MateriaViewSet(viewsets.ModelViewSet):
     search_fields = ['clave', 'nombre']
     ordering_fields = ['clave', 'nombre', 'horas', 'created_at']
     ordering = ['clave']
+    campo_unidad = 'programa_academico__unidad_academica_id'
+    campo_programa = 'programa_academico_id'
 
     def get_serializer_class(self):
         if self.action == 'list':
             return MateriaListSerializer
         return MateriaSerializer
 
-    def get_queryset(self):
-        """
-        Filtra materias según el programa del usuario.
-        """
-        user = self.request.user
-        queryset = super().get_queryset()
-
-        # Si es responsable de unidad, ver todas las materias de su unidad
-        if hasattr(user, 'unidad_academica') and user.unidad_academica:
-            queryset = queryset.filter(
-                programa_academico__unidad_academica=user.unidad_academica
-            )
-        # Si es responsable de programa, ver solo materias de su programa
-        elif hasattr(user, 'programa_academico') and user.programa_academico:
-            queryset = queryset.filter(programa_academico=user.programa_academico)
-
-        return queryset
-
     @action(detail=True, methods=['get'])
     def cargas(self, request, pk=None):
         """
         Obtiene todas las cargas (secciones) de una materia.
+        Incluye las de periodos archivados, que salen de su snapshot.
         GET /api/academico/materias/{id}/cargas/
         """
         from apps.asignaciones.serializers import CargaListSerializer
+        from apps.asignaciones.services import ArchivoService
 
         materia = self.get_object()
         cargas = materia.cargas.all()
@@ -173,5 +152,11 @@ class MateriaViewSet(viewsets.ModelViewSet):
         if periodo_id:
             cargas = cargas.filter(periodo_id=periodo_id)
 
+        archivadas = ArchivoService.cargas_archivadas(
+            unidad_id=materia.programa_academico.unidad_academica_id,
+            periodo_id=periodo_id,
+            materia=materia.id
+        )
+
         serializer = CargaListSerializer(cargas, many=True)
-        return Response(serializer.data)
+        return Response(serializer.data + ArchivoService.como_lista(archivadas))
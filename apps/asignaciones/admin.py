@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Periodo, Carga, BloqueHorario
+from .models import Periodo, Carga, BloqueHorario, PeriodoArchivado
 
 
 @admin.register(Periodo)
@@ -55,3 +55,10 @@ class BloqueHorarioAdmin(admin.ModelAdmin):
     list_filter = ['dia', 'carga__periodo']
     search_fields = ['carga__materia__nombre', 'carga__profesor__nombre']
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(PeriodoArchivado)
+class PeriodoArchivadoAdmin(admin.ModelAdmin):
+    list_display = ['periodo', 'total_cargas', 'total_bloques', 'created_at']
+    exclude = ['documento']
+    readonly_fields = ['periodo', 'total_cargas', 'total_bloques', 'created_at']
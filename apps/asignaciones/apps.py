@@ -5,3 +5,13 @@ class AsignacionesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.asignaciones'
     verbose_name = 'Asignaciones'
+
+    def ready(self):
+        from django.db.models.signals import post_save
+        from .models import Periodo
+        from .signals import descartar_snapshot_en_cache
+
+        post_save.connect(
+            descartar_snapshot_en_cache, sender=Periodo,
+            dispatch_uid='descartar_snapshot_en_cache'
+        )
@@ -0,0 +1,305 @@
+"""
+Suite de rendimiento de validadores, servicios, serializers y endpoints.
+
+Mide sobre los datos de la base configurada (p. ej. los de
+scripts/generar_datos_masivos.py) y produce un resultado en JSON que puede
+compararse con el de otro commit (ver el comando `benchmark`).
+
+Cada caso se ejecuta una vez para calentar y luego `repeticiones` veces;
+se reportan la mediana, el p95 y el mínimo en milisegundos, y las consultas
+SQL de una ejecución (deterministas para los mismos datos).
+"""
+
+import statistics
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import time as hora
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.core.models import Usuario
+from apps.asignaciones.models import Periodo, Carga, BloqueHorario
+from apps.asignaciones.serializers import (
+    CargaListSerializer,
+    CargaSerializer,
+    CargaDetailSerializer
+)
+from apps.asignaciones.services import ValidadorConflictos, ValidadorHoras, PeriodoService
+
+VERSION_RESULTADO = 1
+MUESTRA_VALIDADORES = 100
+TAMANOS_SERIALIZACION = (100, 1000)
+# Datos del entorno que deben coincidir para comparar dos resultados
+ENTORNO_COMPARABLE = ('vendor', 'periodo_id', 'cargas_periodo')
+
+
+@dataclass
+class Caso:
+    nombre: str
+    ejecutar: Callable[[], object]
+
+
+class _ContadorConsultas:
+    """execute_wrapper que cuenta las consultas de todas las bases."""
+
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        return execute(sql, params, many, context)
+
+
+class SuiteRendimiento:
+    """
+    Casos de la suite sobre un periodo: por defecto el que tiene más cargas.
+    """
+
+    def __init__(self, periodo: Optional[Periodo] = None, repeticiones: int = 5):
+        self.periodo = periodo or self._periodo_mayor()
+        self.repeticiones = repeticiones
+
+    @staticmethod
+    def _periodo_mayor() -> Periodo:
+        periodo = (
+            Periodo.objects.annotate(total=Count('cargas'))
+            .filter(total__gt=0)
+            .order_by('-total', 'id')
+            .first()
+        )
+        if periodo is None:
+            raise ValueError(
+                'No hay cargas en la base. Generar datos con '
+                'python scripts/generar_datos_masivos.py'
+            )
+        return periodo
+
+    def casos(self) -> List[Caso]:
+        periodo = self.periodo
+        cargas = Carga.objects.filter(periodo=periodo).order_by('id')
+        muestra = list(
+            cargas.filter(profesor__isnull=False, bloques__isnull=False)
+            .distinct()[:MUESTRA_VALIDADORES]
+        )
+        profesor_id = (
+            cargas.filter(profesor__isnull=False)
+            .values('profesor_id')
+            .annotate(total=Count('id'))
+            .order_by('-total', 'profesor_id')
+            .values_list('profesor_id', flat=True)
+            .first()
+        )
+        bloques = [
+            BloqueHorario(dia=dia, hora_inicio=hora(8), hora_fin=hora(10))
+            for dia in ('LUN', 'MIE', 'VIE')
+        ]
+
+        casos = [
+            Caso(
+                f'validador_conflictos.detectar_conflicto_carga[{len(muestra)}]',
+                lambda: [ValidadorConflictos.detectar_conflicto_carga(c) for c in muestra]
+            ),
+        ]
+        if profesor_id is not None:
+            casos += [
+                Caso(
+                    'validador_conflictos.validar_disponibilidad_profesor',
+                    lambda: ValidadorConflictos.validar_disponibilidad_profesor(
+                        profesor_id, periodo.id, bloques
+                    )
+                ),
+                Caso(
+                    'validador_conflictos.obtener_cargas_profesor_periodo',
+                    lambda: list(ValidadorConflictos.obtener_cargas_profesor_periodo(profesor_id, periodo))
+                ),
+            ]
+        casos += [
+            Caso(
+                f'validador_horas.calcular_total_horas_bloques[{len(muestra)}]',
+                lambda: [ValidadorHoras.calcular_total_horas_bloques(c) for c in muestra]
+            ),
+            Caso(
+                f'validador_horas.validar_horas_carga[{len(muestra)}]',
+                lambda: [ValidadorHoras.validar_horas_carga(c) for c in muestra]
+            ),
+            Caso(
+                'periodo_service.obtener_estadisticas_periodo',
+                lambda: PeriodoService.obtener_estadisticas_periodo(periodo)
+            ),
+            Caso(
+                'periodo_service.validar_periodo',
+                lambda: PeriodoService.validar_periodo(periodo)
+            ),
+        ]
+
+        # Mismo queryset que CargaViewSet (select_related + prefetch de bloques)
+        from apps.asignaciones.views import CargaViewSet
+        base = CargaViewSet.queryset.filter(periodo=periodo).order_by('id')
+        for serializer_class in (CargaListSerializer, CargaSerializer, CargaDetailSerializer):
+            for tamano in TAMANOS_SERIALIZACION:
+                casos.append(Caso(
+                    f'serializer.{serializer_class.__name__}[{tamano}]',
+                    self._serializar(serializer_class, base, tamano)
+                ))
+
+        client = self._cliente()
+        for nombre, url in [
+            ('carga-list', f'/api/asignaciones/cargas/?periodo={periodo.id}'),
+            ('periodo-list', '/api/asignaciones/periodos/'),
+            ('periodo-estadisticas', f'/api/asignaciones/periodos/{periodo.id}/estadisticas/'),
+            ('profesor-list', '/api/academico/profesores/'),
+            ('materia-list', '/api/academico/materias/'),
+            ('bloquehorario-list', '/api/asignaciones/bloques-horarios/'),
+        ]:
+            casos.append(Caso(f'endpoint.{nombre}', self._peticion(client, url)))
+
+        return casos
+
+    @staticmethod
+    def _serializar(serializer_class, queryset, tamano):
+        return lambda: serializer_class(list(queryset[:tamano]), many=True).data
+
+    def _cliente(self):
+        """
+        APIClient con el JWT de un responsable de la unidad del periodo: las
+        peticiones pasan por la autenticación y el alcance reales.
+        """
+        from apps.core.serializers import TokenAlcanceSerializer
+
+        usuario = Usuario.objects.filter(
+            unidad_academica_id=self.periodo.unidad_academica_id,
+            rol=Usuario.Rol.RESP_UNIDAD,
+            is_active=True
+        ).order_by('id').first()
+        if usuario is None:
+            raise ValueError(
+                f'La unidad {self.periodo.unidad_academica_id} no tiene responsable '
+                'para autenticar las peticiones.'
+            )
+        token = TokenAlcanceSerializer.get_token(usuario).access_token
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    @staticmethod
+    def _peticion(client, url):
+        def ejecutar():
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f'GET {url} respondió {response.status_code}')
+            return response
+        return ejecutar
+
+    def medir(self, caso: Caso) -> Dict:
+        caso.ejecutar()
+
+        tiempos = []
+        contador = _ContadorConsultas()
+        for _ in range(self.repeticiones):
+            contador.total = 0
+            with ExitStack() as pila:
+                for conexion in connections.all():
+                    pila.enter_context(conexion.execute_wrapper(contador))
+                inicio = time.perf_counter()
+                caso.ejecutar()
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+
+        tiempos.sort()
+        return {
+            'repeticiones': self.repeticiones,
+            'mediana_ms': round(statistics.median(tiempos), 3),
+            'p95_ms': round(tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))], 3),
+            'min_ms': round(tiempos[0], 3),
+            'consultas': contador.total,
+        }
+
+    def ejecutar(self, filtro: Optional[str] = None, progreso=None) -> Dict:
+        """
+        Ejecuta los casos (los que contienen `filtro`, si se indica).
+
+        Returns:
+            {'version', 'fecha', 'entorno': {...}, 'casos': {nombre: medición}}
+        """
+        resultados = {}
+        # Sin throttling: la suite repite a propósito las acciones costosas
+        ajustes = {
+            'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+            'THROTTLE_COSTOS': {accion: 0 for accion in settings.THROTTLE_COSTOS},
+        }
+        with override_settings(**ajustes):
+            for caso in self.casos():
+                if filtro and filtro not in caso.nombre:
+                    continue
+                resultados[caso.nombre] = self.medir(caso)
+                if progreso:
+                    progreso(caso.nombre, resultados[caso.nombre])
+
+        return {
+            'version': VERSION_RESULTADO,
+            'fecha': timezone.now().isoformat(),
+            'entorno': {
+                'vendor': connections['default'].vendor,
+                'periodo_id': self.periodo.id,
+                'cargas_periodo': self.periodo.cargas.count(),
+                'cargas_total': Carga.objects.count(),
+            },
+            'casos': resultados,
+        }
+
+
+def comparar(
+    actual: Dict,
+    base: Dict,
+    umbral: float,
+    minimo_ms: float,
+    ignorar_entorno: bool = False
+) -> List[str]:
+    """
+    Regresiones de `actual` respecto a `base`: casos cuya mediana supera la
+    base en más de `umbral` (fracción) y de `minimo_ms`, o que hacen más
+    consultas. Los casos que no están en ambos resultados se ignoran.
+
+    Raises:
+        ValueError: Si los resultados se midieron sobre otro periodo, otro
+            volumen de cargas u otra base de datos (salvo `ignorar_entorno`)
+    """
+    diferencias = diferencias_de_entorno(actual, base)
+    if diferencias and not ignorar_entorno:
+        raise ValueError(
+            'Los resultados no son comparables: ' + '; '.join(diferencias) + '.'
+        )
+
+    regresiones = []
+    for nombre, medicion in actual['casos'].items():
+        anterior = base.get('casos', {}).get(nombre)
+        if anterior is None:
+            continue
+
+        limite = anterior['mediana_ms'] * (1 + umbral)
+        if medicion['mediana_ms'] > limite and medicion['mediana_ms'] - anterior['mediana_ms'] > minimo_ms:
+            regresiones.append(
+                f"{nombre}: mediana {medicion['mediana_ms']} ms > {anterior['mediana_ms']} ms "
+                f"(+{umbral:.0%})"
+            )
+        if medicion['consultas'] > anterior['consultas']:
+            regresiones.append(
+                f"{nombre}: {medicion['consultas']} consultas > {anterior['consultas']}"
+            )
+    return regresiones
+
+
+def diferencias_de_entorno(actual: Dict, base: Dict) -> List[str]:
+    """Claves de ENTORNO_COMPARABLE con distinto valor en los dos resultados."""
+    entorno, anterior = actual.get('entorno', {}), base.get('entorno', {})
+    return [
+        f'{clave} {anterior.get(clave)} -> {entorno.get(clave)}'
+        for clave in ENTORNO_COMPARABLE
+        if entorno.get(clave) != anterior.get(clave)
+    ]
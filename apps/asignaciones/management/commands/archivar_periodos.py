@@ -0,0 +1,44 @@
+"""
+Archiva los periodos finalizados que aún ocupan las tablas de cargas y bloques.
+
+Uso:
+    python manage.py archivar_periodos
+    python manage.py archivar_periodos --periodo 12
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.asignaciones.models import Periodo
+from apps.asignaciones.services import ArchivoService
+
+
+class Command(BaseCommand):
+    help = 'Archiva los periodos finalizados (documento comprimido por periodo).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--periodo',
+            type=int,
+            action='append',
+            dest='periodos',
+            help='ID de periodo a archivar (repetible). Por defecto, todos los finalizados.'
+        )
+
+    def handle(self, *args, **options):
+        periodos = Periodo.objects.filter(finalizado=True).exclude(archivo__filas_eliminadas=True)
+        if options['periodos']:
+            periodos = periodos.filter(id__in=options['periodos'])
+
+        archivados = 0
+        for periodo in periodos.order_by('id'):
+            resultado = ArchivoService.archivar_periodo(periodo)
+            if resultado['success']:
+                archivados += 1
+                self.stdout.write(
+                    f"{periodo.nombre} (id {periodo.id}): "
+                    f"{resultado['cargas']} cargas, {resultado['bloques']} bloques"
+                )
+            else:
+                self.stdout.write(self.style.WARNING(f"{periodo.nombre}: {resultado['mensaje']}"))
+
+        self.stdout.write(self.style.SUCCESS(f'{archivados} periodo(s) archivado(s).'))
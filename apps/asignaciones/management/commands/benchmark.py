@@ -0,0 +1,99 @@
+"""
+Ejecuta la suite de rendimiento (apps.asignaciones.benchmarks) y, si se
+indica un resultado base, falla ante regresiones.
+
+Uso:
+    python manage.py benchmark --salida actual.json
+    python manage.py benchmark --base anterior.json --umbral 0.25
+    python manage.py benchmark --filtro serializer --repeticiones 10
+
+Un resultado solo se compara con una base medida sobre el mismo periodo,
+con las mismas cargas y el mismo motor de base de datos (--ignorar-entorno
+lo permite igualmente, con un aviso).
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.asignaciones.benchmarks import SuiteRendimiento, comparar, diferencias_de_entorno
+from apps.asignaciones.models import Periodo
+
+
+class Command(BaseCommand):
+    help = 'Mide validadores, servicios, serializers y endpoints; compara contra un resultado base.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--periodo',
+            type=int,
+            help='ID del periodo a medir. Por defecto, el que tiene más cargas.'
+        )
+        parser.add_argument('--repeticiones', type=int, default=5, help='Ejecuciones medidas por caso')
+        parser.add_argument('--filtro', help='Solo los casos cuyo nombre contiene este texto')
+        parser.add_argument('--salida', help='Archivo donde escribir el resultado en JSON')
+        parser.add_argument('--base', help='Resultado JSON de referencia (p. ej. del commit anterior)')
+        parser.add_argument(
+            '--umbral',
+            type=float,
+            default=0.2,
+            help='Aumento máximo de la mediana respecto a la base (fracción, 0.2 = 20%%)'
+        )
+        parser.add_argument(
+            '--minimo-ms',
+            type=float,
+            default=1.0,
+            help='Diferencia mínima en ms para considerar regresión (evita ruido en casos rápidos)'
+        )
+        parser.add_argument(
+            '--ignorar-entorno',
+            action='store_true',
+            help='Comparar aunque el periodo, sus cargas o la base de datos difieran de la base'
+        )
+
+    def handle(self, *args, **options):
+        if options['repeticiones'] < 1:
+            raise CommandError('--repeticiones debe ser al menos 1.')
+
+        periodo = None
+        if options['periodo']:
+            periodo = Periodo.objects.filter(id=options['periodo']).first()
+            if periodo is None:
+                raise CommandError(f"No existe el periodo {options['periodo']}.")
+
+        try:
+            suite = SuiteRendimiento(periodo, repeticiones=options['repeticiones'])
+            resultado = suite.ejecutar(options['filtro'], progreso=self._progreso)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        contenido = json.dumps(resultado, indent=2, ensure_ascii=False)
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                archivo.write(contenido + '\n')
+            self.stderr.write(f"Resultado escrito en {options['salida']}")
+        else:
+            self.stdout.write(contenido)
+
+        if options['base']:
+            with open(options['base'], encoding='utf-8') as archivo:
+                base = json.load(archivo)
+            for diferencia in diferencias_de_entorno(resultado, base):
+                self.stderr.write(self.style.WARNING(f'Entorno distinto de la base: {diferencia}'))
+            try:
+                regresiones = comparar(
+                    resultado, base, options['umbral'], options['minimo_ms'],
+                    ignorar_entorno=options['ignorar_entorno']
+                )
+            except ValueError as e:
+                raise CommandError(f'{e} Usar --ignorar-entorno para comparar igualmente.')
+            if regresiones:
+                for regresion in regresiones:
+                    self.stderr.write(regresion)
+                raise CommandError(f'{len(regresiones)} regresiones respecto a {options["base"]}.')
+            self.stderr.write(self.style.SUCCESS(f"Sin regresiones respecto a {options['base']}."))
+
+    def _progreso(self, nombre, medicion):
+        self.stderr.write(
+            f"{nombre:<58} {medicion['mediana_ms']:>10.2f} ms {medicion['consultas']:>7} consultas"
+        )
@@ -0,0 +1,105 @@
+"""
+Prueba de carga concurrente de la API (apps.asignaciones.prueba_carga).
+
+Uso:
+    python manage.py prueba_carga --hilos 8 --segundos 30
+    python manage.py prueba_carga --procesos 4 --hilos 4 --sin-limites
+    python manage.py prueba_carga --url http://127.0.0.1:8000 --hilos 16
+    python manage.py prueba_carga --mezcla listar=70,validar=30 --json
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.asignaciones.prueba_carga import (
+    MEZCLA_DEFECTO,
+    PASSWORD,
+    PREFIJO_USUARIOS,
+    PruebaCarga,
+    parsear_mezcla
+)
+
+
+class Command(BaseCommand):
+    help = 'Simula programadores concurrentes con una mezcla de operaciones y reporta latencias.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            help='Servidor en marcha (p. ej. http://127.0.0.1:8000). Por defecto, la aplicación WSGI en proceso.'
+        )
+        parser.add_argument('--procesos', type=int, default=1, help='Procesos trabajadores')
+        parser.add_argument('--hilos', type=int, default=4, help='Programadores concurrentes por proceso')
+        parser.add_argument('--segundos', type=float, default=30, help='Duración de la prueba')
+        parser.add_argument(
+            '--mezcla',
+            default=','.join(f'{op}={peso}' for op, peso in MEZCLA_DEFECTO.items()),
+            help='Pesos por operación (listar, validar, crear, actualizar, estadisticas)'
+        )
+        parser.add_argument('--prefijo', default=PREFIJO_USUARIOS, help='Prefijo de los responsables de unidad a usar')
+        parser.add_argument('--password', default=PASSWORD, help='Contraseña de esos usuarios')
+        parser.add_argument('--semilla', type=int, default=1, help='Semilla de la elección de operaciones')
+        parser.add_argument(
+            '--sin-limites',
+            action='store_true',
+            help='En proceso, no aplicar el throttling de acciones costosas'
+        )
+        parser.add_argument(
+            '--conservar',
+            action='store_true',
+            help='No eliminar al final las cargas creadas durante la prueba'
+        )
+        parser.add_argument('--json', action='store_true', help='Imprimir el resultado en JSON')
+
+    def handle(self, *args, **options):
+        if options['procesos'] < 1 or options['hilos'] < 1:
+            raise CommandError('--procesos y --hilos deben ser al menos 1.')
+        if options['sin_limites'] and options['url']:
+            raise CommandError('--sin-limites solo aplica a la aplicación en proceso.')
+
+        try:
+            prueba = PruebaCarga(
+                url=options['url'],
+                procesos=options['procesos'],
+                hilos=options['hilos'],
+                segundos=options['segundos'],
+                mezcla=parsear_mezcla(options['mezcla']),
+                prefijo=options['prefijo'],
+                password=options['password'],
+                semilla=options['semilla'],
+                sin_limites=options['sin_limites']
+            )
+            resultado = prueba.ejecutar()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        creadas = resultado.pop('cargas_creadas')
+        resultado['cargas_creadas'] = len(creadas)
+        if not options['conservar']:
+            PruebaCarga.limpiar(creadas)
+
+        if options['json']:
+            self.stdout.write(json.dumps(resultado, indent=2, ensure_ascii=False))
+        else:
+            self._tabla(resultado)
+
+    def _tabla(self, resultado):
+        configuracion = resultado['configuracion']
+        self.stdout.write(
+            f"{configuracion['destino']}: {configuracion['procesos']} procesos x "
+            f"{configuracion['hilos']} hilos, {configuracion['usuarios']} usuarios, "
+            f"{resultado['duracion_s']} s"
+        )
+        self.stdout.write(
+            f"{'operación':<14}{'peticiones':>11}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+            f"{'p99 ms':>9}{'ok':>8}{'4xx':>7}{'429':>7}{'errores':>9}{'% error':>9}"
+        )
+        filas = list(resultado['operaciones'].items()) + [('total', resultado['total'])]
+        for nombre, fila in filas:
+            self.stdout.write(
+                f"{nombre:<14}{fila['peticiones']:>11}{fila['por_segundo']:>9.1f}"
+                f"{fila['p50_ms']:>9.1f}{fila['p95_ms']:>9.1f}{fila['p99_ms']:>9.1f}"
+                f"{fila['ok']:>8}{fila['rechazadas']:>7}{fila['limitadas']:>7}"
+                f"{fila['errores']:>9}{fila['tasa_error']:>9.2%}"
+            )
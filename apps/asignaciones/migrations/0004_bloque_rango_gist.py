@@ -0,0 +1,38 @@
+# Índice GiST de rangos horarios (solo PostgreSQL)
+
+from django.db import migrations
+
+INDICE = 'bloques_horarios_rango_gist'
+
+# La expresión debe coincidir con la usada en
+# RangoHorario (apps.asignaciones.services.validador_conflictos) para que
+# el planner la use
+EXPRESION = (
+    "tsrange(DATE '2000-01-01' + hora_inicio, DATE '2000-01-01' + hora_fin)"
+)
+
+
+def crear_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {INDICE} '
+        f'ON bloques_horarios USING gist ({EXPRESION})'
+    )
+
+
+def eliminar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDICE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asignaciones', '0003_alter_carga_profesor'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, eliminar_indice),
+    ]
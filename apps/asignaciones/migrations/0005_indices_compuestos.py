@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asignaciones', '0004_bloque_rango_gist'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bloquehorario',
+            index=models.Index(fields=['carga', 'dia', 'hora_inicio', 'hora_fin'], name='bloques_hor_carga_i_f129e1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carga',
+            index=models.Index(fields=['periodo', 'estado'], name='cargas_periodo_7eae39_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carga',
+            index=models.Index(fields=['programa_academico', 'periodo'], name='cargas_program_014107_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carga',
+            index=models.Index(fields=['-created_at'], name='cargas_created_8feb2a_idx'),
+        ),
+    ]
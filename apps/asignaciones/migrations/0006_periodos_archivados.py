@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asignaciones', '0005_indices_compuestos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodoArchivado',
+            fields=[
+                ('periodo', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archivo', serialize=False, to='asignaciones.periodo')),
+                ('documento', models.BinaryField(help_text='JSON comprimido: cargas serializadas y estadísticas del periodo')),
+                ('total_cargas', models.PositiveIntegerField(default=0)),
+                ('total_bloques', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Periodo Archivado',
+                'verbose_name_plural': 'Periodos Archivados',
+                'db_table': 'periodos_archivados',
+            },
+        ),
+        migrations.CreateModel(
+            name='CargaArchivada',
+            fields=[
+                ('id', models.BigIntegerField(help_text='ID original de la carga', primary_key=True, serialize=False)),
+                ('archivo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cargas', to='asignaciones.periodoarchivado')),
+            ],
+            options={
+                'verbose_name': 'Carga Archivada',
+                'verbose_name_plural': 'Cargas Archivadas',
+                'db_table': 'cargas_archivadas',
+            },
+        ),
+    ]
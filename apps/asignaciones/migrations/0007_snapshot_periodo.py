@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:35
+
+from django.db import migrations, models
+
+
+def marcar_archivados(apps, schema_editor):
+    # Hasta ahora solo existían documentos de periodos ya archivados
+    PeriodoArchivado = apps.get_model('asignaciones', 'PeriodoArchivado')
+    PeriodoArchivado.objects.using(schema_editor.connection.alias).update(filas_eliminadas=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asignaciones', '0006_periodos_archivados'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='periodoarchivado',
+            name='filas_eliminadas',
+            field=models.BooleanField(default=False, help_text='True cuando sus cargas y bloques ya salieron de las tablas calientes'),
+        ),
+        migrations.RunPython(marcar_archivados, migrations.RunPython.noop),
+    ]
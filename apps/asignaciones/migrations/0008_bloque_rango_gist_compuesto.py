@@ -0,0 +1,49 @@
+# Índice GiST compuesto (carga, día, rango horario) con btree_gist (solo PostgreSQL)
+#
+# La consulta de conflictos filtra primero por carga (profesor y periodo) y
+# día; el índice de 0004, solo sobre el rango, no se usaba para ella.
+
+from django.db import migrations
+
+INDICE_ANTERIOR = 'bloques_horarios_rango_gist'
+INDICE = 'bloques_horarios_carga_dia_rango_gist'
+
+# La expresión debe coincidir con la usada en
+# RangoHorario (apps.asignaciones.services.validador_conflictos) para que
+# el planner la use
+EXPRESION = (
+    "tsrange(DATE '2000-01-01' + hora_inicio, DATE '2000-01-01' + hora_fin)"
+)
+
+
+def crear_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # btree_gist permite columnas de igualdad (carga_id, dia) en un índice GiST
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDICE_ANTERIOR}')
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {INDICE} '
+        f'ON bloques_horarios USING gist (carga_id, dia, {EXPRESION})'
+    )
+
+
+def eliminar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDICE}')
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {INDICE_ANTERIOR} '
+        f'ON bloques_horarios USING gist ({EXPRESION})'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asignaciones', '0007_snapshot_periodo'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, eliminar_indice),
+    ]
@@ -89,6 +89,12 @@ class Carga(models.Model):
         indexes = [
             models.Index(fields=['profesor', 'periodo']),
             models.Index(fields=['estado']),
+            # Conteos por estado de un periodo (cubre la consulta completa)
+            models.Index(fields=['periodo', 'estado']),
+            # Cargas de un programa (alcance de RESP_PROGRAMA) por periodo
+            models.Index(fields=['programa_academico', 'periodo']),
+            # Orden por defecto del listado
+            models.Index(fields=['-created_at']),
         ]
 
     def __str__(self):
@@ -133,9 +139,68 @@ class BloqueHorario(models.Model):
         verbose_name = 'Bloque Horario'
         verbose_name_plural = 'Bloques Horarios'
         ordering = ['dia', 'hora_inicio']
+        indexes = [
+            # Bloques de una carga en su orden natural; hora_fin lo hace
+            # cubriente para las comprobaciones de solapamiento
+            models.Index(fields=['carga', 'dia', 'hora_inicio', 'hora_fin']),
+        ]
 
     def __str__(self):
         return (
             f"{self.get_dia_display()} "
             f"{self.hora_inicio.strftime('%H:%M')}-{self.hora_fin.strftime('%H:%M')}"
         )
+
+
+class PeriodoArchivado(models.Model):
+    """
+    Documento congelado (snapshot) de un periodo finalizado: sus cargas
+    serializadas y estadísticas en JSON comprimido con zlib. Se crea al
+    finalizar el periodo; al archivarlo, sus cargas y bloques se eliminan
+    de las tablas `cargas`/`bloques_horarios` y solo queda el documento.
+    """
+    periodo = models.OneToOneField(
+        Periodo,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='archivo'
+    )
+    documento = models.BinaryField(
+        help_text='JSON comprimido: cargas serializadas y estadísticas del periodo'
+    )
+    total_cargas = models.PositiveIntegerField(default=0)
+    total_bloques = models.PositiveIntegerField(default=0)
+    filas_eliminadas = models.BooleanField(
+        default=False,
+        help_text='True cuando sus cargas y bloques ya salieron de las tablas calientes'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'periodos_archivados'
+        verbose_name = 'Periodo Archivado'
+        verbose_name_plural = 'Periodos Archivados'
+
+    def __str__(self):
+        return f"Archivo de {self.periodo_id} ({self.total_cargas} cargas)"
+
+
+class CargaArchivada(models.Model):
+    """
+    Índice mínimo carga -> documento, para resolver GET /cargas/{id}/
+    desde el snapshot de su periodo.
+    """
+    id = models.BigIntegerField(primary_key=True, help_text='ID original de la carga')
+    archivo = models.ForeignKey(
+        PeriodoArchivado,
+        on_delete=models.CASCADE,
+        related_name='cargas'
+    )
+
+    class Meta:
+        db_table = 'cargas_archivadas'
+        verbose_name = 'Carga Archivada'
+        verbose_name_plural = 'Cargas Archivadas'
+
+    def __str__(self):
+        return f"Carga {self.id} (archivo {self.archivo_id})"
@@ -0,0 +1,470 @@
+"""
+Prueba de carga concurrente de la API con una mezcla realista de operaciones.
+
+Cada trabajador simula a un responsable de unidad (por defecto los usuarios
+`sintetico_unidad_<id>` de scripts/generar_datos_masivos.py) que, con su
+JWT, repite operaciones elegidas al azar según la mezcla:
+- listar: una página del listado de cargas de un periodo
+- validar: validar_disponibilidad de un profesor en un horario
+- crear: una carga completa (profesor y bloques que suman las horas)
+- actualizar: PATCH de los bloques de una carga creada por el trabajador
+- estadisticas: estadísticas de un periodo
+
+Se ejecuta contra un servidor en marcha (`url`) o, por defecto, contra la
+aplicación WSGI en este proceso. Con varios procesos cada uno ejecuta sus
+hilos con su propia aplicación y sus conexiones, como los workers de
+gunicorn. El catálogo (periodos, materias, profesores) se lee de la base
+configurada, que debe ser la misma que usa el servidor. Los modelos se
+importan dentro de las funciones: los procesos hijos importan este módulo
+antes de django.setup().
+
+Las respuestas 4xx (conflictos de horario, horas que no coinciden) son
+parte de la carga real y se cuentan como rechazadas; los 429 del throttling
+como limitadas; los 5xx y las excepciones (p. ej. 'database is locked' o
+timeouts) como errores.
+"""
+
+import json
+import logging
+import math
+import os
+import random
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import get_context
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+
+
+OPERACIONES = ('listar', 'validar', 'crear', 'actualizar', 'estadisticas')
+MEZCLA_DEFECTO = {'listar': 40, 'validar': 25, 'crear': 10, 'actualizar': 10, 'estadisticas': 15}
+PREFIJO_USUARIOS = 'sintetico_unidad_'
+PASSWORD = 'desarrollo123'
+
+DIAS = ['LUN', 'MAR', 'MIE', 'JUE', 'VIE']
+HORA_INICIO = 7
+HORA_FIN = 21
+MUESTRA_CATALOGO = 200
+PAGINAS_LISTADO = 3
+
+
+def parsear_mezcla(texto: str) -> Dict[str, int]:
+    """'listar=40,crear=10' -> {'listar': 40, 'crear': 10}"""
+    mezcla = {}
+    for parte in texto.split(','):
+        nombre, _, peso = parte.partition('=')
+        nombre = nombre.strip()
+        if nombre not in OPERACIONES:
+            raise ValueError(f"Operación desconocida '{nombre}'. Opciones: {', '.join(OPERACIONES)}.")
+        try:
+            mezcla[nombre] = int(peso)
+        except ValueError:
+            raise ValueError(f"Peso inválido para '{nombre}': '{peso}'.")
+    if not any(peso > 0 for peso in mezcla.values()):
+        raise ValueError('La mezcla necesita al menos una operación con peso positivo.')
+    return mezcla
+
+
+def percentil(ordenados: List[float], p: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    if not ordenados:
+        return 0.0
+    return ordenados[max(0, math.ceil(p * len(ordenados)) - 1)]
+
+
+class ClienteWSGI:
+    """Peticiones a la aplicación en este proceso (un cliente por hilo)."""
+
+    def __init__(self):
+        self._client = Client(raise_request_exception=False)
+
+    def peticion(self, metodo, ruta, token=None, cuerpo=None):
+        extra = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        response = self._client.generic(
+            metodo,
+            ruta,
+            json.dumps(cuerpo) if cuerpo is not None else '',
+            content_type='application/json',
+            **extra
+        )
+        return response.status_code, response.content
+
+
+class ClienteHTTP:
+    """Peticiones a un servidor en marcha."""
+
+    def __init__(self, url, timeout=30):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def peticion(self, metodo, ruta, token=None, cuerpo=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        datos = json.dumps(cuerpo).encode() if cuerpo is not None else None
+        solicitud = urllib.request.Request(self.url + ruta, data=datos, method=metodo, headers=headers)
+        try:
+            with urllib.request.urlopen(solicitud, timeout=self.timeout) as respuesta:
+                return respuesta.status, respuesta.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+def crear_cliente(url):
+    return ClienteHTTP(url) if url else ClienteWSGI()
+
+
+class Programador:
+    """
+    Un trabajador: usuario, su catálogo y las cargas que ha creado.
+    Cada operación devuelve (método, ruta, cuerpo).
+    """
+
+    def __init__(self, escenario, semilla):
+        self.token = escenario['token']
+        self.periodos = escenario['periodos']
+        self.materias = escenario['materias']
+        self.profesores = escenario['profesores']
+        self.rng = random.Random(semilla)
+        self.creadas = []
+
+    def listar(self):
+        periodo = self.rng.choice(self.periodos)
+        pagina = self.rng.randint(1, PAGINAS_LISTADO)
+        return 'GET', f'/api/asignaciones/cargas/?periodo={periodo}&page={pagina}', None
+
+    def validar(self):
+        return 'POST', '/api/asignaciones/cargas/validar_disponibilidad/', {
+            'profesor_id': self.rng.choice(self.profesores),
+            'periodo_id': self.rng.choice(self.periodos),
+            'bloques': self._bloques(self.rng.choice(self.materias)['horas']),
+        }
+
+    def crear(self):
+        materia = self.rng.choice(self.materias)
+        return 'POST', '/api/asignaciones/cargas/', {
+            'programa_academico': materia['programa_academico_id'],
+            'materia': materia['id'],
+            'periodo': self.rng.choice(self.periodos),
+            'profesor': self.rng.choice(self.profesores),
+            'bloques': self._bloques(materia['horas']),
+        }
+
+    def actualizar(self):
+        carga_id, horas = self.rng.choice(self.creadas)
+        return 'PATCH', f'/api/asignaciones/cargas/{carga_id}/', {'bloques': self._bloques(horas)}
+
+    def estadisticas(self):
+        periodo = self.rng.choice(self.periodos)
+        return 'GET', f'/api/asignaciones/periodos/{periodo}/estadisticas/', None
+
+    def creada(self, contenido, cuerpo):
+        """Guarda la carga creada (id y horas) para actualizarla después."""
+        horas = sum(
+            int(bloque['hora_fin'][:2]) - int(bloque['hora_inicio'][:2])
+            for bloque in cuerpo['bloques']
+        )
+        self.creadas.append((json.loads(contenido)['id'], horas))
+
+    def _bloques(self, horas):
+        """Las horas repartidas en hasta 5 bloques, en días distintos."""
+        horas = max(1, horas)
+        n = min(len(DIAS), math.ceil(horas / 2))
+        base, resto = divmod(horas, n)
+        bloques = []
+        for i, dia in enumerate(self.rng.sample(DIAS, n)):
+            duracion = min(base + (1 if i < resto else 0), HORA_FIN - HORA_INICIO)
+            inicio = self.rng.randint(HORA_INICIO, HORA_FIN - duracion)
+            bloques.append({
+                'dia': dia,
+                'hora_inicio': f'{inicio:02d}:00:00',
+                'hora_fin': f'{inicio + duracion:02d}:00:00',
+            })
+        return bloques
+
+
+def _trabajar(escenario, semilla, mezcla, fin, url):
+    """Bucle de un hilo hasta `fin` (time.time()). Devuelve (muestras, creadas)."""
+    cliente = crear_cliente(url)
+    programador = Programador(escenario, semilla)
+    operaciones = list(mezcla)
+    pesos = [mezcla[operacion] for operacion in operaciones]
+    muestras = []
+
+    while time.time() < fin:
+        operacion = programador.rng.choices(operaciones, pesos)[0]
+        if operacion == 'actualizar' and not programador.creadas:
+            operacion = 'crear'
+        metodo, ruta, cuerpo = getattr(programador, operacion)()
+
+        inicio = time.perf_counter()
+        try:
+            estado, contenido = cliente.peticion(metodo, ruta, programador.token, cuerpo)
+        except Exception:
+            estado, contenido = 0, b''
+        muestras.append((operacion, (time.perf_counter() - inicio) * 1000, estado))
+
+        if operacion == 'crear' and estado == 201:
+            programador.creada(contenido, cuerpo)
+
+    return muestras, [carga_id for carga_id, _ in programador.creadas]
+
+
+def _trabajar_en_hilo(*args):
+    try:
+        return _trabajar(*args)
+    finally:
+        # En modo WSGI cada hilo abrió sus propias conexiones
+        connections.close_all()
+
+
+def _ejecutar_hilos(escenarios, semillas, mezcla, fin, url):
+    """Un trabajador por escenario; con uno solo, en el hilo actual."""
+    if len(escenarios) == 1:
+        return [_trabajar(escenarios[0], semillas[0], mezcla, fin, url)]
+    with ThreadPoolExecutor(max_workers=len(escenarios)) as pool:
+        futuros = [
+            pool.submit(_trabajar_en_hilo, escenario, semilla, mezcla, fin, url)
+            for escenario, semilla in zip(escenarios, semillas)
+        ]
+        return [futuro.result() for futuro in futuros]
+
+
+@contextmanager
+def _sin_avisos_de_rechazo():
+    """
+    En proceso, django.request registra cada 4xx como warning; los
+    rechazos son esperados en la prueba, así que solo quedan los 5xx.
+    """
+    logger = logging.getLogger('django.request')
+    nivel = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        yield
+    finally:
+        logger.setLevel(nivel)
+
+
+def _inicializar_proceso(modulo_settings, ajustes):
+    """Initializer de los procesos hijos (arrancan con 'spawn')."""
+    import django
+
+    os.environ['DJANGO_SETTINGS_MODULE'] = modulo_settings
+    django.setup()
+    if ajustes:
+        override_settings(**ajustes).enable()
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+
+
+def _ejecutar_proceso(escenarios, semillas, mezcla, fin, url):
+    return _ejecutar_hilos(escenarios, semillas, mezcla, fin, url)
+
+
+class PruebaCarga:
+    """
+    Prepara usuarios y catálogo, ejecuta los trabajadores y resume.
+
+    Args:
+        url: Servidor en marcha (p. ej. http://127.0.0.1:8000); None para
+            usar la aplicación WSGI en proceso
+        procesos: Procesos, cada uno con `hilos` trabajadores
+        hilos: Trabajadores (programadores concurrentes) por proceso
+        segundos: Duración de la prueba
+        mezcla: Pesos por operación (MEZCLA_DEFECTO si no se indica)
+        prefijo: Prefijo de los usuarios responsables de unidad a usar
+        password: Contraseña de esos usuarios, para obtener su JWT
+        sin_limites: En proceso, deja sin costo las acciones costosas para
+            que el throttling no domine el resultado
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        procesos: int = 1,
+        hilos: int = 4,
+        segundos: float = 30,
+        mezcla: Optional[Dict[str, int]] = None,
+        prefijo: str = PREFIJO_USUARIOS,
+        password: str = PASSWORD,
+        semilla: int = 1,
+        sin_limites: bool = False
+    ):
+        self.url = url
+        self.procesos = procesos
+        self.hilos = hilos
+        self.segundos = segundos
+        self.mezcla = {op: peso for op, peso in (mezcla or MEZCLA_DEFECTO).items() if peso > 0}
+        self.prefijo = prefijo
+        self.password = password
+        self.semilla = semilla
+        self.sin_limites = sin_limites
+
+    def ajustes(self) -> Dict:
+        """Settings de la aplicación en proceso (vacío contra un servidor)."""
+        if self.url:
+            return {}
+        ajustes = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver']}
+        if self.sin_limites:
+            ajustes['THROTTLE_COSTOS'] = {accion: 0 for accion in settings.THROTTLE_COSTOS}
+        return ajustes
+
+    def escenarios(self) -> List[Dict]:
+        """Un escenario (token y catálogo de su unidad) por usuario utilizable."""
+        from apps.core.models import Usuario
+        from apps.academico.models import Profesor, Materia
+        from apps.asignaciones.models import Periodo
+
+        usuarios = Usuario.objects.filter(
+            username__startswith=self.prefijo,
+            rol=Usuario.Rol.RESP_UNIDAD,
+            unidad_academica__isnull=False,
+            is_active=True
+        ).order_by('id')
+
+        cliente = crear_cliente(self.url)
+        escenarios = []
+        for usuario in usuarios[:self.procesos * self.hilos]:
+            unidad_id = usuario.unidad_academica_id
+            periodos = list(
+                Periodo.objects.filter(unidad_academica_id=unidad_id, finalizado=False)
+                .order_by('id').values_list('id', flat=True)
+            )
+            materias = list(
+                Materia.objects.filter(programa_academico__unidad_academica_id=unidad_id, horas__gt=0)
+                .order_by('id').values('id', 'programa_academico_id', 'horas')[:MUESTRA_CATALOGO]
+            )
+            profesores = list(
+                Profesor.objects.filter(unidad_academica_id=unidad_id)
+                .order_by('id').values_list('id', flat=True)[:MUESTRA_CATALOGO]
+            )
+            if not (periodos and materias and profesores):
+                continue
+
+            estado, contenido = cliente.peticion('POST', '/api/token/', cuerpo={
+                'username': usuario.username,
+                'password': self.password,
+            })
+            if estado != 200:
+                raise ValueError(f'No se pudo obtener el token de {usuario.username} (HTTP {estado}).')
+
+            escenarios.append({
+                'usuario': usuario.username,
+                'token': json.loads(contenido)['access'],
+                'periodos': periodos,
+                'materias': materias,
+                'profesores': profesores,
+            })
+
+        if not escenarios:
+            raise ValueError(
+                f"No hay responsables de unidad '{self.prefijo}*' con periodos abiertos, "
+                'materias y profesores. Generar datos con python scripts/generar_datos_masivos.py'
+            )
+        return escenarios
+
+    def ejecutar(self) -> Dict:
+        """
+        Returns:
+            {'configuracion': {...}, 'duracion_s', 'operaciones': {op: resumen},
+             'total': resumen, 'cargas_creadas': [ids]}
+        """
+        with override_settings(**self.ajustes()), _sin_avisos_de_rechazo():
+            escenarios = self.escenarios()
+            trabajadores = self.procesos * self.hilos
+            asignados = [escenarios[i % len(escenarios)] for i in range(trabajadores)]
+            semillas = [self.semilla * 1000 + i for i in range(trabajadores)]
+
+            inicio = time.perf_counter()
+            fin = time.time() + self.segundos
+            if self.procesos == 1:
+                resultados = _ejecutar_hilos(asignados, semillas, self.mezcla, fin, self.url)
+            else:
+                resultados = self._ejecutar_procesos(asignados, semillas, fin)
+            duracion = time.perf_counter() - inicio
+
+        muestras = [muestra for parcial, _ in resultados for muestra in parcial]
+        return {
+            'configuracion': {
+                'destino': self.url or 'wsgi',
+                'procesos': self.procesos,
+                'hilos': self.hilos,
+                'usuarios': len(escenarios),
+                'mezcla': self.mezcla,
+                'vendor': connections['default'].vendor,
+            },
+            'duracion_s': round(duracion, 3),
+            **resumir(muestras, duracion),
+            'cargas_creadas': [carga_id for _, creadas in resultados for carga_id in creadas],
+        }
+
+    def _ejecutar_procesos(self, asignados, semillas, fin):
+        contexto = get_context('spawn')
+        with ProcessPoolExecutor(
+            max_workers=self.procesos,
+            mp_context=contexto,
+            initializer=_inicializar_proceso,
+            initargs=(os.environ['DJANGO_SETTINGS_MODULE'], self.ajustes())
+        ) as pool:
+            futuros = [
+                pool.submit(
+                    _ejecutar_proceso,
+                    asignados[i::self.procesos],
+                    semillas[i::self.procesos],
+                    self.mezcla,
+                    fin,
+                    self.url
+                )
+                for i in range(self.procesos)
+            ]
+            return [parcial for futuro in futuros for parcial in futuro.result()]
+
+    @staticmethod
+    def limpiar(ids: List[int]) -> int:
+        """Elimina las cargas creadas durante la prueba."""
+        from apps.asignaciones.models import Carga
+        from apps.asignaciones.services import CargaLoteService
+
+        if not ids:
+            return 0
+        return CargaLoteService.eliminar_cargas(Carga.objects.filter(id__in=ids))['cargas']
+
+
+def resumir(muestras, duracion) -> Dict:
+    """Throughput, percentiles de latencia y tasas por operación y en total."""
+    por_operacion = defaultdict(list)
+    for operacion, ms, estado in muestras:
+        por_operacion[operacion].append((ms, estado))
+
+    def resumen(registros):
+        tiempos = sorted(ms for ms, _ in registros)
+        estados = [estado for _, estado in registros]
+        total = len(registros)
+        errores = sum(1 for e in estados if e == 0 or e >= 500)
+        return {
+            'peticiones': total,
+            'por_segundo': round(total / duracion, 2) if duracion else 0.0,
+            'p50_ms': round(percentil(tiempos, 0.50), 2),
+            'p95_ms': round(percentil(tiempos, 0.95), 2),
+            'p99_ms': round(percentil(tiempos, 0.99), 2),
+            'ok': sum(1 for e in estados if 200 <= e < 300),
+            'rechazadas': sum(1 for e in estados if 400 <= e < 500 and e != 429),
+            'limitadas': estados.count(429),
+            'errores': errores,
+            'tasa_error': round(errores / total, 4) if total else 0.0,
+        }
+
+    return {
+        'operaciones': {
+            operacion: resumen(por_operacion[operacion])
+            for operacion in OPERACIONES if operacion in por_operacion
+        },
+        'total': resumen([registro for registros in por_operacion.values() for registro in registros]),
+    }
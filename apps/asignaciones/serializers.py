@@ -5,9 +5,13 @@ Integra validaciones de negocio usando los services.
 
 from rest_framework import serializers
 from .models import Periodo, Carga, BloqueHorario
-from .services import ValidadorConflictos, ValidadorHoras, PeriodoService
+from .services import ValidadorConflictos, ValidadorHoras, ArchivoService
+from common.alcance import alcance_de_peticion
 from common.exceptions import ConflictoHorarioException, HorasInvalidasException
+from common.trazas import trazar
+from apps.core.models import ProgramaAcademico
 from apps.core.serializers import ProgramaAcademicoSerializer
+from apps.academico.models import Materia, Profesor
 from apps.academico.serializers import MateriaSerializer, ProfesorSerializer
 
 
@@ -37,14 +41,26 @@ class PeriodoSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at', 'finalizado']
 
+    def _estadisticas(self, obj):
+        """
+        Estadísticas del periodo, una sola vez por serialización. Las de un
+        periodo finalizado salen de su snapshot: si está archivado, sus
+        cargas ya no están en las tablas calientes.
+        """
+        memo = self.context.setdefault('estadisticas', {})
+        if obj.pk not in memo:
+            memo[obj.pk] = ArchivoService.obtener_estadisticas(obj)
+        return memo[obj.pk]
+
     def get_puede_finalizar(self, obj):
         """Verifica si el periodo puede ser finalizado (usando service)."""
-        return PeriodoService.puede_finalizar(obj)
+        return self._estadisticas(obj)['puede_finalizar']
 
     def get_estadisticas(self, obj):
         """Obtiene estadísticas del periodo (usando service)."""
-        return PeriodoService.obtener_estadisticas_periodo(obj)
+        return self._estadisticas(obj)
 
+    @trazar
     def validate(self, data):
         """
         Valida que no exista otro periodo con el mismo nombre en la misma unidad.
@@ -106,6 +122,7 @@ class BloqueHorarioSerializer(serializers.ModelSerializer):
         """Calcula la duración del bloque usando el service."""
         return ValidadorHoras.calcular_duracion_bloque(obj)
 
+    @trazar
     def validate(self, data):
         """
         Valida que hora_fin sea mayor que hora_inicio.
@@ -141,6 +158,7 @@ class BloqueHorarioCreateSerializer(serializers.ModelSerializer):
             'hora_fin'
         ]
 
+    @trazar
     def validate(self, data):
         """
         Valida que hora_fin sea mayor que hora_inicio.
@@ -197,6 +215,39 @@ class CargaDetailSerializer(serializers.ModelSerializer):
         return ValidadorHoras.calcular_total_horas_bloques(obj)
 
 
+class CargaArchivoSerializer(CargaDetailSerializer):
+    """
+    Misma salida que CargaDetailSerializer, para el documento de un periodo
+    archivado. Cada programa, materia, profesor y el periodo se serializan
+    una sola vez por documento (memo en el contexto compartido).
+    """
+    programa_academico = serializers.SerializerMethodField()
+    materia = serializers.SerializerMethodField()
+    profesor = serializers.SerializerMethodField()
+    periodo = serializers.SerializerMethodField()
+
+    def _serializar_una_vez(self, obj, serializer_class):
+        if obj is None:
+            return None
+        memo = self.context.setdefault('serializados', {})
+        clave = (serializer_class, obj.pk)
+        if clave not in memo:
+            memo[clave] = serializer_class(obj, context=self.context).data
+        return memo[clave]
+
+    def get_programa_academico(self, obj):
+        return self._serializar_una_vez(obj.programa_academico, ProgramaAcademicoSerializer)
+
+    def get_materia(self, obj):
+        return self._serializar_una_vez(obj.materia, MateriaSerializer)
+
+    def get_profesor(self, obj):
+        return self._serializar_una_vez(obj.profesor, ProfesorSerializer)
+
+    def get_periodo(self, obj):
+        return self._serializar_una_vez(obj.periodo, PeriodoSerializer)
+
+
 class CargaSerializer(serializers.ModelSerializer):
     """
     Serializer básico para Carga (lectura).
@@ -305,6 +356,7 @@ class CargaCreateUpdateSerializer(serializers.ModelSerializer):
             'profesor': {'required': False, 'allow_null': True},
         }
 
+    @trazar
     def validate(self, data):
         """
         Valida:
@@ -361,6 +413,7 @@ class CargaCreateUpdateSerializer(serializers.ModelSerializer):
 
         return data
 
+    @trazar
     def create(self, validated_data):
         """
         Crea una carga con sus bloques horarios.
@@ -381,6 +434,7 @@ class CargaCreateUpdateSerializer(serializers.ModelSerializer):
 
         return carga
 
+    @trazar
     def update(self, instance, validated_data):
         """
         Actualiza una carga y sus bloques horarios.
@@ -421,3 +475,119 @@ class CargaCreateUpdateSerializer(serializers.ModelSerializer):
             carga.estado = Carga.Estado.PENDIENTE
 
         carga.save(update_fields=['estado'])
+
+
+class CargaCambioLoteSerializer(serializers.Serializer):
+    """
+    Cambio parcial de una carga dentro de un lote.
+    Solo permite reasignar profesor y/o reemplazar bloques.
+    """
+    id = serializers.IntegerField()
+    profesor = serializers.IntegerField(required=False, allow_null=True)
+    bloques = BloqueHorarioCreateSerializer(many=True, required=False)
+
+    @trazar
+    def validate(self, data):
+        if 'profesor' not in data and 'bloques' not in data:
+            raise serializers.ValidationError(
+                'Cada cambio debe incluir profesor y/o bloques.'
+            )
+        return data
+
+
+class CargaLoteSerializer(serializers.Serializer):
+    """
+    Serializer para el PATCH por lote de cargas.
+    """
+    MAX_CAMBIOS = 500
+
+    cambios = CargaCambioLoteSerializer(many=True, allow_empty=False)
+
+    def validate_cambios(self, value):
+        if len(value) > self.MAX_CAMBIOS:
+            raise serializers.ValidationError(
+                f'Un lote admite como máximo {self.MAX_CAMBIOS} cambios.'
+            )
+        ids = [cambio['id'] for cambio in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError('Cada carga puede aparecer una sola vez por lote.')
+        return value
+
+
+class CargaSimuladaSerializer(serializers.Serializer):
+    """
+    Carga nueva dentro de un escenario de simulación (no se guarda).
+    """
+    programa_academico = serializers.IntegerField()
+    materia = serializers.IntegerField()
+    profesor = serializers.IntegerField(required=False, allow_null=True)
+    periodo = serializers.IntegerField()
+    bloques = BloqueHorarioCreateSerializer(many=True, required=False)
+
+
+class SimulacionSerializer(serializers.Serializer):
+    """
+    Serializer para el escenario "what-if" de cargas.
+    """
+    MAX_OPERACIONES = 1000
+
+    crear = CargaSimuladaSerializer(many=True, required=False, default=list)
+    actualizar = CargaCambioLoteSerializer(many=True, required=False, default=list)
+    eliminar = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        default=list
+    )
+
+    @trazar
+    def validate(self, data):
+        total = len(data['crear']) + len(data['actualizar']) + len(data['eliminar'])
+        if total == 0:
+            raise serializers.ValidationError('El escenario no contiene operaciones.')
+        if total > self.MAX_OPERACIONES:
+            raise serializers.ValidationError(
+                f'Un escenario admite como máximo {self.MAX_OPERACIONES} operaciones.'
+            )
+
+        ids_actualizar = [cambio['id'] for cambio in data['actualizar']]
+        if len(ids_actualizar) != len(set(ids_actualizar)):
+            raise serializers.ValidationError({
+                'actualizar': 'Cada carga puede aparecer una sola vez.'
+            })
+        if set(ids_actualizar) & set(data['eliminar']):
+            raise serializers.ValidationError(
+                'Una carga no puede actualizarse y eliminarse en el mismo escenario.'
+            )
+        alcance = alcance_de_peticion(self.context['request'])
+        referencias = [
+            ('programa_academico', ProgramaAcademico.objects.filter(
+                alcance.filtro('unidad_academica_id', 'id')
+            ), 'Algún programa académico'),
+            ('materia', Materia.objects.filter(
+                alcance.filtro('programa_academico__unidad_academica_id', 'programa_academico_id')
+            ), 'Alguna materia'),
+            ('periodo', Periodo.objects.filter(
+                alcance.filtro('unidad_academica_id')
+            ), 'Algún periodo'),
+        ]
+        for campo, queryset, descripcion in referencias:
+            ids = {c[campo] for c in data['crear']}
+            if ids and queryset.filter(id__in=ids).count() != len(ids):
+                raise serializers.ValidationError({
+                    'crear': f'{descripcion} no existe o está fuera de su alcance.'
+                })
+
+        profesores = {
+            c['profesor'] for c in data['crear'] + data['actualizar']
+            if c.get('profesor') is not None
+        }
+        en_alcance = Profesor.objects.filter(
+            alcance.filtro('unidad_academica_id'), id__in=profesores
+        )
+        if profesores and en_alcance.count() != len(profesores):
+            raise serializers.ValidationError(
+                'Algún profesor no existe o está fuera de su alcance.'
+            )
+
+        data['eliminar'] = list(dict.fromkeys(data['eliminar']))
+        return data
@@ -5,9 +5,18 @@ Services para la lógica de negocio de asignaciones.
 from .validador_conflictos import ValidadorConflictos
 from .validador_horas import ValidadorHoras
 from .periodo_service import PeriodoService
+from .ocupacion import OcupacionProfesores, CargaOcupacion
+from .carga_lote_service import CargaLoteService
+from .simulacion_service import SimulacionService
+from .archivo_service import ArchivoService
 
 __all__ = [
     'ValidadorConflictos',
     'ValidadorHoras',
     'PeriodoService',
+    'OcupacionProfesores',
+    'CargaOcupacion',
+    'CargaLoteService',
+    'SimulacionService',
+    'ArchivoService',
 ]
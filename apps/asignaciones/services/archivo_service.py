@@ -0,0 +1,449 @@
+"""
+Servicio para los documentos congelados (snapshots) de periodos finalizados.
+"""
+
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import router, transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.asignaciones.models import Periodo, Carga, PeriodoArchivado, CargaArchivada
+from common.alcance import Alcance
+from .carga_lote_service import CargaLoteService
+from .periodo_service import PeriodoService
+
+
+class _CacheDocumentos:
+    """
+    LRU en proceso de documentos ya descomprimidos, por (alias, periodo_id),
+    más un índice carga_id -> periodo_id de los documentos cargados. Con
+    ambos, las lecturas de un periodo congelado no tocan la base de datos.
+
+    Las entradas caducan a los SNAPSHOT_CACHE_TTL segundos para que otros
+    procesos vean un snapshot regenerado (p. ej. tras eliminar cargas).
+    """
+
+    def __init__(self):
+        self._documentos = OrderedDict()
+        self._cargas = {}
+        self._lock = threading.Lock()
+
+    def obtener(self, clave):
+        with self._lock:
+            entrada = self._documentos.get(clave)
+            if entrada is None:
+                return None
+            documento, expira = entrada
+            if expira <= time.monotonic():
+                self._quitar(clave)
+                return None
+            self._documentos.move_to_end(clave)
+            return documento
+
+    def guardar(self, clave, documento):
+        alias, _ = clave
+        with self._lock:
+            self._quitar(clave)
+            self._documentos[clave] = (documento, time.monotonic() + settings.SNAPSHOT_CACHE_TTL)
+            for carga in documento['cargas']:
+                self._cargas[(alias, carga['id'])] = clave
+            while len(self._documentos) > settings.SNAPSHOT_CACHE_SIZE:
+                self._quitar(next(iter(self._documentos)))
+
+    def periodo_de_carga(self, alias, carga_id):
+        return self._cargas.get((alias, carga_id))
+
+    def invalidar(self, clave):
+        with self._lock:
+            self._quitar(clave)
+
+    def limpiar(self):
+        with self._lock:
+            self._documentos.clear()
+            self._cargas.clear()
+
+    def _quitar(self, clave):
+        entrada = self._documentos.pop(clave, None)
+        if entrada is not None:
+            alias, _ = clave
+            for carga in entrada[0]['cargas']:
+                self._cargas.pop((alias, carga['id']), None)
+
+
+class ArchivoService:
+    """
+    Documentos congelados de periodos finalizados.
+
+    Al finalizar un periodo se guarda un único documento JSON comprimido
+    (PeriodoArchivado) con sus cargas tal como las devuelve la API y sus
+    estadísticas; desde ese momento el listado, el detalle y las
+    estadísticas del periodo se sirven desde él. Archivar el periodo
+    elimina además sus filas de `cargas` y `bloques_horarios`.
+    """
+
+    VERSION_DOCUMENTO = 1
+
+    _cache = _CacheDocumentos()
+
+    @staticmethod
+    def comprimir(documento: Dict) -> bytes:
+        contenido = json.dumps(documento, cls=JSONEncoder, separators=(',', ':'))
+        return zlib.compress(contenido.encode('utf-8'))
+
+    @staticmethod
+    def descomprimir(blob: bytes) -> Dict:
+        return json.loads(zlib.decompress(bytes(blob)).decode('utf-8'))
+
+    @staticmethod
+    def construir_documento(periodo: Periodo) -> Dict:
+        """
+        Serializa el periodo completo: cargas (formato de CargaDetailSerializer,
+        orden por defecto del listado) y estadísticas.
+
+        Args:
+            periodo: Instancia de Periodo
+
+        Returns:
+            Dict con version, periodo_id, unidad_academica_id, estadisticas y cargas
+        """
+        from apps.asignaciones.serializers import CargaArchivoSerializer
+
+        cargas = periodo.cargas.select_related(
+            'programa_academico', 'materia', 'profesor', 'periodo'
+        ).prefetch_related('bloques').order_by('-created_at')
+        estadisticas = PeriodoService.obtener_estadisticas_periodo(periodo)
+
+        # El periodo anidado en cada carga usa estas estadísticas y no las
+        # del documento anterior, que puede estar desactualizado
+        contexto = {'estadisticas': {periodo.id: estadisticas}}
+        return {
+            'version': ArchivoService.VERSION_DOCUMENTO,
+            'periodo_id': periodo.id,
+            'unidad_academica_id': periodo.unidad_academica_id,
+            'estadisticas': estadisticas,
+            'cargas': CargaArchivoSerializer(cargas, many=True, context=contexto).data,
+        }
+
+    @staticmethod
+    def guardar_snapshot(periodo: Periodo) -> PeriodoArchivado:
+        """
+        Construye y guarda (o regenera) el documento congelado de un periodo
+        finalizado, junto con su índice de cargas. No toca las tablas calientes.
+
+        Args:
+            periodo: Instancia de Periodo finalizado
+
+        Returns:
+            El PeriodoArchivado guardado
+        """
+        documento = ArchivoService.construir_documento(periodo)
+        carga_ids = [carga['id'] for carga in documento['cargas']]
+
+        alias = router.db_for_write(PeriodoArchivado)
+        with transaction.atomic(using=alias):
+            CargaArchivada.objects.using(alias).filter(archivo_id=periodo.id).delete()
+            archivo, _ = PeriodoArchivado.objects.using(alias).update_or_create(
+                periodo_id=periodo.id,
+                defaults={
+                    'documento': ArchivoService.comprimir(documento),
+                    'total_cargas': len(carga_ids),
+                    'total_bloques': sum(len(carga['bloques']) for carga in documento['cargas']),
+                }
+            )
+            CargaArchivada.objects.using(alias).bulk_create(
+                [CargaArchivada(id=carga_id, archivo=archivo) for carga_id in carga_ids],
+                batch_size=1000
+            )
+
+        clave = (alias, periodo.id)
+        ArchivoService._cache.invalidar(clave)
+        transaction.on_commit(
+            lambda: ArchivoService._cache.guardar(clave, documento), using=alias
+        )
+        return archivo
+
+    @staticmethod
+    def refrescar_snapshots(periodo_ids: Iterable[int]) -> None:
+        """
+        Regenera el snapshot de los periodos finalizados (y no archivados)
+        de la lista, p. ej. después de eliminar cargas suyas.
+        """
+        periodos = Periodo.objects.filter(
+            id__in=set(periodo_ids), finalizado=True
+        ).exclude(archivo__filas_eliminadas=True)
+        for periodo in periodos:
+            ArchivoService.guardar_snapshot(periodo)
+
+    @staticmethod
+    def archivar_periodo(periodo: Periodo) -> Dict:
+        """
+        Archiva un periodo finalizado: asegura su documento y elimina sus
+        cargas y bloques de las tablas calientes.
+
+        Args:
+            periodo: Instancia de Periodo
+
+        Returns:
+            Dict con el resultado:
+            {'success': bool, 'mensaje': str, 'cargas': int, 'bloques': int}
+        """
+        if not periodo.finalizado:
+            return {
+                'success': False,
+                'mensaje': 'Solo se pueden archivar periodos finalizados.'
+            }
+        if ArchivoService.esta_archivado(periodo.id):
+            return {
+                'success': False,
+                'mensaje': 'El periodo ya está archivado.'
+            }
+
+        alias = router.db_for_write(PeriodoArchivado)
+        with transaction.atomic(using=alias):
+            # Periodos finalizados antes de existir los snapshots no tienen documento
+            if not PeriodoArchivado.objects.using(alias).filter(periodo_id=periodo.id).exists():
+                ArchivoService.guardar_snapshot(periodo)
+            eliminadas = CargaLoteService.eliminar_cargas(
+                Carga.objects.using(alias).filter(periodo_id=periodo.id)
+            )
+            PeriodoArchivado.objects.using(alias).filter(
+                periodo_id=periodo.id
+            ).update(filas_eliminadas=True)
+
+        return {
+            'success': True,
+            'mensaje': 'Periodo archivado exitosamente',
+            'cargas': eliminadas['cargas'],
+            'bloques': eliminadas['bloques']
+        }
+
+    @staticmethod
+    def esta_archivado(periodo_id: int) -> bool:
+        """True si las cargas del periodo ya salieron de las tablas calientes."""
+        return PeriodoArchivado.objects.filter(
+            periodo_id=periodo_id, filas_eliminadas=True
+        ).exists()
+
+    @staticmethod
+    def obtener_documento(periodo_id: int) -> Optional[Dict]:
+        """
+        Devuelve el documento congelado del periodo, o None si no tiene.
+        Mientras siga en la caché del proceso no consulta la base de datos.
+        """
+        clave = (router.db_for_read(PeriodoArchivado), periodo_id)
+        documento = ArchivoService._cache.obtener(clave)
+        if documento is not None:
+            return documento
+
+        blob = PeriodoArchivado.objects.using(clave[0]).filter(
+            periodo_id=periodo_id
+        ).values_list('documento', flat=True).first()
+        if blob is None:
+            return None
+        documento = ArchivoService.descomprimir(blob)
+        ArchivoService._cache.guardar(clave, documento)
+        return documento
+
+    @staticmethod
+    def invalidar(periodo_id: int) -> None:
+        """Descarta el documento del periodo de la caché del proceso."""
+        ArchivoService._cache.invalidar((router.db_for_read(PeriodoArchivado), periodo_id))
+        ArchivoService._cache.invalidar((router.db_for_write(PeriodoArchivado), periodo_id))
+
+    @staticmethod
+    def limpiar_cache() -> None:
+        ArchivoService._cache.limpiar()
+
+    @staticmethod
+    def obtener_estadisticas(periodo: Periodo) -> Dict:
+        """
+        Estadísticas del periodo: las congeladas en su documento si tiene,
+        si no las de PeriodoService. Solo los periodos finalizados tienen
+        documento, así que para los activos no se busca.
+        """
+        documento = ArchivoService.obtener_documento(periodo.id) if periodo.finalizado else None
+        if documento is not None:
+            return documento['estadisticas']
+        return PeriodoService.obtener_estadisticas_periodo(periodo)
+
+    @staticmethod
+    def documentos_archivados(
+        unidad_id: Optional[int] = None,
+        periodo_id: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Documentos de los periodos archivados, cuyas cargas ya no están en
+        las tablas calientes. Las lecturas que consultan esas tablas los
+        suman para no omitir las cargas archivadas.
+
+        Args:
+            unidad_id: Solo periodos de esta unidad
+            periodo_id: Solo este periodo
+        """
+        archivos = PeriodoArchivado.objects.filter(filas_eliminadas=True)
+        if unidad_id is not None:
+            archivos = archivos.filter(periodo__unidad_academica_id=unidad_id)
+        if periodo_id is not None:
+            archivos = archivos.filter(periodo_id=periodo_id)
+
+        documentos = []
+        for archivado_id in archivos.order_by('periodo_id').values_list('periodo_id', flat=True):
+            documento = ArchivoService.obtener_documento(archivado_id)
+            if documento is not None:
+                documentos.append(documento)
+        return documentos
+
+    @staticmethod
+    def cargas_archivadas(
+        unidad_id: int,
+        periodo_id: Optional[str] = None,
+        profesor: Optional[int] = None,
+        materia: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Cargas de los periodos archivados de una unidad, filtradas por
+        profesor o materia.
+
+        Args:
+            periodo_id: Valor del parámetro ?periodo= tal cual; uno que no
+                es un ID no coincide con ningún periodo
+        """
+        if periodo_id and not str(periodo_id).isdigit():
+            return []
+        documentos = ArchivoService.documentos_archivados(
+            unidad_id=unidad_id,
+            periodo_id=int(periodo_id) if periodo_id else None
+        )
+
+        cargas = [carga for documento in documentos for carga in documento['cargas']]
+        for campo, valor in (('profesor', profesor), ('materia', materia)):
+            if valor is not None:
+                cargas = [c for c in cargas if c[campo] and c[campo]['id'] == valor]
+        return cargas
+
+    @staticmethod
+    def contar_por_estado(cargas: List[Dict]) -> Dict[str, int]:
+        """Conteos de CargaViewSet.por_estado sobre cargas de documentos."""
+        return {
+            'total': len(cargas),
+            'correctas': sum(1 for c in cargas if c['estado'] == Carga.Estado.CORRECTA),
+            'pendientes': sum(1 for c in cargas if c['estado'] == Carga.Estado.PENDIENTE),
+        }
+
+    @staticmethod
+    def como_lista(cargas: List[Dict]) -> List[Dict]:
+        """Cargas de un documento en el formato de CargaListSerializer."""
+        return [
+            {
+                'id': c['id'],
+                'materia_clave': c['materia']['clave'],
+                'profesor_nombre': c['profesor']['nombre'] if c['profesor'] else None,
+                'estado': c['estado'],
+                'estado_display': c['estado_display'],
+            }
+            for c in cargas
+        ]
+
+    @staticmethod
+    def buscar_carga(
+        carga_id: int,
+        periodo_id: Optional[int] = None,
+        consultar: bool = True
+    ) -> Optional[Tuple[Dict, Dict]]:
+        """
+        Busca una carga en los documentos congelados por su ID.
+
+        Args:
+            carga_id: ID de la carga
+            periodo_id: Periodo de la carga, si ya se conoce (no consulta el
+                índice CargaArchivada)
+            consultar: Si es False, solo busca en los documentos en caché
+
+        Returns:
+            Tupla (documento, carga) o None si la carga no está en ninguno
+        """
+        alias = router.db_for_read(PeriodoArchivado)
+        clave = ArchivoService._cache.periodo_de_carga(alias, carga_id)
+        documento = ArchivoService._cache.obtener(clave) if clave else None
+
+        if documento is None and consultar:
+            if periodo_id is None:
+                periodo_id = CargaArchivada.objects.using(alias).filter(
+                    id=carga_id
+                ).values_list('archivo_id', flat=True).first()
+            if periodo_id is not None:
+                documento = ArchivoService.obtener_documento(periodo_id)
+
+        if documento is None:
+            return None
+        for carga in documento['cargas']:
+            if carga['id'] == carga_id:
+                return documento, carga
+        return None
+
+    @staticmethod
+    def en_alcance(documento: Dict, alcance: Alcance) -> bool:
+        """True si un usuario con ese alcance puede ver el periodo del documento."""
+        return not alcance.unidad_id or documento['unidad_academica_id'] == alcance.unidad_id
+
+    @staticmethod
+    def cargas_en_alcance(documento: Dict, cargas: List[Dict], alcance: Alcance) -> List[Dict]:
+        """
+        Aplica a cargas del documento el mismo alcance que CargaViewSet.get_queryset.
+        """
+        if not ArchivoService.en_alcance(documento, alcance):
+            return []
+        if alcance.programa_id:
+            return [c for c in cargas if c['programa_academico']['id'] == alcance.programa_id]
+        return cargas
+
+    @staticmethod
+    def filtrar_cargas(
+        documento: Dict,
+        programa_academico: Optional[int] = None,
+        profesor: Optional[int] = None,
+        estado: Optional[str] = None,
+        terminos: Optional[List[str]] = None,
+        orden: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """
+        Aplica a las cargas de un documento los mismos filtros que el listado
+        de CargaViewSet (filterset, búsqueda y ordenamiento).
+
+        Args:
+            terminos: Términos de búsqueda ya separados como SearchFilter;
+                cada carga debe contener todos en alguno de sus campos
+            orden: Campos de ordenamiento ya validados por OrderingFilter
+                (con '-' para descendente)
+        """
+        cargas = documento['cargas']
+
+        if programa_academico is not None:
+            cargas = [c for c in cargas if c['programa_academico']['id'] == programa_academico]
+        if profesor is not None:
+            cargas = [c for c in cargas if c['profesor'] and c['profesor']['id'] == profesor]
+        if estado:
+            cargas = [c for c in cargas if c['estado'] == estado]
+        for termino in terminos or []:
+            termino = termino.lower()
+            cargas = [
+                c for c in cargas
+                if termino in c['materia']['clave'].lower()
+                or termino in c['materia']['nombre'].lower()
+                or (c['profesor'] and termino in c['profesor']['nombre'].lower())
+            ]
+        # sorted es estable: ordenar del último campo al primero
+        for campo in reversed(orden or []):
+            cargas = sorted(
+                cargas,
+                key=lambda c: c[campo.lstrip('-')],
+                reverse=campo.startswith('-')
+            )
+
+        return cargas
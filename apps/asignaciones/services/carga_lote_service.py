@@ -0,0 +1,170 @@
+"""
+Servicio para aplicar cambios parciales a muchas cargas en un solo lote.
+"""
+
+from typing import Dict, List, Optional
+
+from django.db import router, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from apps.asignaciones.models import Carga, BloqueHorario
+from apps.academico.models import Profesor
+from common.alcance import Alcance
+from .ocupacion import CargaOcupacion, OcupacionProfesores
+
+
+class CargaLoteService:
+    """
+    Servicio para reasignar profesores y mover bloques de muchas cargas.
+
+    Todos los cambios se validan juntos contra un único snapshot de
+    ocupación y se escriben con sentencias masivas. Quien llama ejecuta
+    validar_cambios y aplicar_cambios en la misma transacción, con las
+    cargas bloqueadas (select_for_update).
+    """
+
+    @staticmethod
+    def validar_cambios(
+        cargas: Dict[int, Carga],
+        cambios: List[Dict],
+        alcance: Optional[Alcance] = None
+    ) -> List[Dict]:
+        """
+        Valida un lote de cambios sin escribir nada.
+
+        Args:
+            cargas: Cargas a modificar indexadas por ID (con materia, periodo
+                y bloques precargados)
+            cambios: Lista de {'id', 'profesor'?, 'bloques'?}
+            alcance: Alcance del usuario; los profesores nuevos deben estar
+                dentro de él
+
+        Returns:
+            Lista de errores; vacía si el lote es válido. Cada error:
+            {'id': int, 'error': str, 'conflictos'?: [...]}
+        """
+        errores = []
+
+        profesores_nuevos = {c['profesor'] for c in cambios if c.get('profesor') is not None}
+        profesores = Profesor.objects.filter(id__in=profesores_nuevos)
+        if alcance is not None:
+            profesores = profesores.filter(alcance.filtro('unidad_academica_id'))
+        # Bloquear a los profesores de destino hasta el final de la transacción
+        existentes = set(profesores.select_for_update().values_list('id', flat=True))
+
+        finales = []
+        for cambio in cambios:
+            carga = cargas[cambio['id']]
+            if carga.periodo.finalizado:
+                errores.append({
+                    'id': carga.id,
+                    'error': 'No se pueden modificar cargas en un periodo finalizado.'
+                })
+                continue
+            if cambio.get('profesor') is not None and cambio['profesor'] not in existentes:
+                errores.append({
+                    'id': carga.id,
+                    'error': 'El profesor no existe o está fuera de su alcance.'
+                })
+                continue
+
+            final = CargaOcupacion.desde_carga(carga, cambio)
+            if 'bloques' in cambio and final.completa:
+                horas = final.total_horas()
+                if horas != carga.materia.horas:
+                    errores.append({
+                        'id': carga.id,
+                        'error': (
+                            f'Las horas de los bloques ({horas}) no coinciden con '
+                            f'las horas de la materia ({carga.materia.horas}).'
+                        )
+                    })
+                    continue
+            finales.append(final)
+
+        if errores:
+            return errores
+
+        # Un solo snapshot con los profesores de origen y destino
+        ocupacion = OcupacionProfesores.cargar(
+            profesor_ids={c.profesor_id for c in cargas.values()} | {f.profesor_id for f in finales},
+            periodo_ids={c.periodo_id for c in cargas.values()}
+        )
+        for final in finales:
+            ocupacion.agregar(final)
+
+        for final in finales:
+            conflictos = ocupacion.conflictos(final.id)
+            if conflictos:
+                errores.append({
+                    'id': final.id,
+                    'error': 'El profesor tiene otra carga en un horario que se solapa.',
+                    'conflictos': conflictos
+                })
+
+        return errores
+
+    @staticmethod
+    def aplicar_cambios(cargas: Dict[int, Carga], cambios: List[Dict]) -> List[int]:
+        """
+        Escribe un lote ya validado en una transacción:
+        un UPDATE masivo de cargas, un DELETE y un INSERT masivo de bloques.
+
+        Returns:
+            IDs de las cargas modificadas
+        """
+        ahora = timezone.now()
+        modificadas = []
+        con_bloques_nuevos = []
+        bloques_nuevos = []
+
+        for cambio in cambios:
+            carga = cargas[cambio['id']]
+            final = CargaOcupacion.desde_carga(carga, cambio)
+
+            carga.profesor_id = final.profesor_id
+            carga.estado = Carga.Estado.CORRECTA if final.completa else Carga.Estado.PENDIENTE
+            carga.updated_at = ahora
+            modificadas.append(carga)
+
+            if 'bloques' in cambio:
+                con_bloques_nuevos.append(carga.id)
+                bloques_nuevos.extend(
+                    BloqueHorario(carga_id=carga.id, **b)
+                    for b in cambio['bloques']
+                )
+
+        with transaction.atomic(using=router.db_for_write(Carga)):
+            Carga.objects.bulk_update(modificadas, ['profesor', 'estado', 'updated_at'])
+            if con_bloques_nuevos:
+                BloqueHorario.objects.filter(carga_id__in=con_bloques_nuevos).delete()
+                BloqueHorario.objects.bulk_create(bloques_nuevos)
+
+        return [c.id for c in modificadas]
+
+    @staticmethod
+    def eliminar_cargas(cargas: QuerySet) -> Dict[str, int]:
+        """
+        Elimina un conjunto de cargas y sus bloques con dos sentencias
+        `DELETE ... WHERE carga_id IN (subconsulta)` en una transacción.
+
+        Evita el collector de Django, que cargaría cada bloque en memoria
+        y emitiría señales fila por fila. BloqueHorario es la única tabla
+        que referencia a cargas.
+
+        Args:
+            cargas: QuerySet de cargas a eliminar (puede tener filtros y joins)
+
+        Returns:
+            Dict con el número de filas eliminadas: {'cargas': int, 'bloques': int}
+        """
+        cargas = cargas.order_by()
+
+        with transaction.atomic(using=cargas.db):
+            bloques = BloqueHorario.objects.using(cargas.db).filter(
+                carga_id__in=cargas.values('id')
+            )._raw_delete(cargas.db)
+            total = cargas._raw_delete(cargas.db)
+
+        return {'cargas': total, 'bloques': bloques}
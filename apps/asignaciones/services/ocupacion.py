@@ -0,0 +1,147 @@
+"""
+Snapshot en memoria de la ocupación horaria de profesores.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from apps.asignaciones.models import BloqueHorario
+from .validador_horas import ValidadorHoras
+
+Bloque = Tuple[str, time, time]
+
+
+@dataclass
+class CargaOcupacion:
+    """Estado mínimo de una carga necesario para detectar conflictos."""
+    id: int
+    profesor_id: Optional[int]
+    periodo_id: int
+    bloques: List[Bloque] = field(default_factory=list)
+
+    @classmethod
+    def desde_carga(cls, carga, cambio: Optional[Dict] = None) -> 'CargaOcupacion':
+        """
+        Construye el estado de una carga, opcionalmente tras aplicar un
+        cambio parcial {'profesor'?, 'bloques'?}. Usa los bloques
+        precargados de la carga cuando el cambio no los reemplaza.
+        """
+        cambio = cambio or {}
+        profesor_id = cambio['profesor'] if 'profesor' in cambio else carga.profesor_id
+        if 'bloques' in cambio:
+            bloques = [(b['dia'], b['hora_inicio'], b['hora_fin']) for b in cambio['bloques']]
+        else:
+            bloques = [(b.dia, b.hora_inicio, b.hora_fin) for b in carga.bloques.all()]
+        return cls(carga.id, profesor_id, carga.periodo_id, bloques)
+
+    @property
+    def completa(self) -> bool:
+        """Tiene profesor y bloques (estado CORRECTA)."""
+        return bool(self.profesor_id and self.bloques)
+
+    def total_horas(self) -> float:
+        """Suma de horas de los bloques (mismo cálculo que ValidadorHoras)."""
+        return sum(
+            ValidadorHoras.calcular_duracion_bloque(BloqueHorario(hora_inicio=inicio, hora_fin=fin))
+            for _, inicio, fin in self.bloques
+        )
+
+
+class OcupacionProfesores:
+    """
+    Ocupación de un conjunto de profesores en un conjunto de periodos,
+    cargada en una sola consulta.
+
+    Permite aplicar cambios en memoria (agregar, quitar o reemplazar
+    cargas) y detectar conflictos sobre el estado resultante. Como todos
+    los cambios se aplican antes de validar, dos cargas pueden
+    intercambiar horarios o profesores dentro del mismo lote.
+    """
+
+    def __init__(self):
+        self._cargas: Dict[int, CargaOcupacion] = {}
+        self._por_profesor: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+
+    @classmethod
+    def cargar(cls, profesor_ids: Iterable[int], periodo_ids: Iterable[int]) -> 'OcupacionProfesores':
+        """
+        Carga los bloques de las cargas de los profesores en los periodos dados.
+
+        Args:
+            profesor_ids: IDs de profesores
+            periodo_ids: IDs de periodos
+
+        Returns:
+            OcupacionProfesores con las cargas existentes
+        """
+        ocupacion = cls()
+        profesor_ids = {p for p in profesor_ids if p is not None}
+        periodo_ids = set(periodo_ids)
+
+        if not profesor_ids or not periodo_ids:
+            return ocupacion
+
+        filas = BloqueHorario.objects.filter(
+            carga__profesor_id__in=profesor_ids,
+            carga__periodo_id__in=periodo_ids
+        ).values_list(
+            'carga_id', 'carga__profesor_id', 'carga__periodo_id',
+            'dia', 'hora_inicio', 'hora_fin'
+        )
+
+        for carga_id, profesor_id, periodo_id, dia, inicio, fin in filas:
+            carga = ocupacion._cargas.get(carga_id)
+            if carga is None:
+                carga = CargaOcupacion(carga_id, profesor_id, periodo_id)
+                ocupacion.agregar(carga)
+            carga.bloques.append((dia, inicio, fin))
+
+        return ocupacion
+
+    def obtener(self, carga_id: int) -> Optional[CargaOcupacion]:
+        return self._cargas.get(carga_id)
+
+    def agregar(self, carga: CargaOcupacion) -> None:
+        """Agrega (o reemplaza) una carga en el snapshot."""
+        self.quitar(carga.id)
+        self._cargas[carga.id] = carga
+        if carga.profesor_id is not None:
+            self._por_profesor[(carga.profesor_id, carga.periodo_id)].add(carga.id)
+
+    def quitar(self, carga_id: int) -> None:
+        """Quita una carga del snapshot (si existe)."""
+        carga = self._cargas.pop(carga_id, None)
+        if carga is not None and carga.profesor_id is not None:
+            self._por_profesor[(carga.profesor_id, carga.periodo_id)].discard(carga_id)
+
+    def conflictos(self, carga_id: int) -> List[Dict]:
+        """
+        Detecta las cargas del mismo profesor y periodo cuyos bloques se
+        solapan con los de la carga indicada.
+
+        Returns:
+            Lista de {'carga_id': int, 'dia': str}, una entrada por carga conflictiva
+        """
+        carga = self._cargas.get(carga_id)
+        if carga is None or carga.profesor_id is None or not carga.bloques:
+            return []
+
+        resultado = []
+        for otra_id in sorted(self._por_profesor[(carga.profesor_id, carga.periodo_id)]):
+            if otra_id == carga_id:
+                continue
+            dia = self._primer_solapamiento(carga.bloques, self._cargas[otra_id].bloques)
+            if dia:
+                resultado.append({'carga_id': otra_id, 'dia': dia})
+        return resultado
+
+    @staticmethod
+    def _primer_solapamiento(bloques: List[Bloque], otros: List[Bloque]) -> Optional[str]:
+        """Mismo criterio que ValidadorConflictos.bloques_se_solapan."""
+        for dia, inicio, fin in bloques:
+            for otro_dia, otro_inicio, otro_fin in otros:
+                if dia == otro_dia and not (fin <= otro_inicio or inicio >= otro_fin):
+                    return dia
+        return None
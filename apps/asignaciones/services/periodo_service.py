@@ -2,8 +2,15 @@
 Servicio para la gestión de periodos académicos.
 """
 
-from typing import Dict, List
-from apps.asignaciones.models import Periodo, Carga
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import Count, Q
+from apps.asignaciones.models import Periodo, Carga, PeriodoArchivado, CargaArchivada
+from common.trazas import trazar
+from .validador_horas import ValidadorHoras
+from .carga_lote_service import CargaLoteService
 
 
 class PeriodoService:
@@ -12,6 +19,7 @@ class PeriodoService:
     """
 
     @staticmethod
+    @trazar
     def puede_finalizar(periodo: Periodo) -> bool:
         """
         Verifica si un periodo puede ser finalizado.
@@ -29,6 +37,7 @@ class PeriodoService:
         return not cargas_pendientes.exists()
 
     @staticmethod
+    @trazar
     def obtener_cargas_problematicas(periodo: Periodo) -> Dict[str, List[Carga]]:
         """
         Obtiene las cargas pendientes (incompletas) que impiden finalizar un periodo.
@@ -44,6 +53,7 @@ class PeriodoService:
         }
 
     @staticmethod
+    @trazar
     def finalizar_periodo(periodo: Periodo) -> Dict:
         """
         Intenta finalizar un periodo.
@@ -76,9 +86,13 @@ class PeriodoService:
                 'cargas_problematicas': cargas_problematicas
             }
 
-        # Finalizar el periodo
-        periodo.finalizado = True
-        periodo.save(update_fields=['finalizado'])
+        from .archivo_service import ArchivoService
+
+        # Finalizar el periodo y congelar su documento (snapshot)
+        with transaction.atomic(using=router.db_for_write(Periodo)):
+            periodo.finalizado = True
+            periodo.save(update_fields=['finalizado'])
+            ArchivoService.guardar_snapshot(periodo)
 
         return {
             'success': True,
@@ -86,6 +100,7 @@ class PeriodoService:
         }
 
     @staticmethod
+    @trazar
     def obtener_estadisticas_periodo(periodo: Periodo) -> Dict:
         """
         Obtiene estadísticas del periodo (útil para dashboard).
@@ -96,10 +111,15 @@ class PeriodoService:
         Returns:
             Dict con estadísticas del periodo
         """
-        total_cargas = periodo.cargas.count()
+        conteos = periodo.cargas.aggregate(
+            total=Count('id'),
+            correctas=Count('id', filter=Q(estado=Carga.Estado.CORRECTA)),
+            pendientes=Count('id', filter=Q(estado=Carga.Estado.PENDIENTE)),
+        )
+        total_cargas = conteos['total']
         cargas_por_estado = {
-            'correctas': periodo.cargas.filter(estado=Carga.Estado.CORRECTA).count(),
-            'pendientes': periodo.cargas.filter(estado=Carga.Estado.PENDIENTE).count(),
+            'correctas': conteos['correctas'],
+            'pendientes': conteos['pendientes'],
         }
 
         porcentaje_completado = 0
@@ -113,3 +133,123 @@ class PeriodoService:
             'puede_finalizar': PeriodoService.puede_finalizar(periodo),
             'finalizado': periodo.finalizado
         }
+
+    @staticmethod
+    @trazar
+    def validar_periodo(
+        periodo: Periodo,
+        progreso: Optional[Callable[[int, int], None]] = None
+    ) -> Dict:
+        """
+        Valida todas las cargas de un periodo (conflictos de horario y horas).
+        Pensado para ejecutarse como job en segundo plano.
+
+        Recorre el periodo por lotes con `.iterator()` (cursor del lado del
+        servidor en PostgreSQL) y detecta solapamientos ordenando los bloques
+        de cada profesor por día y hora de inicio.
+
+        Args:
+            periodo: Instancia de Periodo
+            progreso: Callback opcional progreso(procesadas, total)
+
+        Returns:
+            Dict con el resumen de la validación:
+            {
+                'total_cargas': int,
+                'pendientes': int,
+                'conflictos': [{'carga_id', 'carga_conflictiva_id', 'profesor_id', 'dia'}],
+                'horas_invalidas': [{'carga_id', 'horas_materia', 'horas_bloques'}]
+            }
+        """
+        total = periodo.cargas.count()
+        cargas = (
+            periodo.cargas.select_related('materia')
+            .prefetch_related('bloques')
+            .order_by('id')
+            .iterator(chunk_size=settings.DB_ITERATOR_CHUNK_SIZE)
+        )
+
+        pendientes = 0
+        horas_invalidas = []
+        bloques_por_profesor = defaultdict(list)
+
+        for indice, carga in enumerate(cargas, start=1):
+            if carga.estado == Carga.Estado.PENDIENTE:
+                pendientes += 1
+
+            bloques = list(carga.bloques.all())
+            if bloques:
+                horas_bloques = ValidadorHoras.calcular_total_horas_bloques(carga)
+                if horas_bloques != carga.materia.horas:
+                    horas_invalidas.append({
+                        'carga_id': carga.id,
+                        'horas_materia': carga.materia.horas,
+                        'horas_bloques': horas_bloques
+                    })
+
+            if carga.profesor_id:
+                for bloque in bloques:
+                    bloques_por_profesor[carga.profesor_id].append(
+                        (bloque.dia, bloque.hora_inicio, bloque.hora_fin, carga.id)
+                    )
+
+            if progreso and (indice % 100 == 0 or indice == total):
+                progreso(indice, total)
+
+        conflictos = []
+        vistos = set()
+        for profesor_id, bloques in bloques_por_profesor.items():
+            bloques.sort()
+            for i, (dia, _, fin, carga_id) in enumerate(bloques):
+                for otro_dia, otro_inicio, _, otra_carga_id in bloques[i + 1:]:
+                    # Ordenados por (día, inicio): se deja de buscar al
+                    # cambiar de día o al empezar después de este bloque
+                    if otro_dia != dia or otro_inicio >= fin:
+                        break
+                    par = (min(carga_id, otra_carga_id), max(carga_id, otra_carga_id))
+                    if carga_id != otra_carga_id and par not in vistos:
+                        vistos.add(par)
+                        conflictos.append({
+                            'carga_id': par[0],
+                            'carga_conflictiva_id': par[1],
+                            'profesor_id': profesor_id,
+                            'dia': dia
+                        })
+
+        return {
+            'total_cargas': total,
+            'pendientes': pendientes,
+            'conflictos': conflictos,
+            'horas_invalidas': horas_invalidas
+        }
+
+    @staticmethod
+    @trazar
+    def purgar_periodo(periodo: Periodo) -> Dict[str, int]:
+        """
+        Elimina un periodo con todas sus cargas y bloques usando sentencias
+        masivas (sin el collector de Django).
+
+        Args:
+            periodo: Instancia de Periodo
+
+        Returns:
+            Dict con el número de filas eliminadas:
+            {'periodos': int, 'cargas': int, 'bloques': int}
+        """
+        alias = router.db_for_write(Periodo)
+        with transaction.atomic(using=alias):
+            eliminadas = CargaLoteService.eliminar_cargas(
+                Carga.objects.using(alias).filter(periodo_id=periodo.id)
+            )
+            # Documento archivado (si lo hay) antes que el periodo por la FK
+            archivo = PeriodoArchivado.objects.using(alias).filter(periodo_id=periodo.id)
+            if archivo.exists():
+                CargaArchivada.objects.using(alias).filter(archivo_id=periodo.id)._raw_delete(alias)
+                archivo._raw_delete(alias)
+            eliminadas['periodos'] = Periodo.objects.filter(id=periodo.id)._raw_delete(alias)
+
+        from .archivo_service import ArchivoService
+        ArchivoService.invalidar(periodo.id)
+
+        return eliminadas
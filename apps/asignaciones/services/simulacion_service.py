@@ -0,0 +1,141 @@
+"""
+Servicio para evaluar escenarios ("what-if") sin escribir en la base de datos.
+"""
+
+from collections import defaultdict
+from typing import Dict, List
+
+from django.db.models import Count
+
+from apps.asignaciones.models import Carga
+from apps.academico.models import Materia
+from .ocupacion import CargaOcupacion, OcupacionProfesores
+
+
+class SimulacionService:
+    """
+    Servicio que aplica en memoria un conjunto de altas, cambios y bajas
+    de cargas y reporta el resultado: conflictos, horas que no coinciden
+    y conteo de estados por periodo.
+
+    El número de consultas es constante respecto al tamaño del escenario.
+    """
+
+    @staticmethod
+    def simular(
+        cargas: Dict[int, Carga],
+        crear: List[Dict],
+        actualizar: List[Dict],
+        eliminar: List[int]
+    ) -> Dict:
+        """
+        Evalúa un escenario sin modificar la base de datos.
+
+        Args:
+            cargas: Cargas existentes a actualizar/eliminar indexadas por ID
+                (con materia y bloques precargados)
+            crear: Cargas nuevas {'programa_academico', 'materia', 'profesor'?,
+                'periodo', 'bloques'?}
+            actualizar: Cambios parciales {'id', 'profesor'?, 'bloques'?}
+            eliminar: IDs de cargas a eliminar
+
+        Returns:
+            Dict con el resultado del escenario. Las cargas nuevas se
+            identifican con IDs negativos: -1 es crear[0], -2 es crear[1], etc.
+        """
+        materias = dict(
+            Materia.objects.filter(
+                id__in={c['materia'] for c in crear}
+            ).values_list('id', 'horas')
+        )
+
+        # Estado final de cada carga afectada: (CargaOcupacion, horas_materia)
+        finales = []
+        for indice, datos in enumerate(crear, start=1):
+            final = CargaOcupacion(
+                -indice,
+                datos.get('profesor'),
+                datos['periodo'],
+                [(b['dia'], b['hora_inicio'], b['hora_fin']) for b in datos.get('bloques', [])]
+            )
+            finales.append((final, materias.get(datos['materia'])))
+        for cambio in actualizar:
+            carga = cargas[cambio['id']]
+            finales.append((CargaOcupacion.desde_carga(carga, cambio), carga.materia.horas))
+
+        periodo_ids = (
+            {c.periodo_id for c in cargas.values()} | {d['periodo'] for d in crear}
+        )
+        ocupacion = OcupacionProfesores.cargar(
+            profesor_ids=(
+                {c.profesor_id for c in cargas.values()}
+                | {f.profesor_id for f, _ in finales}
+            ),
+            periodo_ids=periodo_ids
+        )
+        for carga_id in eliminar:
+            ocupacion.quitar(carga_id)
+        for final, _ in finales:
+            ocupacion.agregar(final)
+
+        conflictos = []
+        horas_invalidas = []
+        for final, horas_materia in finales:
+            conflictos_carga = ocupacion.conflictos(final.id)
+            if conflictos_carga:
+                conflictos.append({'carga_id': final.id, 'conflictos': conflictos_carga})
+
+            if final.completa and horas_materia is not None:
+                horas_bloques = final.total_horas()
+                if horas_bloques != horas_materia:
+                    horas_invalidas.append({
+                        'carga_id': final.id,
+                        'horas_materia': horas_materia,
+                        'horas_bloques': horas_bloques
+                    })
+
+        return {
+            'resumen': {
+                'creadas': len(crear),
+                'actualizadas': len(actualizar),
+                'eliminadas': len(eliminar)
+            },
+            'conflictos': conflictos,
+            'horas_invalidas': horas_invalidas,
+            'periodos': SimulacionService._estados_por_periodo(
+                periodo_ids, cargas, finales, eliminar
+            )
+        }
+
+    @staticmethod
+    def _estados_por_periodo(periodo_ids, cargas, finales, eliminar) -> List[Dict]:
+        """Conteo actual por estado (una consulta) más los deltas del escenario."""
+        conteo = defaultdict(lambda: {Carga.Estado.CORRECTA: 0, Carga.Estado.PENDIENTE: 0})
+        filas = Carga.objects.filter(periodo_id__in=periodo_ids).values(
+            'periodo_id', 'estado'
+        ).annotate(total=Count('id')).order_by()
+        for fila in filas:
+            conteo[fila['periodo_id']][fila['estado']] = fila['total']
+
+        for carga_id in eliminar:
+            carga = cargas[carga_id]
+            conteo[carga.periodo_id][carga.estado] -= 1
+        for final, _ in finales:
+            if final.id > 0:
+                carga = cargas[final.id]
+                conteo[carga.periodo_id][carga.estado] -= 1
+            estado = Carga.Estado.CORRECTA if final.completa else Carga.Estado.PENDIENTE
+            conteo[final.periodo_id][estado] += 1
+
+        resultado = []
+        for periodo_id in sorted(periodo_ids):
+            correctas = conteo[periodo_id][Carga.Estado.CORRECTA]
+            pendientes = conteo[periodo_id][Carga.Estado.PENDIENTE]
+            resultado.append({
+                'periodo_id': periodo_id,
+                'total_cargas': correctas + pendientes,
+                'correctas': correctas,
+                'pendientes': pendientes,
+                'puede_finalizar': pendientes == 0
+            })
+        return resultado
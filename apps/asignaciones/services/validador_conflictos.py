@@ -2,9 +2,37 @@
 Servicio para validación de conflictos de horarios entre cargas.
 """
 
+from functools import reduce
+from operator import or_
 from typing import List, Optional, Dict
+
+from django.db import connections
+from django.db.models import BooleanField, Field, Func, Q, QuerySet, TimeField, Value
+from django.db.models.functions import Cast
+
 from apps.asignaciones.models import Carga, BloqueHorario, Periodo
 from apps.academico.models import Profesor
+from common.trazas import trazar
+
+
+class RangoHorario(Func):
+    """
+    tsrange(DATE '2000-01-01' + inicio, DATE '2000-01-01' + fin) en PostgreSQL.
+    Es la expresión del índice GiST bloques_horarios_carga_dia_rango_gist.
+    """
+    function = 'tsrange'
+    template = "%(function)s(DATE '2000-01-01' + %(expressions)s)"
+    arg_joiner = ", DATE '2000-01-01' + "
+    arity = 2
+    output_field = Field()
+
+
+class Solapan(Func):
+    """Operador && de rangos de PostgreSQL."""
+    template = '%(expressions)s'
+    arg_joiner = ' && '
+    arity = 2
+    output_field = BooleanField()
 
 
 class ValidadorConflictos:
@@ -37,6 +65,7 @@ class ValidadorConflictos:
         )
 
     @staticmethod
+    @trazar
     def obtener_cargas_profesor_periodo(profesor: Profesor, periodo: Periodo) -> List[Carga]:
         """
         Obtiene todas las cargas de un profesor en un periodo específico.
@@ -54,6 +83,47 @@ class ValidadorConflictos:
         ).prefetch_related('bloques')
 
     @staticmethod
+    def filtrar_bloques_solapados(queryset: QuerySet, bloques: List[BloqueHorario]) -> QuerySet:
+        """
+        Filtra un queryset de BloqueHorario dejando solo los bloques que se
+        solapan con alguno de `bloques` (mismo día y horarios cruzados).
+
+        En PostgreSQL usa rangos `tsrange` con el operador `&&`, que puede
+        aprovechar el índice GiST `bloques_horarios_carga_dia_rango_gist`
+        (carga, día y rango, con btree_gist); en el resto
+        de motores usa comparaciones equivalentes. Ambos caminos consideran
+        los rangos semiabiertos [inicio, fin): bloques contiguos no se solapan.
+
+        Args:
+            queryset: QuerySet de BloqueHorario
+            bloques: Bloques (guardados o temporales) contra los que comparar
+
+        Returns:
+            QuerySet: Queryset filtrado (vacío si no hay bloques)
+        """
+        if not bloques:
+            return queryset.none()
+
+        if connections[queryset.db].vendor == 'postgresql':
+            rango_bloques = RangoHorario('hora_inicio', 'hora_fin')
+            return queryset.filter(reduce(or_, (
+                Q(
+                    Solapan(rango_bloques, RangoHorario(
+                        Cast(Value(bloque.hora_inicio), TimeField()),
+                        Cast(Value(bloque.hora_fin), TimeField())
+                    )),
+                    dia=bloque.dia
+                )
+                for bloque in bloques
+            )))
+
+        return queryset.filter(reduce(or_, (
+            Q(dia=bloque.dia, hora_inicio__lt=bloque.hora_fin, hora_fin__gt=bloque.hora_inicio)
+            for bloque in bloques
+        )))
+
+    @staticmethod
+    @trazar
     def detectar_conflicto_carga(carga: Carga) -> Optional[Dict]:
         """
         Detecta si una carga tiene conflictos de horario con otras cargas
@@ -73,39 +143,18 @@ class ValidadorConflictos:
                 'bloques_conflictivos': [(BloqueHorario, BloqueHorario)]
             }
         """
-        # Obtener todas las cargas del profesor en el mismo periodo (excluyendo la actual)
-        otras_cargas = ValidadorConflictos.obtener_cargas_profesor_periodo(
-            carga.profesor,
-            carga.periodo
-        ).exclude(id=carga.id)
-
-        bloques_carga = carga.bloques.all()
-
-        # Verificar cada carga existente
-        for otra_carga in otras_cargas:
-            bloques_otra_carga = otra_carga.bloques.all()
-
-            # Verificar si algún bloque se solapa
-            bloques_conflictivos = []
-            for bloque in bloques_carga:
-                for otro_bloque in bloques_otra_carga:
-                    if ValidadorConflictos.bloques_se_solapan(bloque, otro_bloque):
-                        bloques_conflictivos.append((bloque, otro_bloque))
-
-            # Si hay bloques que se solapan, retornar el conflicto
-            if bloques_conflictivos:
-                return {
-                    'tiene_conflicto': True,
-                    'carga_conflictiva': otra_carga,
-                    'programa': otra_carga.programa_academico.nombre,
-                    'materia': otra_carga.materia.nombre,
-                    'materia_clave': otra_carga.materia.clave,
-                    'bloques_conflictivos': bloques_conflictivos
-                }
-
-        return None
+        if not carga.profesor_id:
+            return None
+
+        return ValidadorConflictos.validar_disponibilidad_profesor(
+            carga.profesor_id,
+            carga.periodo_id,
+            list(carga.bloques.all()),
+            excluir_carga_id=carga.id
+        )
 
     @staticmethod
+    @trazar
     def validar_disponibilidad_profesor(
         profesor: Profesor,
         periodo: Periodo,
@@ -116,41 +165,60 @@ class ValidadorConflictos:
         Valida si un profesor está disponible para nuevos bloques horarios.
         Útil para validar ANTES de crear una carga.
 
+        El solapamiento se resuelve en la base de datos: una sola consulta
+        trae únicamente los bloques existentes que chocan con los nuevos.
+
         Args:
-            profesor: Instancia de Profesor
-            periodo: Instancia de Periodo
+            profesor: Instancia (o ID) de Profesor
+            periodo: Instancia (o ID) de Periodo
             bloques: Lista de BloqueHorario a validar
             excluir_carga_id: ID de carga a excluir (útil al editar una carga existente)
 
         Returns:
             Dict con información del conflicto si existe, None si el profesor está disponible
         """
-        cargas_existentes = ValidadorConflictos.obtener_cargas_profesor_periodo(
-            profesor,
-            periodo
-        )
+        bloques = list(bloques)
+        if not bloques:
+            return None
 
+        existentes = BloqueHorario.objects.filter(
+            carga__profesor=profesor,
+            carga__periodo=periodo
+        )
         if excluir_carga_id:
-            cargas_existentes = cargas_existentes.exclude(id=excluir_carga_id)
-
-        # Verificar cada carga existente
-        for carga in cargas_existentes:
-            bloques_carga = carga.bloques.all()
-
-            bloques_conflictivos = []
-            for bloque_nuevo in bloques:
-                for bloque_existente in bloques_carga:
-                    if ValidadorConflictos.bloques_se_solapan(bloque_nuevo, bloque_existente):
-                        bloques_conflictivos.append((bloque_nuevo, bloque_existente))
-
-            if bloques_conflictivos:
-                return {
-                    'tiene_conflicto': True,
-                    'carga_conflictiva': carga,
-                    'programa': carga.programa_academico.nombre,
-                    'materia': carga.materia.nombre,
-                    'materia_clave': carga.materia.clave,
-                    'bloques_conflictivos': bloques_conflictivos
-                }
-
-        return None
+            existentes = existentes.exclude(carga_id=excluir_carga_id)
+
+        existentes = ValidadorConflictos.filtrar_bloques_solapados(
+            existentes, bloques
+        ).select_related(
+            'carga__programa_academico', 'carga__materia'
+        ).order_by('-carga__created_at', 'carga_id', 'dia', 'hora_inicio')
+
+        # Se reporta la carga conflictiva más reciente, como antes
+        carga = None
+        bloques_carga = []
+        for bloque_existente in existentes:
+            if carga is None:
+                carga = bloque_existente.carga
+            elif bloque_existente.carga_id != carga.id:
+                break
+            bloques_carga.append(bloque_existente)
+
+        if carga is None:
+            return None
+
+        bloques_conflictivos = [
+            (bloque_nuevo, bloque_existente)
+            for bloque_nuevo in bloques
+            for bloque_existente in bloques_carga
+            if ValidadorConflictos.bloques_se_solapan(bloque_nuevo, bloque_existente)
+        ]
+
+        return {
+            'tiene_conflicto': True,
+            'carga_conflictiva': carga,
+            'programa': carga.programa_academico.nombre,
+            'materia': carga.materia.nombre,
+            'materia_clave': carga.materia.clave,
+            'bloques_conflictivos': bloques_conflictivos
+        }
@@ -5,6 +5,7 @@ Servicio para validación de horas entre bloques horarios y materias.
 from datetime import datetime
 from typing import List
 from apps.asignaciones.models import Carga, BloqueHorario
+from common.trazas import trazar
 
 
 class ValidadorHoras:
@@ -30,6 +31,7 @@ class ValidadorHoras:
         return duracion.total_seconds() / 3600
 
     @staticmethod
+    @trazar
     def calcular_total_horas_bloques(carga: Carga) -> float:
         """
         Calcula el total de horas asignadas en los bloques horarios de una carga.
@@ -46,6 +48,7 @@ class ValidadorHoras:
         return total
 
     @staticmethod
+    @trazar
     def validar_horas_carga(carga: Carga) -> bool:
         """
         Verifica que la suma de horas de los bloques coincida
@@ -61,6 +64,7 @@ class ValidadorHoras:
         return total_bloques == carga.materia.horas
 
     @staticmethod
+    @trazar
     def validar_horas_bloques(bloques: List[BloqueHorario], horas_materia: int) -> bool:
         """
         Verifica que la suma de horas de una lista de bloques coincida
@@ -0,0 +1,15 @@
+"""
+Señales de asignaciones.
+"""
+
+from .services import ArchivoService
+
+
+def descartar_snapshot_en_cache(sender, instance, created, raw=False, **kwargs):
+    """
+    post_save de Periodo: un periodo nuevo no puede tener documento; si su ID
+    quedó en la caché de snapshots (IDs reutilizados tras un rollback) se
+    descarta para no servir el documento de otro periodo.
+    """
+    if created and not raw:
+        ArchivoService.invalidar(instance.pk)
@@ -0,0 +1,356 @@
+"""
+Tests para el archivado de periodos finalizados.
+"""
+
+from datetime import time
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.models import (
+    Periodo, Carga, BloqueHorario, PeriodoArchivado, CargaArchivada
+)
+from apps.asignaciones.services import ArchivoService, PeriodoService
+
+User = get_user_model()
+
+
+class ArchivoPeriodoTestCase(TestCase):
+    """Tests para ArchivoService y la lectura transparente de periodos archivados."""
+
+    def setUp(self):
+        ArchivoService.limpiar_cache()
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre="Facultad de Ingeniería")
+        self.programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Software'
+        )
+        self.otro_programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Sistemas'
+        )
+        self.profesor = Profesor.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Dr. Juan Pérez',
+            email='juan@test.com'
+        )
+        self.periodo = Periodo.objects.create(unidad_academica=self.unidad, nombre='2025-1')
+        self.activo = Periodo.objects.create(unidad_academica=self.unidad, nombre='2025-2')
+
+        self.cargas = []
+        for indice, programa in enumerate([self.programa, self.programa, self.otro_programa]):
+            materia = Materia.objects.create(
+                programa_academico=programa,
+                clave=f'CS10{indice}',
+                nombre=f'Materia {indice}',
+                horas=2
+            )
+            carga = Carga.objects.create(
+                programa_academico=programa,
+                materia=materia,
+                profesor=self.profesor,
+                periodo=self.periodo,
+                estado=Carga.Estado.CORRECTA
+            )
+            BloqueHorario.objects.create(
+                carga=carga,
+                dia=['LUN', 'MAR', 'MIE'][indice],
+                hora_inicio=time(8, 0),
+                hora_fin=time(10, 0)
+            )
+            self.cargas.append(carga)
+        Carga.objects.create(
+            programa_academico=self.programa,
+            materia=materia,
+            periodo=self.activo
+        )
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            rol=User.Rol.RESP_UNIDAD,
+            unidad_academica=self.unidad
+        )
+        self.client.force_authenticate(user=self.user)
+        PeriodoService.finalizar_periodo(self.periodo)
+
+    def _archivar(self):
+        response = self.client.post(f'/api/asignaciones/periodos/{self.periodo.id}/archivar/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_archivar_vacia_tablas_calientes(self):
+        """Las cargas y bloques del periodo salen de las tablas calientes."""
+        response = self._archivar()
+
+        self.assertEqual(response.data['cargas'], 3)
+        self.assertEqual(response.data['bloques'], 3)
+        self.assertFalse(Carga.objects.filter(periodo=self.periodo).exists())
+        self.assertEqual(BloqueHorario.objects.count(), 0)
+        self.assertEqual(Carga.objects.filter(periodo=self.activo).count(), 1)
+
+        archivo = PeriodoArchivado.objects.get(periodo=self.periodo)
+        self.assertTrue(archivo.filas_eliminadas)
+        self.assertEqual(archivo.total_cargas, 3)
+        self.assertEqual(
+            set(CargaArchivada.objects.values_list('id', flat=True)),
+            {c.id for c in self.cargas}
+        )
+
+    def test_no_archiva_periodo_activo(self):
+        """Solo se archivan periodos finalizados."""
+        response = self.client.post(f'/api/asignaciones/periodos/{self.activo.id}/archivar/')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PeriodoArchivado.objects.filter(periodo=self.activo).exists())
+
+    def test_listado_igual_antes_y_despues(self):
+        """GET /cargas/?periodo= devuelve lo mismo desde el documento archivado."""
+        url = f'/api/asignaciones/cargas/?periodo={self.periodo.id}'
+        antes = self.client.get(url).data
+
+        self._archivar()
+        despues = self.client.get(url).data
+
+        self.assertEqual(despues['count'], 3)
+        self.assertEqual(despues['results'], antes['results'])
+
+    def test_listado_archivado_aplica_filtros_y_alcance(self):
+        """Filtros del listado y alcance de RESP_PROGRAMA sobre el documento."""
+        self._archivar()
+
+        response = self.client.get(
+            f'/api/asignaciones/cargas/?periodo={self.periodo.id}'
+            f'&programa_academico={self.otro_programa.id}'
+        )
+        self.assertEqual([c['id'] for c in response.data['results']], [self.cargas[2].id])
+
+        responsable = User.objects.create_user(
+            username='resp_programa',
+            password='testpass123',
+            rol=User.Rol.RESP_PROGRAMA,
+            programa_academico=self.programa
+        )
+        self.client.force_authenticate(user=responsable)
+        response = self.client.get(f'/api/asignaciones/cargas/?periodo={self.periodo.id}')
+        self.assertEqual(
+            {c['id'] for c in response.data['results']},
+            {self.cargas[0].id, self.cargas[1].id}
+        )
+
+    def test_listado_archivado_busqueda_orden_y_errores_como_la_base(self):
+        """Búsqueda por términos, orden por varios campos y filtros inválidos."""
+        # Sin snapshot el listado consulta la base; archivar lo vuelve a crear
+        PeriodoArchivado.objects.all().delete()
+        ArchivoService.limpiar_cache()
+        Carga.objects.filter(id=self.cargas[1].id).update(estado=Carga.Estado.PENDIENTE)
+        consultas = [
+            'search=Materia 1',
+            'search=cs10 Pérez',
+            'search=cs100 cs101',
+            'ordering=estado,-created_at',
+            'ordering=-estado,created_at,inexistente',
+            'ordering=inexistente',
+            'profesor=abc',
+            'estado=CERRADA',
+        ]
+
+        def listar(consulta):
+            response = self.client.get(
+                f'/api/asignaciones/cargas/?periodo={self.periodo.id}&{consulta}'
+            )
+            if response.status_code != status.HTTP_200_OK:
+                return response.status_code, response.data
+            return response.status_code, [c['id'] for c in response.data['results']]
+
+        antes = {consulta: listar(consulta) for consulta in consultas}
+        self.assertEqual(antes['search=cs100 cs101'], (status.HTTP_200_OK, []))
+        self.assertEqual(antes['profesor=abc'][0], status.HTTP_400_BAD_REQUEST)
+        self._archivar()
+
+        for consulta in consultas:
+            self.assertEqual(listar(consulta), antes[consulta], consulta)
+
+    def test_otra_unidad_no_ve_el_archivo(self):
+        """El documento no se expone a usuarios de otra unidad."""
+        self._archivar()
+        otra = UnidadAcademica.objects.create(nombre='Otra Facultad')
+        ajeno = User.objects.create_user(
+            username='ajeno',
+            password='testpass123',
+            rol=User.Rol.RESP_UNIDAD,
+            unidad_academica=otra
+        )
+        self.client.force_authenticate(user=ajeno)
+
+        response = self.client.get(f'/api/asignaciones/cargas/?periodo={self.periodo.id}')
+        self.assertEqual(response.data['count'], 0)
+
+        response = self.client.get(f'/api/asignaciones/cargas/{self.cargas[0].id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_detalle_y_estadisticas_desde_archivo(self):
+        """retrieve y estadisticas siguen respondiendo tras archivar."""
+        detalle = f'/api/asignaciones/cargas/{self.cargas[0].id}/'
+        estadisticas = f'/api/asignaciones/periodos/{self.periodo.id}/estadisticas/'
+        detalle_antes = self.client.get(detalle).data
+        estadisticas_antes = self.client.get(estadisticas).data
+
+        self._archivar()
+
+        response = self.client.get(detalle)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, detalle_antes)
+        self.assertEqual(self.client.get(estadisticas).data, estadisticas_antes)
+
+    def test_detalle_de_periodo_activo_no_consulta_archivo(self):
+        """El detalle de una carga de un periodo activo no busca en el índice del archivo."""
+        carga = Carga.objects.get(periodo=self.activo)
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(f'/api/asignaciones/cargas/{carga.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for consulta in consultas.captured_queries:
+            self.assertNotIn('archivad', consulta['sql'])
+
+    def test_estadisticas_de_periodo_activo_leen_el_documento_una_vez(self):
+        """Sin snapshot, las estadísticas buscan el documento una sola vez."""
+        url = f'/api/asignaciones/periodos/{self.activo.id}/estadisticas/'
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sum('periodos_archivados' in c['sql'] for c in consultas.captured_queries), 1
+        )
+
+    def test_purgar_periodo_archivado(self):
+        """Purgar elimina también el documento archivado."""
+        ArchivoService.archivar_periodo(self.periodo)
+
+        PeriodoService.purgar_periodo(self.periodo)
+
+        self.assertFalse(Periodo.objects.filter(id=self.periodo.id).exists())
+        self.assertFalse(PeriodoArchivado.objects.exists())
+        self.assertFalse(CargaArchivada.objects.exists())
+
+    def test_finalizar_congela_snapshot(self):
+        """Al finalizar se guarda el documento sin sacar las filas de las tablas."""
+        archivo = PeriodoArchivado.objects.get(periodo=self.periodo)
+
+        self.assertFalse(archivo.filas_eliminadas)
+        self.assertEqual(archivo.total_cargas, 3)
+        self.assertEqual(Carga.objects.filter(periodo=self.periodo).count(), 3)
+        self.assertFalse(ArchivoService.esta_archivado(self.periodo.id))
+        documento = ArchivoService.descomprimir(archivo.documento)
+        self.assertTrue(documento['estadisticas']['finalizado'])
+
+    def test_lecturas_del_snapshot_sin_consultas(self):
+        """Con el documento en la caché del proceso no se toca la base de datos."""
+        listado = f'/api/asignaciones/cargas/?periodo={self.periodo.id}'
+        detalle = f'/api/asignaciones/cargas/{self.cargas[0].id}/'
+        estadisticas = f'/api/asignaciones/periodos/{self.periodo.id}/estadisticas/'
+        self.client.get(listado)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(listado)
+        self.assertEqual(response.data['count'], 3)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(detalle)
+        self.assertEqual(response.data['id'], self.cargas[0].id)
+        self.assertTrue(response.data['periodo']['finalizado'])
+
+        with self.assertNumQueries(0):
+            response = self.client.get(estadisticas)
+        self.assertEqual(response.data['total_cargas'], 3)
+
+    def test_eliminar_carga_regenera_snapshot(self):
+        """Eliminar una carga de un periodo finalizado actualiza su documento."""
+        url = f'/api/asignaciones/cargas/?periodo={self.periodo.id}'
+        self.assertEqual(self.client.get(url).data['count'], 3)
+
+        response = self.client.delete(f'/api/asignaciones/cargas/{self.cargas[0].id}/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(self.client.get(url).data['count'], 2)
+        response = self.client.get(f'/api/asignaciones/cargas/{self.cargas[0].id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            self.client.get(f'/api/asignaciones/cargas/{self.cargas[1].id}/')
+            .data['periodo']['estadisticas']['total_cargas'],
+            2
+        )
+
+    def test_detalle_de_periodo_archivado(self):
+        """GET /periodos/{id}/ reporta las estadísticas del snapshot tras archivar."""
+        url = f'/api/asignaciones/periodos/{self.periodo.id}/'
+        antes = self.client.get(url).data
+
+        self._archivar()
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['estadisticas']['total_cargas'], 3)
+        self.assertEqual(response.data['estadisticas'], antes['estadisticas'])
+        self.assertEqual(response.data['puede_finalizar'], antes['puede_finalizar'])
+        self.assertEqual(
+            response.data['estadisticas'],
+            self.client.get(f'{url}estadisticas/').data
+        )
+
+    def test_por_estado_incluye_periodos_archivados(self):
+        """por_estado cuenta las cargas archivadas, con y sin ?periodo=."""
+        urls = [
+            f'/api/asignaciones/cargas/por_estado/?periodo={self.periodo.id}',
+            '/api/asignaciones/cargas/por_estado/',
+        ]
+        antes = [self.client.get(url).data for url in urls]
+
+        self._archivar()
+
+        self.assertEqual([self.client.get(url).data for url in urls], antes)
+        self.assertEqual(antes[0], {'total': 3, 'correctas': 3, 'pendientes': 0})
+        self.assertEqual(antes[1], {'total': 4, 'correctas': 3, 'pendientes': 1})
+
+    def test_por_estado_archivado_respeta_alcance(self):
+        """Un responsable de programa solo cuenta las cargas archivadas de su programa."""
+        responsable = User.objects.create_user(
+            username='resp_programa', password='x',
+            rol=User.Rol.RESP_PROGRAMA, programa_academico=self.otro_programa
+        )
+        self._archivar()
+        self.client.force_authenticate(user=responsable)
+
+        response = self.client.get('/api/asignaciones/cargas/por_estado/')
+        self.assertEqual(response.data, {'total': 1, 'correctas': 1, 'pendientes': 0})
+
+    def test_cargas_de_profesor_y_materia_archivadas(self):
+        """Las acciones cargas de profesor y materia incluyen las archivadas."""
+        profesor = f'/api/academico/profesores/{self.profesor.id}/cargas/'
+        materia = f'/api/academico/materias/{self.cargas[0].materia_id}/cargas/'
+        urls = [profesor, f'{profesor}?periodo={self.periodo.id}', materia]
+        antes = [self.client.get(url).data for url in urls]
+
+        self._archivar()
+
+        despues = [self.client.get(url).data for url in urls]
+        for anterior, actual in zip(antes, despues):
+            self.assertEqual(
+                sorted(anterior, key=lambda c: c['id']),
+                sorted(actual, key=lambda c: c['id'])
+            )
+        self.assertEqual(len(despues[0]), 3)
+        self.assertEqual(len(despues[2]), 1)
+        self.assertEqual(
+            self.client.get(f'{profesor}?periodo={self.activo.id}').data, []
+        )
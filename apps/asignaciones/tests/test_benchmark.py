@@ -0,0 +1,161 @@
+"""
+Tests para la suite de rendimiento y el comando benchmark.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from datetime import time
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.benchmarks import SuiteRendimiento, comparar
+from apps.asignaciones.models import Periodo, Carga, BloqueHorario
+
+User = get_user_model()
+
+
+class CompararTestCase(SimpleTestCase):
+    """Tests para la detección de regresiones."""
+
+    def setUp(self):
+        self.base = {'casos': {'caso': {'mediana_ms': 100.0, 'consultas': 3}}}
+
+    def _actual(self, mediana_ms, consultas=3):
+        return {'casos': {
+            'caso': {'mediana_ms': mediana_ms, 'consultas': consultas},
+            'nuevo': {'mediana_ms': 1.0, 'consultas': 1},
+        }}
+
+    def test_dentro_del_umbral(self):
+        self.assertEqual(comparar(self._actual(119.0), self.base, 0.2, 1.0), [])
+
+    def test_mediana_sobre_el_umbral(self):
+        regresiones = comparar(self._actual(121.0), self.base, 0.2, 1.0)
+        self.assertEqual(len(regresiones), 1)
+        self.assertTrue(regresiones[0].startswith('caso: mediana'))
+
+    def test_diferencia_menor_al_minimo(self):
+        base = {'casos': {'caso': {'mediana_ms': 1.0, 'consultas': 3}}}
+        self.assertEqual(comparar(self._actual(1.5), base, 0.2, 1.0), [])
+
+    def test_mas_consultas(self):
+        regresiones = comparar(self._actual(100.0, consultas=4), self.base, 0.2, 1.0)
+        self.assertEqual(regresiones, ['caso: 4 consultas > 3'])
+
+    def test_entorno_distinto(self):
+        """Un resultado sobre otro periodo o volumen de cargas no se compara."""
+        entorno = {'vendor': 'sqlite', 'periodo_id': 1, 'cargas_periodo': 500}
+        base = dict(self.base, entorno=entorno)
+        actual = dict(self._actual(100.0), entorno=dict(entorno, cargas_periodo=50))
+
+        with self.assertRaisesMessage(ValueError, 'cargas_periodo 500 -> 50'):
+            comparar(actual, base, 0.2, 1.0)
+        self.assertEqual(comparar(actual, base, 0.2, 1.0, ignorar_entorno=True), [])
+
+
+class BenchmarkCommandTestCase(TestCase):
+    """El comando mide todos los casos y falla ante regresiones."""
+
+    def setUp(self):
+        unidad = UnidadAcademica.objects.create(nombre='Facultad de Ingeniería')
+        programa = ProgramaAcademico.objects.create(unidad_academica=unidad, nombre='Ing. Software')
+        materia = Materia.objects.create(
+            programa_academico=programa, clave='CS101', nombre='Programación I', horas=4
+        )
+        profesor = Profesor.objects.create(
+            unidad_academica=unidad, nombre='Dr. Juan Pérez', email='juan@test.com'
+        )
+        self.periodo = Periodo.objects.create(unidad_academica=unidad, nombre='2025-1')
+        User.objects.create_user(
+            username='resp_unidad', rol=User.Rol.RESP_UNIDAD, unidad_academica=unidad
+        )
+        for dia in ['LUN', 'MIE']:
+            carga = Carga.objects.create(
+                programa_academico=programa,
+                materia=materia,
+                profesor=profesor,
+                periodo=self.periodo,
+                estado=Carga.Estado.CORRECTA
+            )
+            BloqueHorario.objects.create(
+                carga=carga, dia=dia, hora_inicio=time(8, 0), hora_fin=time(10, 0)
+            )
+
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        self.salida = os.path.join(directorio, 'resultado.json')
+        self.base = os.path.join(directorio, 'base.json')
+
+    def _benchmark(self, *args):
+        call_command(
+            'benchmark', '--repeticiones', '1', '--salida', self.salida, *args,
+            stdout=StringIO(), stderr=StringIO()
+        )
+        with open(self.salida, encoding='utf-8') as archivo:
+            return json.load(archivo)
+
+    def test_resultado_json(self):
+        resultado = self._benchmark()
+
+        self.assertEqual(resultado['entorno']['periodo_id'], self.periodo.id)
+        self.assertEqual(resultado['entorno']['cargas_periodo'], 2)
+        casos = resultado['casos']
+        for nombre in [
+            'validador_conflictos.validar_disponibilidad_profesor',
+            'validador_horas.validar_horas_carga[2]',
+            'periodo_service.obtener_estadisticas_periodo',
+            'serializer.CargaDetailSerializer[1000]',
+            'endpoint.carga-list',
+            'endpoint.periodo-estadisticas',
+        ]:
+            self.assertIn(nombre, casos)
+        self.assertEqual(set(casos['endpoint.carga-list']), {
+            'repeticiones', 'mediana_ms', 'p95_ms', 'min_ms', 'consultas'
+        })
+
+    def test_falla_ante_regresion(self):
+        resultado = self._benchmark('--filtro', 'periodo_service')
+        for medicion in resultado['casos'].values():
+            medicion['consultas'] = 0
+        with open(self.base, 'w', encoding='utf-8') as archivo:
+            json.dump(resultado, archivo)
+
+        with self.assertRaisesMessage(CommandError, 'regresiones'):
+            self._benchmark('--filtro', 'periodo_service', '--base', self.base)
+
+    def test_base_de_otro_entorno(self):
+        resultado = self._benchmark('--filtro', 'periodo_service')
+        resultado['entorno']['cargas_periodo'] = 5000
+        # Solo se prueba la verificación del entorno, no los tiempos de la máquina
+        for medicion in resultado['casos'].values():
+            medicion['mediana_ms'] = 1e9
+            medicion['consultas'] = 1e9
+        with open(self.base, 'w', encoding='utf-8') as archivo:
+            json.dump(resultado, archivo)
+
+        with self.assertRaisesMessage(CommandError, '--ignorar-entorno'):
+            self._benchmark('--filtro', 'periodo_service', '--base', self.base)
+        self._benchmark('--filtro', 'periodo_service', '--base', self.base, '--ignorar-entorno')
+
+    def test_peticiones_con_jwt_del_responsable_de_unidad(self):
+        """Las peticiones llevan el JWT con los claims del responsable de unidad."""
+        client = SuiteRendimiento(self.periodo)._cliente()
+        response = client.get('/api/asignaciones/periodos/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.user.username, 'resp_unidad')
+        self.assertEqual(response.wsgi_request.auth['rol'], User.Rol.RESP_UNIDAD)
+
+    def test_sin_cargas(self):
+        Carga.objects.all().delete()
+
+        with self.assertRaisesMessage(CommandError, 'No hay cargas'):
+            self._benchmark()
@@ -0,0 +1,155 @@
+"""
+Tests para la eliminación masiva de cargas y periodos.
+"""
+
+from datetime import time
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.models import Periodo, Carga, BloqueHorario
+from apps.asignaciones.services import PeriodoService
+
+User = get_user_model()
+
+
+class EliminacionMasivaTestCase(TestCase):
+    """Tests para eliminar_lote de cargas y purgar periodos."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre="Facultad de Ingeniería")
+        self.programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Software'
+        )
+        self.materia = Materia.objects.create(
+            programa_academico=self.programa,
+            clave='CS101',
+            nombre='Programación I',
+            horas=2
+        )
+        self.profesor = Profesor.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Dr. Juan Pérez',
+            email='juan@test.com'
+        )
+        self.periodo = Periodo.objects.create(unidad_academica=self.unidad, nombre='2025-1')
+        self.otro_periodo = Periodo.objects.create(unidad_academica=self.unidad, nombre='2025-2')
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            rol=User.Rol.RESP_UNIDAD,
+            unidad_academica=self.unidad
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _crear_cargas(self, periodo, n, estado=Carga.Estado.CORRECTA):
+        for i in range(n):
+            carga = Carga.objects.create(
+                programa_academico=self.programa,
+                materia=self.materia,
+                profesor=self.profesor,
+                periodo=periodo,
+                estado=estado
+            )
+            BloqueHorario.objects.create(
+                carga=carga, dia='LUN', hora_inicio=time(8 + i), hora_fin=time(9 + i)
+            )
+
+    @staticmethod
+    def _sentencias(consultas):
+        """Sentencias sobre cargas/bloques, sin savepoints ni consultas de alcance."""
+        return [
+            q['sql'].split()[0] for q in consultas.captured_queries
+            if 'bloques_horarios' in q['sql'] or q['sql'].startswith('DELETE')
+        ]
+
+    def test_eliminar_lote_por_filtro(self):
+        """Solo se eliminan las cargas (y bloques) que coinciden con el filtro."""
+        self._crear_cargas(self.periodo, 3, Carga.Estado.PENDIENTE)
+        self._crear_cargas(self.periodo, 2)
+        self._crear_cargas(self.otro_periodo, 2, Carga.Estado.PENDIENTE)
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.post(
+                f'/api/asignaciones/cargas/eliminar_lote/?periodo={self.periodo.id}&estado=PENDIENTE'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['eliminadas'], {'cargas': 3, 'bloques': 3})
+        self.assertEqual(Carga.objects.count(), 4)
+        self.assertEqual(BloqueHorario.objects.count(), 4)
+        self.assertEqual(self._sentencias(consultas), ['DELETE', 'DELETE'])
+
+    def test_eliminar_lote_requiere_filtro(self):
+        """Sin filtros no se elimina nada."""
+        self._crear_cargas(self.periodo, 2)
+
+        response = self.client.post('/api/asignaciones/cargas/eliminar_lote/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Carga.objects.count(), 2)
+
+    def test_eliminar_lote_filtro_vacio(self):
+        """Un filtro sin valor (?periodo=) no cuenta y no elimina nada."""
+        self._crear_cargas(self.periodo, 1)
+        self._crear_cargas(self.otro_periodo, 1)
+
+        response = self.client.post('/api/asignaciones/cargas/eliminar_lote/?periodo=')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Carga.objects.count(), 2)
+
+        response = self.client.post('/api/asignaciones/cargas/eliminar_lote/?periodo=&estado=')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Carga.objects.count(), 2)
+
+    def test_eliminar_lote_filtro_invalido(self):
+        """Un valor de filtro inválido responde 400 sin eliminar."""
+        self._crear_cargas(self.periodo, 1)
+
+        response = self.client.post('/api/asignaciones/cargas/eliminar_lote/?estado=NO_EXISTE')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Carga.objects.count(), 1)
+
+    def test_eliminar_lote_respeta_alcance(self):
+        """Un responsable de programa no elimina cargas de otro programa."""
+        otro = ProgramaAcademico.objects.create(unidad_academica=self.unidad, nombre='Otro')
+        responsable = User.objects.create_user(
+            username='resp_otro', password='x',
+            rol=User.Rol.RESP_PROGRAMA, programa_academico=otro
+        )
+        self._crear_cargas(self.periodo, 2)
+        self.client.force_authenticate(user=responsable)
+
+        response = self.client.post(
+            f'/api/asignaciones/cargas/eliminar_lote/?periodo={self.periodo.id}'
+        )
+        self.assertEqual(response.data['eliminadas']['cargas'], 0)
+        self.assertEqual(Carga.objects.count(), 2)
+
+    def test_purgar_periodo(self):
+        """Purgar elimina el periodo, sus cargas y bloques en sentencias masivas."""
+        self._crear_cargas(self.periodo, 5)
+        self._crear_cargas(self.otro_periodo, 1)
+
+        with CaptureQueriesContext(connection) as consultas:
+            eliminadas = PeriodoService.purgar_periodo(self.periodo)
+
+        self.assertEqual(eliminadas, {'cargas': 5, 'bloques': 5, 'periodos': 1})
+        self.assertEqual(self._sentencias(consultas), ['DELETE', 'DELETE', 'DELETE'])
+        self.assertFalse(Periodo.objects.filter(id=self.periodo.id).exists())
+        self.assertEqual(Carga.objects.count(), 1)
+
+    def test_purgar_periodo_endpoint(self):
+        """POST /api/asignaciones/periodos/{id}/purgar/ devuelve los conteos."""
+        self._crear_cargas(self.periodo, 2)
+
+        response = self.client.post(f'/api/asignaciones/periodos/{self.periodo.id}/purgar/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['eliminadas']['cargas'], 2)
@@ -0,0 +1,223 @@
+"""
+Tests para el soporte de Idempotency-Key en CargaViewSet.
+"""
+
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico, ClaveIdempotencia
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.models import Periodo, Carga
+from apps.asignaciones.views import CargaViewSet
+
+User = get_user_model()
+
+
+class IdempotenciaCargaTestCase(TestCase):
+    """Tests para create/update con el header Idempotency-Key."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre="Facultad de Ingeniería")
+        self.programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Software'
+        )
+        self.materia = Materia.objects.create(
+            programa_academico=self.programa,
+            clave='CS101',
+            nombre='Programación I',
+            horas=6
+        )
+        self.profesor = Profesor.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Dr. Juan Pérez',
+            email='juan@test.com'
+        )
+        self.periodo = Periodo.objects.create(
+            unidad_academica=self.unidad,
+            nombre='2025-1'
+        )
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            rol=User.Rol.RESP_PROGRAMA,
+            programa_academico=self.programa
+        )
+        self.client.force_authenticate(user=self.user)
+        self.data = {
+            'programa_academico': self.programa.id,
+            'materia': self.materia.id,
+            'profesor': self.profesor.id,
+            'periodo': self.periodo.id,
+            'bloques': [
+                {'dia': 'LUN', 'hora_inicio': '08:00:00', 'hora_fin': '10:00:00'},
+                {'dia': 'MIE', 'hora_inicio': '08:00:00', 'hora_fin': '10:00:00'},
+                {'dia': 'VIE', 'hora_inicio': '08:00:00', 'hora_fin': '10:00:00'}
+            ]
+        }
+
+    def _post(self, data, clave):
+        return self.client.post(
+            '/api/asignaciones/cargas/',
+            data,
+            format='json',
+            HTTP_IDEMPOTENCY_KEY=clave
+        )
+
+    def test_reintento_repite_respuesta_sin_duplicar(self):
+        """Un reintento con la misma clave no crea otra carga."""
+        primera = self._post(self.data, 'clave-1')
+        segunda = self._post(self.data, 'clave-1')
+
+        self.assertEqual(primera.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(segunda.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(segunda['Idempotent-Replayed'], 'true')
+        self.assertEqual(segunda.data['id'], primera.data['id'])
+        self.assertEqual(Carga.objects.count(), 1)
+
+    def test_clave_reutilizada_con_otro_cuerpo(self):
+        """La misma clave con un cuerpo distinto se rechaza (422)."""
+        self._post(self.data, 'clave-1')
+        otra = dict(self.data, profesor=None, bloques=[])
+
+        response = self._post(otra, 'clave-1')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Carga.objects.count(), 1)
+
+    def test_error_no_se_almacena(self):
+        """Una respuesta de error libera la clave para reintentar."""
+        invalida = dict(self.data, bloques=self.data['bloques'][:1])
+
+        response = self._post(invalida, 'clave-1')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ClaveIdempotencia.objects.exists())
+
+    def test_clave_en_proceso_durante_la_vista(self):
+        """Mientras la vista se ejecuta la clave está reclamada: un reintento recibe 409."""
+        original = CargaViewSet.perform_create
+        reintentos = []
+
+        def perform_create(viewset, serializer):
+            reintentos.append(self._post(self.data, 'clave-1'))
+            original(viewset, serializer)
+
+        with mock.patch.object(CargaViewSet, 'perform_create', perform_create):
+            primera = self._post(self.data, 'clave-1')
+
+        self.assertEqual(primera.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(reintentos[0].status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Carga.objects.count(), 1)
+
+    def test_clave_reclamada_entre_lectura_e_insert(self):
+        """Si otra petición gana el INSERT, se repite su respuesta ya almacenada."""
+        primera = self._post(self.data, 'clave-1')
+        registro = ClaveIdempotencia.objects.get()
+
+        with mock.patch('common.idempotencia._buscar', side_effect=[None, registro]):
+            segunda = self._post(self.data, 'clave-1')
+
+        self.assertEqual(segunda.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(segunda['Idempotent-Replayed'], 'true')
+        self.assertEqual(segunda.data['id'], primera.data['id'])
+        self.assertEqual(Carga.objects.count(), 1)
+
+    def test_reclamo_vencido_se_retoma(self):
+        """Una clave en proceso más allá del plazo (worker caído) se vuelve a ejecutar."""
+        self._post(self.data, 'clave-1')
+        Carga.objects.all().delete()
+        # Estado que deja un worker que murió a mitad de la petición
+        ClaveIdempotencia.objects.update(
+            status_code=None,
+            respuesta=None,
+            reclamada_en=timezone.now() - timedelta(seconds=30)
+        )
+
+        with self.settings(IDEMPOTENCY_PROCESSING_LEASE=timedelta(seconds=60)):
+            response = self._post(self.data, 'clave-1')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        ClaveIdempotencia.objects.update(reclamada_en=timezone.now() - timedelta(seconds=61))
+        with self.settings(IDEMPOTENCY_PROCESSING_LEASE=timedelta(seconds=60)):
+            response = self._post(self.data, 'clave-1')
+            repetida = self._post(self.data, 'clave-1')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(repetida['Idempotent-Replayed'], 'true')
+        self.assertEqual(repetida.data['id'], response.data['id'])
+        self.assertEqual(Carga.objects.count(), 1)
+
+    def test_reclamo_retomado_no_se_sobrescribe(self):
+        """Si la petición original termina tras perder la clave, no pisa la respuesta guardada."""
+        original = CargaViewSet.perform_create
+        reintentos = []
+
+        def perform_create(viewset, serializer):
+            if not reintentos:
+                reintentos.append(None)
+                ClaveIdempotencia.objects.update(
+                    reclamada_en=timezone.now() - timedelta(minutes=5)
+                )
+                reintentos[0] = self._post(self.data, 'clave-1')
+            original(viewset, serializer)
+
+        with mock.patch.object(CargaViewSet, 'perform_create', perform_create):
+            primera = self._post(self.data, 'clave-1')
+
+        self.assertEqual(primera.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(reintentos[0].status_code, status.HTTP_201_CREATED)
+        repetida = self._post(self.data, 'clave-1')
+        self.assertEqual(repetida.data['id'], reintentos[0].data['id'])
+        self.assertEqual(ClaveIdempotencia.objects.count(), 1)
+
+    def test_actualizacion_parcial_idempotente(self):
+        """PATCH con clave se repite sin volver a escribir."""
+        carga = Carga.objects.create(
+            programa_academico=self.programa,
+            materia=self.materia,
+            periodo=self.periodo
+        )
+        url = f'/api/asignaciones/cargas/{carga.id}/'
+
+        primera = self.client.patch(
+            url, {'profesor': self.profesor.id}, format='json',
+            HTTP_IDEMPOTENCY_KEY='patch-1'
+        )
+        Carga.objects.filter(id=carga.id).update(profesor=None)
+        segunda = self.client.patch(
+            url, {'profesor': self.profesor.id}, format='json',
+            HTTP_IDEMPOTENCY_KEY='patch-1'
+        )
+
+        self.assertEqual(primera.status_code, status.HTTP_200_OK)
+        self.assertEqual(segunda['Idempotent-Replayed'], 'true')
+        carga.refresh_from_db()
+        self.assertIsNone(carga.profesor)
+
+    def test_limpiar_claves_expiradas(self):
+        """El comando elimina solo las claves expiradas."""
+        ahora = timezone.now()
+        ClaveIdempotencia.objects.create(
+            usuario=self.user, clave='vieja', huella='x',
+            expira_en=ahora - timedelta(hours=1)
+        )
+        ClaveIdempotencia.objects.create(
+            usuario=self.user, clave='vigente', huella='x',
+            expira_en=ahora + timedelta(hours=1)
+        )
+
+        call_command('limpiar_claves_idempotencia', stdout=StringIO())
+
+        self.assertEqual(
+            list(ClaveIdempotencia.objects.values_list('clave', flat=True)),
+            ['vigente']
+        )
@@ -0,0 +1,129 @@
+"""
+Tests de planes de ejecución: las consultas frecuentes usan índices.
+"""
+
+from datetime import time
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.models import Periodo, Carga, BloqueHorario
+from apps.asignaciones.services import ValidadorConflictos
+from apps.asignaciones.views import CargaViewSet
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN es específico de SQLite')
+class PlanesConsultaTestCase(TestCase):
+    """Verifica con EXPLAIN QUERY PLAN que las consultas calientes no recorren tablas completas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.unidad = UnidadAcademica.objects.create(nombre="Facultad de Ingeniería")
+        cls.programa = ProgramaAcademico.objects.create(
+            unidad_academica=cls.unidad,
+            nombre="Ingeniería en Software"
+        )
+        cls.profesor = Profesor.objects.create(
+            unidad_academica=cls.unidad,
+            nombre="Dr. Juan Pérez",
+            email="juan@test.com"
+        )
+        cls.materia = Materia.objects.create(
+            programa_academico=cls.programa,
+            clave="CS101",
+            nombre="Programación I",
+            horas=2
+        )
+        cls.periodo = Periodo.objects.create(
+            unidad_academica=cls.unidad,
+            nombre="2025-1"
+        )
+        cls.carga = Carga.objects.create(
+            programa_academico=cls.programa,
+            materia=cls.materia,
+            profesor=cls.profesor,
+            periodo=cls.periodo
+        )
+        BloqueHorario.objects.create(
+            carga=cls.carga,
+            dia='LUN',
+            hora_inicio=time(8, 0),
+            hora_fin=time(10, 0)
+        )
+
+    def _plan(self, queryset):
+        """Devuelve las líneas de EXPLAIN QUERY PLAN de un queryset."""
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [fila[-1] for fila in cursor.fetchall()]
+
+    def _assert_usa_indice(self, queryset, tabla, indice=None):
+        """Falla si `tabla` se recorre completa o sin el índice esperado."""
+        plan = self._plan(queryset)
+        lineas = [linea for linea in plan if f' {tabla} ' in f'{linea} ']
+        self.assertTrue(lineas, f'{tabla} no aparece en el plan: {plan}')
+        for linea in lineas:
+            self.assertIn('INDEX', linea, f'Recorrido completo de {tabla}: {plan}')
+        if indice:
+            self.assertTrue(
+                any(indice in linea for linea in lineas),
+                f'No se usa {indice}: {plan}'
+            )
+        return plan
+
+    def test_conteo_por_estado_del_periodo(self):
+        """Estadísticas/puede_finalizar: índice cubriente (periodo, estado)."""
+        # Misma forma que exists()/count(): sin ORDER BY
+        queryset = self.periodo.cargas.filter(
+            estado=Carga.Estado.PENDIENTE
+        ).order_by().values('id')
+        plan = self._assert_usa_indice(queryset, 'cargas', 'cargas_periodo_7eae39_idx')
+        self.assertTrue(any('COVERING INDEX' in linea for linea in plan), plan)
+
+    def test_cargas_del_programa_en_periodo(self):
+        """Alcance de RESP_PROGRAMA filtrado por periodo: (programa_academico, periodo)."""
+        queryset = Carga.objects.filter(
+            programa_academico=self.programa,
+            periodo=self.periodo
+        )
+        self._assert_usa_indice(queryset, 'cargas', 'cargas_program_014107_idx')
+
+    def test_listado_ordenado_por_fecha(self):
+        """Listado sin filtros: se recorre el índice de created_at sin ordenar en memoria."""
+        queryset = CargaViewSet.queryset.all()
+        plan = self._assert_usa_indice(queryset, 'cargas', 'cargas_created_8feb2a_idx')
+        self.assertFalse(any('TEMP B-TREE' in linea for linea in plan), plan)
+
+    def test_cargas_de_la_unidad(self):
+        """Alcance de RESP_UNIDAD: join por programa sin recorrer cargas completa."""
+        queryset = Carga.objects.filter(
+            programa_academico__unidad_academica=self.unidad
+        )
+        self._assert_usa_indice(queryset, 'cargas')
+
+    def test_bloques_de_una_carga(self):
+        """carga.bloques.all(): índice (carga, dia, hora_inicio) sin ordenar en memoria."""
+        queryset = self.carga.bloques.all()
+        plan = self._assert_usa_indice(queryset, 'bloques_horarios', 'bloques_hor_carga_i_f129e1_idx')
+        self.assertFalse(any('TEMP B-TREE' in linea for linea in plan), plan)
+
+    def test_prefetch_de_bloques(self):
+        """prefetch_related('bloques'): búsqueda por carga_id IN (...)."""
+        queryset = BloqueHorario.objects.filter(carga_id__in=[self.carga.id, 0])
+        self._assert_usa_indice(queryset, 'bloques_horarios')
+
+    def test_solapamiento_de_profesor(self):
+        """validar_disponibilidad_profesor: índices de cargas y bloques."""
+        queryset = ValidadorConflictos.filtrar_bloques_solapados(
+            BloqueHorario.objects.filter(
+                carga__profesor=self.profesor,
+                carga__periodo=self.periodo
+            ),
+            [BloqueHorario(dia='LUN', hora_inicio=time(9, 0), hora_fin=time(11, 0))]
+        )
+        self._assert_usa_indice(queryset, 'cargas')
+        self._assert_usa_indice(queryset, 'bloques_horarios')
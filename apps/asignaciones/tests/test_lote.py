@@ -0,0 +1,201 @@
+"""
+Tests para el PATCH por lote de cargas.
+"""
+
+from datetime import time
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.models import Periodo, Carga, BloqueHorario
+
+User = get_user_model()
+
+URL_LOTE = '/api/asignaciones/cargas/lote/'
+
+
+class CargaLoteTestCase(TestCase):
+    """Tests para PATCH /api/asignaciones/cargas/lote/."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre="Facultad de Ingeniería")
+        self.programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Software'
+        )
+        self.materia = Materia.objects.create(
+            programa_academico=self.programa,
+            clave='CS101',
+            nombre='Programación I',
+            horas=2
+        )
+        self.profesor1 = Profesor.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Dr. Juan Pérez',
+            email='juan@test.com'
+        )
+        self.profesor2 = Profesor.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Dra. Ana López',
+            email='ana@test.com'
+        )
+        self.periodo = Periodo.objects.create(
+            unidad_academica=self.unidad,
+            nombre='2025-1'
+        )
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            rol=User.Rol.RESP_PROGRAMA,
+            programa_academico=self.programa
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _crear_carga(self, profesor, dia='LUN', inicio=8, fin=10):
+        carga = Carga.objects.create(
+            programa_academico=self.programa,
+            materia=self.materia,
+            profesor=profesor,
+            periodo=self.periodo,
+            estado=Carga.Estado.CORRECTA
+        )
+        BloqueHorario.objects.create(
+            carga=carga, dia=dia, hora_inicio=time(inicio), hora_fin=time(fin)
+        )
+        return carga
+
+    def test_reasignar_profesor(self):
+        """Reasignar varias cargas a otro profesor sin conflictos."""
+        carga1 = self._crear_carga(self.profesor1, 'LUN')
+        carga2 = self._crear_carga(self.profesor1, 'MAR')
+
+        response = self.client.patch(URL_LOTE, {'cambios': [
+            {'id': carga1.id, 'profesor': self.profesor2.id},
+            {'id': carga2.id, 'profesor': self.profesor2.id},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_actualizadas'], 2)
+        self.assertEqual(
+            Carga.objects.filter(profesor=self.profesor2).count(), 2
+        )
+
+    def test_intercambio_de_profesores_en_el_mismo_horario(self):
+        """Dos cargas en el mismo horario pueden intercambiar profesor."""
+        carga1 = self._crear_carga(self.profesor1, 'LUN')
+        carga2 = self._crear_carga(self.profesor2, 'LUN')
+
+        response = self.client.patch(URL_LOTE, {'cambios': [
+            {'id': carga1.id, 'profesor': self.profesor2.id},
+            {'id': carga2.id, 'profesor': self.profesor1.id},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        carga1.refresh_from_db()
+        self.assertEqual(carga1.profesor, self.profesor2)
+
+    def test_conflicto_no_escribe_nada(self):
+        """Si un cambio genera conflicto, ningún cambio del lote se aplica."""
+        carga1 = self._crear_carga(self.profesor1, 'LUN')
+        carga2 = self._crear_carga(self.profesor2, 'LUN')
+        carga3 = self._crear_carga(self.profesor2, 'MAR')
+
+        response = self.client.patch(URL_LOTE, {'cambios': [
+            {'id': carga3.id, 'profesor': self.profesor1.id},
+            {'id': carga1.id, 'profesor': self.profesor2.id},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['errores'][0]['id'], carga1.id)
+        self.assertEqual(response.data['errores'][0]['conflictos'][0]['carga_id'], carga2.id)
+        carga3.refresh_from_db()
+        self.assertEqual(carga3.profesor, self.profesor2)
+
+    def test_mover_bloques(self):
+        """Reemplazar bloques valida las horas y recalcula el estado."""
+        carga = self._crear_carga(self.profesor1, 'LUN')
+
+        response = self.client.patch(URL_LOTE, {'cambios': [
+            {'id': carga.id, 'bloques': [
+                {'dia': 'JUE', 'hora_inicio': '12:00:00', 'hora_fin': '14:00:00'}
+            ]},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(carga.bloques.values_list('dia', flat=True)), ['JUE'])
+
+        response = self.client.patch(URL_LOTE, {'cambios': [
+            {'id': carga.id, 'bloques': [
+                {'dia': 'JUE', 'hora_inicio': '12:00:00', 'hora_fin': '13:00:00'}
+            ]},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_quitar_profesor_deja_pendiente(self):
+        """Quitar el profesor deja la carga PENDIENTE."""
+        carga = self._crear_carga(self.profesor1)
+
+        response = self.client.patch(URL_LOTE, {'cambios': [
+            {'id': carga.id, 'profesor': None},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        carga.refresh_from_db()
+        self.assertEqual(carga.estado, Carga.Estado.PENDIENTE)
+
+    def test_carga_fuera_de_alcance(self):
+        """Cargas de otro programa no se pueden modificar."""
+        otro = ProgramaAcademico.objects.create(unidad_academica=self.unidad, nombre='Otro')
+        carga = Carga.objects.create(
+            programa_academico=otro, materia=self.materia, periodo=self.periodo
+        )
+
+        response = self.client.patch(URL_LOTE, {'cambios': [
+            {'id': carga.id, 'profesor': self.profesor1.id},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_profesor_de_otra_unidad(self):
+        """No se puede reasignar una carga a un profesor fuera del alcance."""
+        otra_unidad = UnidadAcademica.objects.create(nombre='Facultad de Medicina')
+        ajeno = Profesor.objects.create(
+            unidad_academica=otra_unidad,
+            nombre='Dr. Ajeno',
+            email='ajeno@test.com'
+        )
+        carga = self._crear_carga(self.profesor1)
+
+        response = self.client.patch(URL_LOTE, {'cambios': [
+            {'id': carga.id, 'profesor': ajeno.id},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fuera de su alcance', response.data['errores'][0]['error'])
+        carga.refresh_from_db()
+        self.assertEqual(carga.profesor, self.profesor1)
+
+    def test_consultas_constantes(self):
+        """El número de consultas no crece con el tamaño del lote."""
+        dias = ['LUN', 'MAR', 'MIE', 'JUE', 'VIE']
+
+        def ejecutar(n):
+            cargas = [self._crear_carga(self.profesor1, 'LUN', 7 + i, 8 + i) for i in range(n)]
+            with CaptureQueriesContext(connection) as consultas:
+                response = self.client.patch(URL_LOTE, {'cambios': [
+                    {'id': c.id, 'profesor': self.profesor2.id,
+                     'bloques': [{'dia': dias[i % 5], 'hora_inicio': f'{8 + 2 * (i // 5):02d}:00:00',
+                                  'hora_fin': f'{10 + 2 * (i // 5):02d}:00:00'}]}
+                    for i, c in enumerate(cargas)
+                ]}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            Carga.objects.all().delete()
+            return len(consultas)
+
+        self.assertEqual(ejecutar(2), ejecutar(10))
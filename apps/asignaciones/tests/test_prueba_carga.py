@@ -0,0 +1,114 @@
+"""
+Tests para la prueba de carga concurrente y el comando prueba_carga.
+"""
+
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.models import Periodo, Carga
+from apps.asignaciones.prueba_carga import Programador, parsear_mezcla, percentil, resumir
+
+User = get_user_model()
+
+
+class PruebaCargaUtilidadesTestCase(SimpleTestCase):
+    """Tests para mezcla, percentiles, resumen y bloques generados."""
+
+    def test_parsear_mezcla(self):
+        self.assertEqual(parsear_mezcla('listar=3, crear=1'), {'listar': 3, 'crear': 1})
+        with self.assertRaisesMessage(ValueError, 'Operación desconocida'):
+            parsear_mezcla('borrar=1')
+        with self.assertRaisesMessage(ValueError, 'peso positivo'):
+            parsear_mezcla('listar=0')
+
+    def test_percentil(self):
+        valores = list(range(1, 101))
+        self.assertEqual(percentil(valores, 0.50), 50)
+        self.assertEqual(percentil(valores, 0.99), 99)
+        self.assertEqual(percentil([], 0.95), 0.0)
+
+    def test_resumir_clasifica_estados(self):
+        muestras = [
+            ('crear', 10.0, 201),
+            ('crear', 20.0, 409),
+            ('crear', 30.0, 429),
+            ('crear', 40.0, 500),
+            ('listar', 5.0, 0),
+        ]
+
+        resultado = resumir(muestras, 2.0)
+
+        crear = resultado['operaciones']['crear']
+        self.assertEqual(
+            (crear['ok'], crear['rechazadas'], crear['limitadas'], crear['errores']),
+            (1, 1, 1, 1)
+        )
+        self.assertEqual(crear['por_segundo'], 2.0)
+        self.assertEqual(crear['p50_ms'], 20.0)
+        self.assertEqual(resultado['total']['errores'], 2)
+        self.assertEqual(resultado['total']['tasa_error'], 0.4)
+
+    def test_bloques_suman_las_horas_en_dias_distintos(self):
+        programador = Programador(
+            {'token': 't', 'periodos': [1], 'materias': [], 'profesores': [1]},
+            semilla=7
+        )
+        for horas in range(1, 13):
+            bloques = programador._bloques(horas)
+            total = sum(int(b['hora_fin'][:2]) - int(b['hora_inicio'][:2]) for b in bloques)
+            self.assertEqual(total, horas)
+            self.assertEqual(len({b['dia'] for b in bloques}), len(bloques))
+            self.assertTrue(all('07:00:00' <= b['hora_inicio'] < b['hora_fin'] <= '21:00:00' for b in bloques))
+
+
+class PruebaCargaCommandTestCase(TestCase):
+    """El comando ejecuta la mezcla en proceso y elimina lo que crea."""
+
+    def setUp(self):
+        unidad = UnidadAcademica.objects.create(nombre='Facultad de Ingeniería')
+        programa = ProgramaAcademico.objects.create(unidad_academica=unidad, nombre='Ing. Software')
+        Materia.objects.create(programa_academico=programa, clave='CS101', nombre='Programación I', horas=4)
+        for n in range(3):
+            Profesor.objects.create(
+                unidad_academica=unidad, nombre=f'Profesor {n}', email=f'profesor{n}@test.com'
+            )
+        Periodo.objects.create(unidad_academica=unidad, nombre='2025-1')
+        User.objects.create_user(
+            username='sintetico_unidad_1',
+            password='desarrollo123',
+            rol=User.Rol.RESP_UNIDAD,
+            unidad_academica=unidad
+        )
+
+    def test_resultado_json(self):
+        salida = StringIO()
+        call_command(
+            'prueba_carga', '--hilos', '1', '--segundos', '0.5', '--sin-limites', '--json',
+            '--mezcla', 'listar=1,validar=1,crear=2,actualizar=1,estadisticas=1',
+            stdout=salida
+        )
+
+        resultado = json.loads(salida.getvalue())
+        self.assertEqual(resultado['configuracion']['usuarios'], 1)
+        self.assertEqual(resultado['total']['errores'], 0)
+        self.assertGreater(resultado['operaciones']['crear']['ok'], 0)
+        self.assertEqual(set(resultado['operaciones']['listar']), {
+            'peticiones', 'por_segundo', 'p50_ms', 'p95_ms', 'p99_ms',
+            'ok', 'rechazadas', 'limitadas', 'errores', 'tasa_error'
+        })
+        self.assertEqual(Carga.objects.count(), 0)
+
+    def test_sin_usuarios(self):
+        with self.assertRaisesMessage(CommandError, 'No hay responsables de unidad'):
+            call_command('prueba_carga', '--prefijo', 'inexistente_', stdout=StringIO())
+
+    def test_mezcla_invalida(self):
+        with self.assertRaisesMessage(CommandError, 'Operación desconocida'):
+            call_command('prueba_carga', '--mezcla', 'borrar=1', stdout=StringIO())
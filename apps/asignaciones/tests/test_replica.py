@@ -0,0 +1,135 @@
+"""
+Tests para el enrutamiento de lecturas a la réplica (ReplicaRouter + middleware).
+"""
+
+from datetime import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.models import Periodo, Carga, BloqueHorario
+
+User = get_user_model()
+
+
+def _consultas_cargas(contexto):
+    return [q['sql'] for q in contexto.captured_queries if '"cargas"' in q['sql']]
+
+
+@override_settings(LECTURAS_EN_REPLICA=True)
+class LecturaReplicaTestCase(TransactionTestCase):
+    """Las lecturas van a 'replica'; escrituras y validaciones al primario."""
+    # TransactionTestCase: la réplica es otra conexión (espejo de default)
+    # y solo ve datos confirmados
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre="Facultad de Ingeniería")
+        self.programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Software'
+        )
+        self.materia = Materia.objects.create(
+            programa_academico=self.programa,
+            clave='CS101',
+            nombre='Programación I',
+            horas=2
+        )
+        self.profesor = Profesor.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Dr. Juan Pérez',
+            email='juan@test.com'
+        )
+        self.periodo = Periodo.objects.create(unidad_academica=self.unidad, nombre='2025-1')
+        self.carga = Carga.objects.create(
+            programa_academico=self.programa,
+            materia=self.materia,
+            profesor=self.profesor,
+            periodo=self.periodo
+        )
+        BloqueHorario.objects.create(
+            carga=self.carga, dia='LUN', hora_inicio=time(8, 0), hora_fin=time(10, 0)
+        )
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            rol=User.Rol.RESP_UNIDAD,
+            unidad_academica=self.unidad
+        )
+        self.client.force_authenticate(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer token-de-prueba')
+
+    def _get_cargas(self):
+        with CaptureQueriesContext(connections['default']) as primario, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.get('/api/asignaciones/cargas/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return primario, replica
+
+    def test_get_lee_de_la_replica(self):
+        """Un listado consulta cargas solo en la réplica."""
+        primario, replica = self._get_cargas()
+
+        self.assertTrue(_consultas_cargas(replica))
+        self.assertFalse(_consultas_cargas(primario))
+
+    def test_escritura_y_validacion_en_primario(self):
+        """POST: la validación de conflictos y el INSERT van al primario."""
+        with CaptureQueriesContext(connections['default']) as primario, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.post('/api/asignaciones/cargas/', {
+                'programa_academico': self.programa.id,
+                'materia': self.materia.id,
+                'profesor': self.profesor.id,
+                'periodo': self.periodo.id,
+                'bloques': [{'dia': 'MAR', 'hora_inicio': '08:00:00', 'hora_fin': '10:00:00'}]
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replica.captured_queries, [])
+        sql = ' '.join(q['sql'] for q in primario.captured_queries)
+        self.assertIn('INSERT INTO "cargas"', sql)
+        self.assertIn('"bloques_horarios"."hora_inicio" <', sql)
+
+    def test_lecturas_pegadas_al_primario_tras_escribir(self):
+        """Después de escribir, el mismo cliente lee del primario."""
+        response = self.client.patch(
+            f'/api/asignaciones/cargas/{self.carga.id}/',
+            {'profesor': None},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        primario, replica = self._get_cargas()
+        self.assertTrue(_consultas_cargas(primario))
+        self.assertFalse(_consultas_cargas(replica))
+
+    def test_otro_cliente_sigue_en_replica(self):
+        """La marca de primario es por cliente (hash del header Authorization)."""
+        self.client.patch(
+            f'/api/asignaciones/cargas/{self.carga.id}/',
+            {'profesor': None},
+            format='json'
+        )
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer otro-token')
+        primario, replica = self._get_cargas()
+        self.assertTrue(_consultas_cargas(replica))
+        self.assertFalse(_consultas_cargas(primario))
+
+    @override_settings(LECTURAS_EN_REPLICA=False)
+    def test_desactivado_todo_en_primario(self):
+        """Con el switch apagado no se usa la réplica."""
+        primario, replica = self._get_cargas()
+
+        self.assertTrue(_consultas_cargas(primario))
+        self.assertEqual(replica.captured_queries, [])
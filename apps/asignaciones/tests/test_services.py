@@ -2,6 +2,10 @@
 Tests para los Services de Asignaciones.
 """
 
+from importlib import import_module
+from unittest import mock, skipUnless
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
 from django.test import TestCase
 from datetime import time
 
@@ -348,6 +352,159 @@ class ValidadorConflictosTestCase(TestCase):
 
         self.assertIsNone(conflicto)
 
+    def test_validar_disponibilidad_bloques_contiguos(self):
+        """Test: Bloques que solo se tocan en un extremo no son conflicto."""
+        carga = Carga.objects.create(
+            programa_academico=self.programa1,
+            materia=self.materia1,
+            profesor=self.profesor,
+            periodo=self.periodo
+        )
+        BloqueHorario.objects.create(
+            carga=carga,
+            dia='LUN',
+            hora_inicio=time(8, 0),
+            hora_fin=time(10, 0)
+        )
+
+        conflicto = ValidadorConflictos.validar_disponibilidad_profesor(
+            profesor=self.profesor,
+            periodo=self.periodo,
+            bloques=[BloqueHorario(dia='LUN', hora_inicio=time(10, 0), hora_fin=time(12, 0))]
+        )
+
+        self.assertIsNone(conflicto)
+
+    def test_validar_disponibilidad_excluye_carga_editada(self):
+        """Test: La carga que se edita no entra en conflicto consigo misma."""
+        carga = Carga.objects.create(
+            programa_academico=self.programa1,
+            materia=self.materia1,
+            profesor=self.profesor,
+            periodo=self.periodo
+        )
+        BloqueHorario.objects.create(
+            carga=carga,
+            dia='LUN',
+            hora_inicio=time(8, 0),
+            hora_fin=time(10, 0)
+        )
+
+        conflicto = ValidadorConflictos.validar_disponibilidad_profesor(
+            profesor=self.profesor,
+            periodo=self.periodo,
+            bloques=[BloqueHorario(dia='LUN', hora_inicio=time(9, 0), hora_fin=time(11, 0))],
+            excluir_carga_id=carga.id
+        )
+
+        self.assertIsNone(conflicto)
+
+    def test_filtrar_bloques_solapados_equivale_a_comparacion_en_python(self):
+        """Test: El filtro en base de datos coincide con bloques_se_solapan."""
+        carga = Carga.objects.create(
+            programa_academico=self.programa1,
+            materia=self.materia1,
+            profesor=self.profesor,
+            periodo=self.periodo
+        )
+        for dia in ('LUN', 'MAR'):
+            for hora in range(7, 20, 2):
+                BloqueHorario.objects.create(
+                    carga=carga,
+                    dia=dia,
+                    hora_inicio=time(hora, 0),
+                    hora_fin=time(hora + 2, 0)
+                )
+
+        nuevos = [
+            BloqueHorario(dia='LUN', hora_inicio=time(8, 30), hora_fin=time(9, 0)),
+            BloqueHorario(dia='LUN', hora_inicio=time(11, 0), hora_fin=time(15, 0)),
+            BloqueHorario(dia='MAR', hora_inicio=time(21, 0), hora_fin=time(22, 0)),
+        ]
+
+        en_base = set(ValidadorConflictos.filtrar_bloques_solapados(
+            BloqueHorario.objects.all(), nuevos
+        ).values_list('id', flat=True))
+        en_python = {
+            bloque.id
+            for bloque in BloqueHorario.objects.all()
+            if any(ValidadorConflictos.bloques_se_solapan(nuevo, bloque) for nuevo in nuevos)
+        }
+
+        self.assertEqual(en_base, en_python)
+        self.assertEqual(len(en_base), 3)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Requiere PostgreSQL (DATABASE_URL=postgres://...)')
+class SolapamientoPostgresTestCase(TestCase):
+    """Tests del camino rápido con rangos en PostgreSQL."""
+
+    def test_indice_gist_creado(self):
+        """Test: La migración crea el índice GiST compuesto de carga, día y rango."""
+        with connection.cursor() as cursor:
+            restricciones = connection.introspection.get_constraints(cursor, 'bloques_horarios')
+
+        self.assertNotIn('bloques_horarios_rango_gist', restricciones)
+        indice = restricciones['bloques_horarios_carga_dia_rango_gist']
+        self.assertEqual(indice['type'], 'gist')
+        self.assertEqual(indice['columns'][:2], ['carga_id', 'dia'])
+
+    def test_filtro_usa_operador_de_rangos(self):
+        """Test: En PostgreSQL el solapamiento se evalúa con tsrange &&."""
+        queryset = ValidadorConflictos.filtrar_bloques_solapados(
+            BloqueHorario.objects.all(),
+            [BloqueHorario(dia='LUN', hora_inicio=time(8, 0), hora_fin=time(10, 0))]
+        )
+
+        sql = str(queryset.query)
+        self.assertIn('tsrange', sql)
+        self.assertIn('&&', sql)
+
+
+class SolapamientoPostgresSQLTestCase(TestCase):
+    """SQL del camino PostgreSQL, compilado sin necesidad de un servidor PostgreSQL."""
+
+    def _sql(self, bloques):
+        with mock.patch.object(connections[DEFAULT_DB_ALIAS], 'vendor', 'postgresql'):
+            queryset = ValidadorConflictos.filtrar_bloques_solapados(
+                BloqueHorario.objects.all(), bloques
+            )
+        return queryset.query.sql_with_params()
+
+    def test_filtro_por_dia_y_operador_de_rangos(self):
+        """Test: Cada bloque se compara por día y con tsrange && en lugar de < y >."""
+        sql, params = self._sql([
+            BloqueHorario(dia='LUN', hora_inicio=time(8, 0), hora_fin=time(10, 0)),
+            BloqueHorario(dia='MAR', hora_inicio=time(12, 0), hora_fin=time(14, 0)),
+        ])
+        where = sql.split(' WHERE ', 1)[1]
+
+        self.assertEqual(where.count(' && '), 2)
+        self.assertEqual(where.count('"bloques_horarios"."dia" = %s'), 2)
+        self.assertIn(' OR ', where)
+        self.assertNotIn('"hora_inicio" <', where)
+        self.assertIn('LUN', params)
+        self.assertIn('MAR', params)
+        self.assertIn(
+            "tsrange(DATE '2000-01-01' + \"bloques_horarios\".\"hora_inicio\", "
+            "DATE '2000-01-01' + \"bloques_horarios\".\"hora_fin\") && "
+            "tsrange(DATE '2000-01-01' + ",
+            where
+        )
+
+    def test_expresion_coincide_con_el_indice(self):
+        """Test: El rango de las columnas es la expresión del índice GiST."""
+        migracion = import_module('apps.asignaciones.migrations.0008_bloque_rango_gist_compuesto')
+        sql, _ = self._sql([BloqueHorario(dia='LUN', hora_inicio=time(8, 0), hora_fin=time(10, 0))])
+
+        self.assertIn(migracion.EXPRESION, sql.replace('"bloques_horarios".', '').replace('"', ''))
+
+    def test_sin_bloques(self):
+        """Test: Sin bloques el queryset queda vacío también en PostgreSQL."""
+        with mock.patch.object(connections[DEFAULT_DB_ALIAS], 'vendor', 'postgresql'):
+            queryset = ValidadorConflictos.filtrar_bloques_solapados(BloqueHorario.objects.all(), [])
+        self.assertFalse(queryset.exists())
+
 
 class PeriodoServiceTestCase(TestCase):
     """Tests para PeriodoService."""
@@ -0,0 +1,187 @@
+"""
+Tests para el sharding por unidad (UnidadShardRouter + dividir_por_unidad).
+"""
+
+import shutil
+import tempfile
+from datetime import time
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.models import (
+    Periodo,
+    Carga,
+    BloqueHorario,
+    PeriodoArchivado,
+    CargaArchivada
+)
+from apps.asignaciones.services import ArchivoService
+from common.routers import alias_shard
+
+User = get_user_model()
+
+
+class ShardingPorUnidadTestCase(TransactionTestCase):
+    """Cada unidad lee y escribe en su propio archivo SQLite."""
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.ajustes = override_settings(SHARDS_DIR=self.directorio)
+        self.ajustes.enable()
+
+        self.unidades = []
+        self.usuarios = []
+        for indice in (1, 2):
+            unidad = UnidadAcademica.objects.create(nombre=f'Facultad {indice}')
+            programa = ProgramaAcademico.objects.create(
+                unidad_academica=unidad,
+                nombre=f'Programa {indice}'
+            )
+            materia = Materia.objects.create(
+                programa_academico=programa,
+                clave=f'CS10{indice}',
+                nombre='Programación I',
+                horas=2
+            )
+            profesor = Profesor.objects.create(
+                unidad_academica=unidad,
+                nombre=f'Profesor {indice}',
+                email=f'profesor{indice}@test.com'
+            )
+            periodo = Periodo.objects.create(unidad_academica=unidad, nombre='2025-1')
+            carga = Carga.objects.create(
+                programa_academico=programa,
+                materia=materia,
+                profesor=profesor,
+                periodo=periodo
+            )
+            BloqueHorario.objects.create(
+                carga=carga, dia='LUN', hora_inicio=time(8, 0), hora_fin=time(10, 0)
+            )
+            self.unidades.append((unidad, programa, materia, profesor, periodo))
+            self.usuarios.append(User.objects.create_user(
+                username=f'unidad{indice}',
+                password='testpass123',
+                rol=User.Rol.RESP_UNIDAD,
+                unidad_academica=unidad
+            ))
+
+    def tearDown(self):
+        for unidad, *_ in self.unidades:
+            alias = f'unidad_{unidad.id}'
+            if alias in connections.settings:
+                connections[alias].close()
+                del connections.settings[alias]
+                del connections[alias]
+        self.ajustes.disable()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def _dividir(self, *args):
+        call_command('dividir_por_unidad', *args, stdout=StringIO())
+
+    def test_dividir_copia_cada_unidad_a_su_shard(self):
+        """Cada shard recibe solo los datos de su unidad, con los mismos IDs."""
+        self._dividir()
+
+        for unidad, programa, materia, profesor, periodo in self.unidades:
+            alias = alias_shard(unidad.id)
+            self.assertEqual(
+                list(Carga.objects.using(alias).values_list('periodo_id', flat=True)),
+                [periodo.id]
+            )
+            self.assertEqual(BloqueHorario.objects.using(alias).count(), 1)
+            self.assertTrue(ProgramaAcademico.objects.using(alias).filter(id=programa.id).exists())
+            self.assertEqual(Profesor.objects.using(alias).get().id, profesor.id)
+
+        # Sin --eliminar-origen la base primaria conserva los datos
+        self.assertEqual(Carga.objects.using('default').count(), 2)
+
+    def test_eliminar_origen(self):
+        """--eliminar-origen deja en el primario solo el catálogo."""
+        self._dividir('--eliminar-origen')
+
+        self.assertEqual(Carga.objects.using('default').count(), 0)
+        self.assertEqual(Materia.objects.using('default').count(), 0)
+        self.assertEqual(ProgramaAcademico.objects.using('default').count(), 2)
+
+    @override_settings(SHARDING_POR_UNIDAD=True)
+    def test_periodos_archivados_se_copian(self):
+        """Un periodo archivado sigue disponible en el shard tras --eliminar-origen."""
+        unidad, programa, materia, profesor, periodo = self.unidades[0]
+        carga_id = Carga.objects.get(periodo=periodo).id
+        Periodo.objects.filter(id=periodo.id).update(finalizado=True)
+        call_command('archivar_periodos', stdout=StringIO())
+        self.assertFalse(Carga.objects.filter(id=carga_id).exists())
+
+        self._dividir('--eliminar-origen')
+        ArchivoService.limpiar_cache()
+        alias = alias_shard(unidad.id)
+
+        self.assertFalse(PeriodoArchivado.objects.using('default').exists())
+        archivo = PeriodoArchivado.objects.using(alias).get()
+        self.assertEqual(archivo.periodo_id, periodo.id)
+        self.assertTrue(archivo.filas_eliminadas)
+        self.assertEqual(
+            list(CargaArchivada.objects.using(alias).values_list('id', flat=True)),
+            [carga_id]
+        )
+        self.assertFalse(PeriodoArchivado.objects.using(alias_shard(self.unidades[1][0].id)).exists())
+
+        client = APIClient()
+        client.force_authenticate(user=self.usuarios[0])
+        response = client.get(f'/api/asignaciones/cargas/{carga_id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], carga_id)
+
+    @override_settings(SHARDING_POR_UNIDAD=True)
+    def test_api_usa_el_shard_del_usuario(self):
+        """Lecturas y escrituras de la API van al shard de la unidad del usuario."""
+        self._dividir('--eliminar-origen')
+        unidad, programa, materia, profesor, periodo = self.unidades[0]
+        alias = alias_shard(unidad.id)
+
+        client = APIClient()
+        client.force_authenticate(user=self.usuarios[0])
+
+        with CaptureQueriesContext(connections[alias]) as shard:
+            response = client.get('/api/asignaciones/cargas/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertTrue(any('"cargas"' in q['sql'] for q in shard.captured_queries))
+
+        response = client.post('/api/asignaciones/cargas/', {
+            'programa_academico': programa.id,
+            'materia': materia.id,
+            'profesor': profesor.id,
+            'periodo': periodo.id,
+            'bloques': [{'dia': 'MAR', 'hora_inicio': '08:00:00', 'hora_fin': '10:00:00'}]
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(Carga.objects.using(alias).count(), 2)
+        self.assertEqual(Carga.objects.using(alias_shard(self.unidades[1][0].id)).count(), 1)
+        self.assertEqual(Carga.objects.using('default').count(), 0)
+
+    @override_settings(SHARDING_POR_UNIDAD=True)
+    def test_catalogo_sincronizado_en_el_shard(self):
+        """Un programa nuevo en el primario se replica al shard de su unidad."""
+        self._dividir()
+        unidad = self.unidades[0][0]
+
+        nuevo = ProgramaAcademico.objects.create(unidad_academica=unidad, nombre='Programa nuevo')
+
+        self.assertTrue(
+            ProgramaAcademico.objects.using(alias_shard(unidad.id)).filter(id=nuevo.id).exists()
+        )
+        self.assertFalse(
+            ProgramaAcademico.objects.using(alias_shard(self.unidades[1][0].id)).filter(id=nuevo.id).exists()
+        )
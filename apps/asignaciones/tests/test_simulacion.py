@@ -0,0 +1,161 @@
+"""
+Tests para la simulación "what-if" de cargas.
+"""
+
+from datetime import time
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.models import Periodo, Carga, BloqueHorario
+
+User = get_user_model()
+
+URL_SIMULAR = '/api/asignaciones/cargas/simular/'
+
+
+class SimulacionTestCase(TestCase):
+    """Tests para POST /api/asignaciones/cargas/simular/."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre="Facultad de Ingeniería")
+        self.programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Software'
+        )
+        self.materia = Materia.objects.create(
+            programa_academico=self.programa,
+            clave='CS101',
+            nombre='Programación I',
+            horas=2
+        )
+        self.profesor = Profesor.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Dr. Juan Pérez',
+            email='juan@test.com'
+        )
+        self.periodo = Periodo.objects.create(
+            unidad_academica=self.unidad,
+            nombre='2025-1'
+        )
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            rol=User.Rol.RESP_PROGRAMA,
+            programa_academico=self.programa
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.carga = Carga.objects.create(
+            programa_academico=self.programa,
+            materia=self.materia,
+            profesor=self.profesor,
+            periodo=self.periodo,
+            estado=Carga.Estado.CORRECTA
+        )
+        BloqueHorario.objects.create(
+            carga=self.carga, dia='LUN', hora_inicio=time(8), hora_fin=time(10)
+        )
+
+    def _nueva(self, dia='LUN', inicio='08:00:00', fin='10:00:00', profesor=True):
+        return {
+            'programa_academico': self.programa.id,
+            'materia': self.materia.id,
+            'profesor': self.profesor.id if profesor else None,
+            'periodo': self.periodo.id,
+            'bloques': [{'dia': dia, 'hora_inicio': inicio, 'hora_fin': fin}]
+        }
+
+    def test_detecta_conflicto_sin_escribir(self):
+        """Una carga nueva en el mismo horario reporta conflicto y no se guarda."""
+        response = self.client.post(URL_SIMULAR, {'crear': [self._nueva()]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['conflictos'], [{
+            'carga_id': -1,
+            'conflictos': [{'carga_id': self.carga.id, 'dia': 'LUN'}]
+        }])
+        self.assertEqual(Carga.objects.count(), 1)
+
+    def test_mover_carga_existente_libera_horario(self):
+        """Mover la carga existente y crear otra en su horario no genera conflicto."""
+        response = self.client.post(URL_SIMULAR, {
+            'crear': [self._nueva()],
+            'actualizar': [{'id': self.carga.id, 'bloques': [
+                {'dia': 'MAR', 'hora_inicio': '08:00:00', 'hora_fin': '10:00:00'}
+            ]}]
+        }, format='json')
+
+        self.assertEqual(response.data['conflictos'], [])
+        self.assertEqual(self.carga.bloques.get().dia, 'LUN')
+
+    def test_horas_y_estados_por_periodo(self):
+        """Reporta horas que no coinciden y el conteo final de estados."""
+        response = self.client.post(URL_SIMULAR, {
+            'crear': [
+                self._nueva('MIE', '08:00:00', '09:00:00'),
+                self._nueva('JUE', profesor=False),
+            ],
+            'eliminar': [self.carga.id]
+        }, format='json')
+
+        self.assertEqual(response.data['horas_invalidas'], [
+            {'carga_id': -1, 'horas_materia': 2, 'horas_bloques': 1.0}
+        ])
+        self.assertEqual(response.data['periodos'], [{
+            'periodo_id': self.periodo.id,
+            'total_cargas': 2,
+            'correctas': 1,
+            'pendientes': 1,
+            'puede_finalizar': False
+        }])
+        self.assertTrue(Carga.objects.filter(id=self.carga.id).exists())
+
+    def test_escenario_invalido(self):
+        """Actualizar y eliminar la misma carga se rechaza."""
+        response = self.client.post(URL_SIMULAR, {
+            'actualizar': [{'id': self.carga.id, 'profesor': None}],
+            'eliminar': [self.carga.id]
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_referencias_de_otra_unidad(self):
+        """Periodo, programa o profesor de otra unidad se rechazan sin revelar sus cargas."""
+        otra_unidad = UnidadAcademica.objects.create(nombre='Otra Facultad')
+        otro_programa = ProgramaAcademico.objects.create(
+            unidad_academica=otra_unidad, nombre='Arquitectura'
+        )
+        otro_periodo = Periodo.objects.create(unidad_academica=otra_unidad, nombre='2025-1')
+        otro_profesor = Profesor.objects.create(
+            unidad_academica=otra_unidad, nombre='Dra. Ana López', email='ana@test.com'
+        )
+
+        for cambio in (
+            {'periodo': otro_periodo.id},
+            {'programa_academico': otro_programa.id},
+            {'profesor': otro_profesor.id},
+        ):
+            response = self.client.post(
+                URL_SIMULAR, {'crear': [dict(self._nueva(), **cambio)]}, format='json'
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, cambio)
+            self.assertNotIn('periodos', response.data)
+
+    def test_consultas_constantes(self):
+        """El número de consultas no depende del tamaño del escenario."""
+        def contar(n):
+            crear = [self._nueva('VIE', f'{8 + i % 10:02d}:00:00', f'{9 + i % 10:02d}:00:00')
+                     for i in range(n)]
+            with CaptureQueriesContext(connection) as consultas:
+                response = self.client.post(URL_SIMULAR, {'crear': crear}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(consultas)
+
+        self.assertEqual(contar(3), contar(300))
@@ -0,0 +1,99 @@
+"""
+Tests para el throttling por cubetas de tokens (common.throttles).
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica
+from apps.asignaciones.models import Periodo
+from common.throttles import CubetaThrottle, _Cubetas
+
+User = get_user_model()
+
+
+class CubetasTestCase(SimpleTestCase):
+    """Tests para la cubeta de tokens en memoria."""
+
+    def test_consume_y_recarga(self):
+        cubeta = _Cubetas()
+
+        with mock.patch('common.throttles.time.monotonic', return_value=100.0):
+            self.assertEqual(cubeta.consumir('a', 4, 10, 1), 0)
+            self.assertEqual(cubeta.consumir('a', 4, 10, 1), 0)
+            # Quedan 2 tokens: faltan 2, a 1 token por segundo
+            self.assertEqual(cubeta.consumir('a', 4, 10, 1), 2)
+
+        with mock.patch('common.throttles.time.monotonic', return_value=102.0):
+            self.assertEqual(cubeta.consumir('a', 4, 10, 1), 0)
+
+    def test_costo_mayor_que_capacidad(self):
+        """Una acción más cara que la cubeta entera consume la cubeta llena."""
+        cubeta = _Cubetas()
+        self.assertEqual(cubeta.consumir('a', 50, 10, 1), 0)
+
+    @override_settings(THROTTLE_MAX_CUBETAS=2)
+    def test_descarta_las_menos_recientes(self):
+        cubeta = _Cubetas()
+        for clave in ['a', 'b', 'c']:
+            cubeta.consumir(clave, 1, 10, 1)
+
+        self.assertEqual(list(cubeta._cubetas), ['b', 'c'])
+
+
+@override_settings(THROTTLE_COSTOS={'estadisticas': 4})
+class ThrottleEndpointTestCase(TestCase):
+    """Las acciones costosas responden 429 con Retry-After al agotar la cubeta."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre='Facultad de Ingeniería')
+        self.periodo = Periodo.objects.create(unidad_academica=self.unidad, nombre='2025-1')
+        self.user = User.objects.create_user(
+            username='resp_unidad',
+            password='testpass123',
+            rol=User.Rol.RESP_UNIDAD,
+            unidad_academica=self.unidad
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = f'/api/asignaciones/periodos/{self.periodo.id}/estadisticas/'
+
+    def _tasas(self, usuario='10/min', endpoint='1000/min'):
+        return mock.patch.object(
+            CubetaThrottle,
+            'THROTTLE_RATES',
+            {'costoso_usuario': usuario, 'costoso_endpoint': endpoint}
+        )
+
+    def test_cubeta_por_usuario(self):
+        with self._tasas():
+            for _ in range(2):
+                self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+            response = self.client.get(self.url)
+
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertIn('Retry-After', response)
+
+            # Otro usuario tiene su propia cubeta
+            otro = User.objects.create_user(username='otro')
+            self.client.force_authenticate(user=otro)
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_cubeta_por_endpoint(self):
+        with self._tasas(usuario='1000/min', endpoint='8/min'):
+            for _ in range(2):
+                self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+            otro = User.objects.create_user(username='otro')
+            self.client.force_authenticate(user=otro)
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_crud_sin_throttle(self):
+        with self._tasas(usuario='1/min'):
+            for _ in range(3):
+                response = self.client.get(f'/api/asignaciones/periodos/{self.periodo.id}/')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
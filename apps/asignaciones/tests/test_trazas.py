@@ -0,0 +1,158 @@
+"""
+Tests para las trazas por petición de la capa de servicios.
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.models import Periodo
+from apps.asignaciones.services import PeriodoService
+from common.trazas import atributos_de, tramo, traza_peticion
+
+User = get_user_model()
+
+
+def buscar(nodo, nombre):
+    """Primer tramo con ese nombre en el árbol (en profundidad)."""
+    if nodo['nombre'] == nombre:
+        return nodo
+    for hijo in nodo.get('hijos', []):
+        encontrado = buscar(hijo, nombre)
+        if encontrado:
+            return encontrado
+    return None
+
+
+class TrazaTestCase(SimpleTestCase):
+    """Tests para el árbol de tramos y la extracción de atributos."""
+
+    def test_arbol_de_tramos(self):
+        with traza_peticion('raiz') as traza:
+            with tramo('externo', periodo_id=1):
+                with tramo('interno'):
+                    pass
+
+        arbol = traza.como_dict()
+        externo = arbol['hijos'][0]
+        self.assertEqual(externo['nombre'], 'externo')
+        self.assertEqual(externo['atributos'], {'periodo_id': 1})
+        self.assertEqual(externo['hijos'][0]['nombre'], 'interno')
+        self.assertGreaterEqual(arbol['duracion_ms'], externo['duracion_ms'])
+
+    def test_sin_traza_activa(self):
+        with tramo('suelto') as actual:
+            self.assertIsNone(actual)
+
+    def test_atributos_de(self):
+        periodo = Periodo(id=3)
+        atributos = atributos_de({
+            'self': object(),
+            'data': {'profesor': Profesor(id=5), 'periodo': periodo, 'bloques': [{}, {}]},
+            'excluir_carga_id': 9,
+        })
+
+        self.assertEqual(atributos, {
+            'profesor_id': 5, 'periodo_id': 3, 'num_bloques': 2, 'excluir_carga_id': 9
+        })
+
+    @override_settings(TRAZAS_MAX_TRAMOS=2)
+    def test_tramos_omitidos(self):
+        with traza_peticion('raiz') as traza:
+            for _ in range(3):
+                with tramo('repetido'):
+                    pass
+
+        arbol = traza.como_dict()
+        self.assertEqual(len(arbol['hijos']), 1)
+        self.assertEqual(arbol['tramos_omitidos'], 2)
+
+
+@override_settings(TRAZAS_HABILITADAS=True, DEBUG=True)
+class TrazasMiddlewareTestCase(TestCase):
+    """Tests para TrazasMiddleware en una escritura de carga."""
+
+    def setUp(self):
+        self.client = APIClient()
+        unidad = UnidadAcademica.objects.create(nombre='Facultad de Ingeniería')
+        self.programa = ProgramaAcademico.objects.create(unidad_academica=unidad, nombre='Ing. Software')
+        self.materia = Materia.objects.create(
+            programa_academico=self.programa, clave='CS101', nombre='Programación I', horas=4
+        )
+        self.profesor = Profesor.objects.create(
+            unidad_academica=unidad, nombre='Dr. Juan Pérez', email='juan@test.com'
+        )
+        self.periodo = Periodo.objects.create(unidad_academica=unidad, nombre='2025-1')
+        user = User.objects.create_user(
+            username='resp_unidad', rol=User.Rol.RESP_UNIDAD, unidad_academica=unidad
+        )
+        self.client.force_authenticate(user=user)
+        self.data = {
+            'programa_academico': self.programa.id,
+            'materia': self.materia.id,
+            'profesor': self.profesor.id,
+            'periodo': self.periodo.id,
+            'bloques': [
+                {'dia': 'LUN', 'hora_inicio': '08:00:00', 'hora_fin': '10:00:00'},
+                {'dia': 'MIE', 'hora_inicio': '08:00:00', 'hora_fin': '10:00:00'},
+            ]
+        }
+
+    def _crear(self, **headers):
+        with self.assertLogs('trazas', level='INFO') as logs:
+            response = self.client.post('/api/asignaciones/cargas/', self.data, format='json', **headers)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response, json.loads(logs.records[0].getMessage())
+
+    def test_traza_de_la_creacion_de_carga(self):
+        response, registrada = self._crear(HTTP_X_TRAZA='1')
+
+        traza = json.loads(response['X-Traza'])
+        self.assertEqual(traza, registrada)
+        self.assertEqual(traza['nombre'], 'POST asignaciones:carga-list')
+        self.assertEqual(traza['atributos']['status_code'], 201)
+
+        validate = buscar(traza, 'CargaCreateUpdateSerializer.validate')
+        self.assertEqual(validate['atributos'], {
+            'programa_academico_id': self.programa.id,
+            'materia_id': self.materia.id,
+            'profesor_id': self.profesor.id,
+            'periodo_id': self.periodo.id,
+            'num_bloques': 2,
+        })
+        disponibilidad = buscar(validate, 'ValidadorConflictos.validar_disponibilidad_profesor')
+        self.assertEqual(disponibilidad['atributos']['num_bloques'], 2)
+        self.assertEqual(disponibilidad['consultas'], 1)
+
+        create = buscar(traza, 'CargaCreateUpdateSerializer.create')
+        self.assertGreater(create['consultas'], 0)
+        self.assertGreaterEqual(traza['consultas'], validate['consultas'] + create['consultas'])
+
+    def test_sin_header_solo_se_registra(self):
+        response, registrada = self._crear()
+
+        self.assertNotIn('X-Traza', response)
+        self.assertIsNotNone(buscar(registrada, 'CargaCreateUpdateSerializer.create'))
+
+    @override_settings(DEBUG=False)
+    def test_sin_debug_no_hay_header(self):
+        response, _ = self._crear(HTTP_X_TRAZA='1')
+
+        self.assertNotIn('X-Traza', response)
+
+    @override_settings(TRAZAS_HABILITADAS=False)
+    def test_desactivadas(self):
+        response = self.client.post(
+            '/api/asignaciones/cargas/', self.data, format='json', HTTP_X_TRAZA='1'
+        )
+
+        self.assertNotIn('X-Traza', response)
+
+    def test_servicio_fuera_de_peticion(self):
+        # Sin traza activa los métodos decorados se comportan igual
+        self.assertTrue(PeriodoService.puede_finalizar(self.periodo))
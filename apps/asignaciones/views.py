@@ -2,8 +2,12 @@
 ViewSets para el módulo Asignaciones.
 """
 
+from django import forms
+from django.db import router, transaction
+from django.http import Http404
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
@@ -17,13 +21,25 @@ from .serializers import (
     CargaDetailSerializer,
     CargaListSerializer,
     CargaCreateUpdateSerializer,
+    CargaLoteSerializer,
+    SimulacionSerializer,
     BloqueHorarioSerializer
 )
-from .services import ValidadorConflictos, ValidadorHoras, PeriodoService
+from .services import (
+    ValidadorConflictos,
+    ValidadorHoras,
+    PeriodoService,
+    CargaLoteService,
+    SimulacionService,
+    ArchivoService
+)
 from common.permissions import IsResponsableUnidad, IsResponsablePrograma
+from common.idempotencia import idempotente
+from common.mixins import AlcanceMixin, ShardUnidadMixin
+from common.throttles import THROTTLES_COSTOSOS
 
 
-class PeriodoViewSet(viewsets.ModelViewSet):
+class PeriodoViewSet(ShardUnidadMixin, AlcanceMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar Periodos Académicos.
 
@@ -41,29 +57,34 @@ class PeriodoViewSet(viewsets.ModelViewSet):
     search_fields = ['nombre']
     ordering_fields = ['nombre', 'created_at']
     ordering = ['-nombre']
+    # Responsables de unidad y de programa ven los periodos de su unidad
+    campo_unidad = 'unidad_academica_id'
 
     def get_serializer_class(self):
         if self.action == 'list':
             return PeriodoListSerializer
         return PeriodoSerializer
 
-    def get_queryset(self):
+    def perform_destroy(self, instance):
         """
-        Filtra periodos según la unidad del usuario.
+        Elimina el periodo con sentencias masivas en lugar del collector.
         """
-        user = self.request.user
-        queryset = super().get_queryset()
-
-        # Si es responsable de unidad, ver periodos de su unidad
-        if hasattr(user, 'unidad_academica') and user.unidad_academica:
-            queryset = queryset.filter(unidad_academica=user.unidad_academica)
-        # Si es responsable de programa, ver periodos de la unidad de su programa
-        elif hasattr(user, 'programa_academico') and user.programa_academico:
-            queryset = queryset.filter(
-                unidad_academica=user.programa_academico.unidad_academica
-            )
+        PeriodoService.purgar_periodo(instance)
+
+    @action(detail=True, methods=['post'], permission_classes=[IsResponsableUnidad])
+    def purgar(self, request, pk=None):
+        """
+        Elimina el periodo con todas sus cargas y bloques.
+        Solo puede hacerlo el responsable de unidad.
+        POST /api/asignaciones/periodos/{id}/purgar/
+        """
+        periodo = self.get_object()
+        eliminadas = PeriodoService.purgar_periodo(periodo)
 
-        return queryset
+        return Response({
+            'mensaje': 'Periodo eliminado exitosamente',
+            'eliminadas': eliminadas
+        })
 
     @action(detail=True, methods=['post'], permission_classes=[IsResponsableUnidad])
     def finalizar(self, request, pk=None):
@@ -98,17 +119,39 @@ class PeriodoViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-    @action(detail=True, methods=['get'])
+    @action(detail=True, methods=['post'], permission_classes=[IsResponsableUnidad])
+    def archivar(self, request, pk=None):
+        """
+        Archiva un periodo finalizado: sus cargas pasan a un documento
+        comprimido y salen de las tablas de cargas y bloques.
+        Solo puede hacerlo el responsable de unidad.
+        POST /api/asignaciones/periodos/{id}/archivar/
+        """
+        periodo = self.get_object()
+        resultado = ArchivoService.archivar_periodo(periodo)
+
+        if not resultado.pop('success'):
+            return Response(resultado, status=status.HTTP_400_BAD_REQUEST)
+        return Response(resultado)
+
+    @action(detail=True, methods=['get'], throttle_classes=THROTTLES_COSTOSOS)
     def estadisticas(self, request, pk=None):
         """
-        Obtiene estadísticas del periodo.
+        Obtiene estadísticas del periodo. Las de un periodo finalizado salen
+        de su snapshot sin consultar la base.
         GET /api/asignaciones/periodos/{id}/estadisticas/
         """
+        documento = ArchivoService.obtener_documento(int(pk)) if str(pk).isdigit() else None
+        if documento is not None:
+            if not ArchivoService.en_alcance(documento, self.alcance):
+                raise Http404
+            return Response(documento['estadisticas'])
+
         periodo = self.get_object()
         estadisticas = PeriodoService.obtener_estadisticas_periodo(periodo)
         return Response(estadisticas)
 
-    @action(detail=True, methods=['get'])
+    @action(detail=True, methods=['get'], throttle_classes=THROTTLES_COSTOSOS)
     def cargas_problematicas(self, request, pk=None):
         """
         Obtiene las cargas pendientes (incompletas) del periodo.
@@ -123,7 +166,7 @@ class PeriodoViewSet(viewsets.ModelViewSet):
         })
 
 
-class CargaViewSet(viewsets.ModelViewSet):
+class CargaViewSet(ShardUnidadMixin, AlcanceMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar Cargas.
 
@@ -133,6 +176,9 @@ class CargaViewSet(viewsets.ModelViewSet):
     update: Actualizar una carga (con validación automática)
     partial_update: Actualizar parcialmente una carga
     destroy: Eliminar una carga
+
+    create/update/partial_update y actualizar_lote aceptan el header
+    `Idempotency-Key`.
     """
     queryset = Carga.objects.select_related(
         'programa_academico',
@@ -146,6 +192,8 @@ class CargaViewSet(viewsets.ModelViewSet):
     search_fields = ['materia__clave', 'materia__nombre', 'profesor__nombre']
     ordering_fields = ['created_at', 'estado']
     ordering = ['-created_at']
+    campo_unidad = 'programa_academico__unidad_academica_id'
+    campo_programa = 'programa_academico_id'
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
@@ -153,27 +201,233 @@ class CargaViewSet(viewsets.ModelViewSet):
             return CargaDetailSerializer
         elif self.action in ['create', 'update', 'partial_update']:
             return CargaCreateUpdateSerializer
+        elif self.action == 'actualizar_lote':
+            return CargaLoteSerializer
+        elif self.action == 'simular':
+            return SimulacionSerializer
         return CargaDetailSerializer
 
-    def get_queryset(self):
+    def list(self, request, *args, **kwargs):
+        """
+        Con ?periodo=<id> de un periodo finalizado, responde desde su snapshot
+        (mismos filtros, búsqueda, orden y paginación) sin consultar la base.
+        """
+        periodo_id = request.query_params.get('periodo', '')
+        documento = (
+            ArchivoService.obtener_documento(int(periodo_id))
+            if periodo_id.isdigit() else None
+        )
+        if documento is None:
+            return super().list(request, *args, **kwargs)
+
+        cargas = ArchivoService.filtrar_cargas(
+            documento,
+            **self._filtros_de_snapshot(request),
+            terminos=SearchFilter().get_search_terms(request),
+            orden=OrderingFilter().get_ordering(request, self.get_queryset(), self)
+        )
+        cargas = ArchivoService.cargas_en_alcance(documento, cargas, self.alcance)
+
+        page = self.paginate_queryset(cargas)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(cargas)
+
+    def _filtros_de_snapshot(self, request):
+        """
+        Filtros del filterset para ArchivoService.filtrar_cargas. Un valor
+        inválido responde 400 con el mismo error que el filtro en la base.
+        """
+        filtros = {}
+        errores = {}
+        for campo in ('programa_academico', 'profesor'):
+            valor = request.query_params.get(campo, '')
+            if valor.isdigit():
+                filtros[campo] = int(valor)
+            elif valor:
+                errores[campo] = [forms.ModelChoiceField.default_error_messages['invalid_choice']]
+        estado = request.query_params.get('estado', '')
+        if estado in Carga.Estado.values:
+            filtros['estado'] = estado
+        elif estado:
+            errores['estado'] = [
+                forms.ChoiceField.default_error_messages['invalid_choice'] % {'value': estado}
+            ]
+        if errores:
+            raise ValidationError(errores, code='invalid_choice')
+        return filtros
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Las cargas de periodos finalizados (estén o no aún en la tabla
+        caliente) se sirven desde el snapshot de su periodo.
+        """
+        pk = str(kwargs.get('pk', ''))
+        if not pk.isdigit():
+            return super().retrieve(request, *args, **kwargs)
+
+        # Con el documento en la caché del proceso no se consulta la base
+        encontrada = ArchivoService.buscar_carga(int(pk), consultar=False)
+        if encontrada is None:
+            try:
+                instance = self.get_object()
+            except Http404:
+                instance = None
+            if instance is not None and not instance.periodo.finalizado:
+                return Response(self.get_serializer(instance).data)
+
+            # Finalizada, o archivada y ya fuera de la tabla caliente
+            encontrada = ArchivoService.buscar_carga(
+                int(pk),
+                periodo_id=instance.periodo_id if instance is not None else None
+            )
+            if encontrada is None:
+                if instance is None:
+                    raise Http404
+                return Response(self.get_serializer(instance).data)
+
+        documento, carga = encontrada
+        if not ArchivoService.cargas_en_alcance(documento, [carga], self.alcance):
+            raise Http404
+        return Response(carga)
+
+    def perform_destroy(self, instance):
+        periodo_id = instance.periodo_id
+        super().perform_destroy(instance)
+        ArchivoService.refrescar_snapshots([periodo_id])
+
+    @idempotente
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @idempotente
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    @action(detail=False, methods=['patch'], url_path='lote', throttle_classes=THROTTLES_COSTOSOS)
+    @idempotente
+    def actualizar_lote(self, request):
+        """
+        Aplica cambios parciales (profesor y/o bloques) a muchas cargas.
+        Todos los cambios se validan juntos, por lo que dos cargas pueden
+        intercambiar horarios o profesores dentro del mismo lote.
+        Si algún cambio es inválido no se escribe nada.
+        PATCH /api/asignaciones/cargas/lote/
+
+        Body:
+        {
+            "cambios": [
+                {"id": 1, "profesor": 7},
+                {"id": 2, "bloques": [{"dia": "MAR", "hora_inicio": "08:00", "hora_fin": "10:00"}]}
+            ]
+        }
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        cambios = serializer.validated_data['cambios']
+
+        ids = [cambio['id'] for cambio in cambios]
+
+        # Validar y escribir con las cargas bloqueadas: ningún cambio
+        # concurrente puede invalidar el lote entre la validación y el UPDATE
+        with transaction.atomic(using=router.db_for_write(Carga)):
+            cargas = {
+                carga.id: carga
+                for carga in self.get_queryset().select_for_update(of=('self',)).filter(
+                    id__in=ids
+                ).order_by('id')
+            }
+
+            no_encontradas = [carga_id for carga_id in ids if carga_id not in cargas]
+            if no_encontradas:
+                return Response(
+                    {'error': 'Cargas no encontradas.', 'ids': no_encontradas},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+            errores = CargaLoteService.validar_cambios(cargas, cambios, self.alcance)
+            if errores:
+                hay_conflictos = any('conflictos' in error for error in errores)
+                return Response(
+                    {'error': 'El lote contiene cambios inválidos.', 'errores': errores},
+                    status=status.HTTP_409_CONFLICT if hay_conflictos else status.HTTP_400_BAD_REQUEST
+                )
+
+            actualizadas = CargaLoteService.aplicar_cambios(cargas, cambios)
+
+        cargas_actualizadas = self.get_queryset().filter(id__in=actualizadas)
+
+        return Response({
+            'total_actualizadas': len(actualizadas),
+            'cargas': CargaSerializer(cargas_actualizadas, many=True).data
+        })
+
+    @action(detail=False, methods=['post'], throttle_classes=THROTTLES_COSTOSOS)
+    @idempotente
+    def eliminar_lote(self, request):
+        """
+        Elimina todas las cargas (y sus bloques) que coinciden con los filtros.
+        Usa los mismos filtros que el listado y exige al menos uno con valor
+        válido: un filtro vacío (?periodo=) se descartaría y borraría todo
+        el alcance del usuario.
+        POST /api/asignaciones/cargas/eliminar_lote/?periodo={id}&estado=PENDIENTE
+        """
+        filterset = DjangoFilterBackend().get_filterset(request, self.get_queryset(), self)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        if not any(valor not in (None, '') for valor in filterset.form.cleaned_data.values()):
+            return Response(
+                {'error': f"Debe proporcionar al menos un filtro: {', '.join(self.filterset_fields)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        cargas = self.filter_queryset(self.get_queryset())
+        periodo_ids = set(cargas.values_list('periodo_id', flat=True))
+        eliminadas = CargaLoteService.eliminar_cargas(cargas)
+        ArchivoService.refrescar_snapshots(periodo_ids)
+
+        return Response({'eliminadas': eliminadas})
+
+    @action(detail=False, methods=['post'], throttle_classes=THROTTLES_COSTOSOS)
+    def simular(self, request):
         """
-        Filtra cargas según el programa/unidad del usuario.
+        Evalúa un escenario de altas, cambios y bajas de cargas sin guardar nada.
+        POST /api/asignaciones/cargas/simular/
+
+        Body:
+        {
+            "crear": [{"programa_academico": 1, "materia": 3, "profesor": 2,
+                       "periodo": 1, "bloques": [...]}],
+            "actualizar": [{"id": 10, "bloques": [...]}],
+            "eliminar": [11, 12]
+        }
         """
-        user = self.request.user
-        queryset = super().get_queryset()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        escenario = serializer.validated_data
+
+        ids = [cambio['id'] for cambio in escenario['actualizar']] + escenario['eliminar']
+        cargas = {
+            carga.id: carga
+            for carga in self.get_queryset().filter(id__in=ids).order_by()
+        }
 
-        # Si es responsable de unidad, ver todas las cargas de su unidad
-        if hasattr(user, 'unidad_academica') and user.unidad_academica:
-            queryset = queryset.filter(
-                programa_academico__unidad_academica=user.unidad_academica
+        no_encontradas = [carga_id for carga_id in ids if carga_id not in cargas]
+        if no_encontradas:
+            return Response(
+                {'error': 'Cargas no encontradas.', 'ids': no_encontradas},
+                status=status.HTTP_404_NOT_FOUND
             )
-        # Si es responsable de programa, ver solo cargas de su programa
-        elif hasattr(user, 'programa_academico') and user.programa_academico:
-            queryset = queryset.filter(programa_academico=user.programa_academico)
 
-        return queryset
+        resultado = SimulacionService.simular(
+            cargas,
+            crear=escenario['crear'],
+            actualizar=escenario['actualizar'],
+            eliminar=escenario['eliminar']
+        )
+        return Response(resultado)
 
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['post'], throttle_classes=THROTTLES_COSTOSOS)
     def validar_disponibilidad(self, request):
         """
         Valida si un profesor está disponible antes de crear la carga.
@@ -259,7 +513,7 @@ class CargaViewSet(viewsets.ModelViewSet):
             'mensaje': 'El profesor está disponible en los horarios especificados.'
         })
 
-    @action(detail=True, methods=['get'])
+    @action(detail=True, methods=['get'], throttle_classes=THROTTLES_COSTOSOS)
     def validar(self, request, pk=None):
         """
         Valida una carga existente (conflictos y horas).
@@ -295,7 +549,8 @@ class CargaViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def por_estado(self, request):
         """
-        Agrupa las cargas por estado.
+        Agrupa las cargas por estado. Un periodo finalizado se cuenta desde
+        su snapshot; sin periodo se suman las cargas de los periodos archivados.
         GET /api/asignaciones/cargas/por_estado/?periodo={periodo_id}
         """
         queryset = self.get_queryset()
@@ -303,20 +558,39 @@ class CargaViewSet(viewsets.ModelViewSet):
         # Filtrar por periodo si se proporciona
         periodo_id = request.query_params.get('periodo')
         if periodo_id:
+            documento = (
+                ArchivoService.obtener_documento(int(periodo_id))
+                if periodo_id.isdigit() else None
+            )
+            if documento is not None:
+                cargas = ArchivoService.cargas_en_alcance(
+                    documento, documento['cargas'], self.alcance
+                )
+                return Response(ArchivoService.contar_por_estado(cargas))
             queryset = queryset.filter(periodo_id=periodo_id)
+            archivadas = []
+        else:
+            archivadas = [
+                carga
+                for documento in ArchivoService.documentos_archivados(unidad_id=self.alcance.unidad_id)
+                for carga in ArchivoService.cargas_en_alcance(
+                    documento, documento['cargas'], self.alcance
+                )
+            ]
 
         # Agrupar por estado
+        conteos = ArchivoService.contar_por_estado(archivadas)
         correctas = queryset.filter(estado=Carga.Estado.CORRECTA).count()
         pendientes = queryset.filter(estado=Carga.Estado.PENDIENTE).count()
 
         return Response({
-            'total': queryset.count(),
-            'correctas': correctas,
-            'pendientes': pendientes
+            'total': queryset.count() + conteos['total'],
+            'correctas': correctas + conteos['correctas'],
+            'pendientes': pendientes + conteos['pendientes']
         })
 
 
-class BloqueHorarioViewSet(viewsets.ReadOnlyModelViewSet):
+class BloqueHorarioViewSet(ShardUnidadMixin, AlcanceMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet de solo lectura para Bloques Horarios.
     Los bloques se gestionan a través de las cargas.
@@ -331,23 +605,5 @@ class BloqueHorarioViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['carga', 'dia']
     ordering_fields = ['dia', 'hora_inicio']
     ordering = ['dia', 'hora_inicio']
-
-    def get_queryset(self):
-        """
-        Filtra bloques según el acceso del usuario.
-        """
-        user = self.request.user
-        queryset = super().get_queryset()
-
-        # Si es responsable de unidad, ver todos los bloques de su unidad
-        if hasattr(user, 'unidad_academica') and user.unidad_academica:
-            queryset = queryset.filter(
-                carga__programa_academico__unidad_academica=user.unidad_academica
-            )
-        # Si es responsable de programa, ver solo bloques de su programa
-        elif hasattr(user, 'programa_academico') and user.programa_academico:
-            queryset = queryset.filter(
-                carga__programa_academico=user.programa_academico
-            )
-
-        return queryset
+    campo_unidad = 'carga__programa_academico__unidad_academica_id'
+    campo_programa = 'carga__programa_academico_id'
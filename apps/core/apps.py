@@ -5,3 +5,23 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
     verbose_name = 'Core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from common.db import configurar_sqlite
+
+        connection_created.connect(configurar_sqlite, dispatch_uid='configurar_sqlite')
+
+        from django.db.models.signals import post_delete, post_save
+        from .models import ProgramaAcademico, UnidadAcademica
+        from .signals import eliminar_catalogo_shard, sincronizar_catalogo_shard
+
+        for modelo in (UnidadAcademica, ProgramaAcademico):
+            post_save.connect(
+                sincronizar_catalogo_shard, sender=modelo,
+                dispatch_uid=f'sincronizar_catalogo_shard_{modelo.__name__}'
+            )
+            post_delete.connect(
+                eliminar_catalogo_shard, sender=modelo,
+                dispatch_uid=f'eliminar_catalogo_shard_{modelo.__name__}'
+            )
@@ -0,0 +1,158 @@
+"""
+Divide la base de datos primaria en un shard por UnidadAcademica.
+
+Para cada unidad: crea/migra su shard (alias unidad_<id>), copia el catálogo
+(la unidad y sus programas) y sus profesores, materias, periodos, periodos
+archivados (documento e índice de cargas), cargas y bloques conservando
+los IDs.
+
+Uso:
+    python manage.py dividir_por_unidad
+    python manage.py dividir_por_unidad --unidad 1 --unidad 3
+    python manage.py dividir_por_unidad --eliminar-origen --lote 5000
+"""
+
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.models import (
+    Periodo,
+    Carga,
+    BloqueHorario,
+    PeriodoArchivado,
+    CargaArchivada
+)
+from apps.asignaciones.services import CargaLoteService
+from common.routers import alias_shard
+
+
+class Command(BaseCommand):
+    help = 'Copia los datos de cada unidad académica a su propio shard.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--unidad',
+            type=int,
+            action='append',
+            dest='unidades',
+            help='ID de unidad a dividir (repetible). Por defecto, todas.'
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help='Filas por bulk_create.'
+        )
+        parser.add_argument(
+            '--eliminar-origen',
+            action='store_true',
+            help='Elimina de la base primaria los datos copiados (el catálogo se conserva).'
+        )
+
+    def handle(self, *args, **options):
+        unidades = UnidadAcademica.objects.using(DEFAULT_DB_ALIAS).order_by('id')
+        if options['unidades']:
+            unidades = unidades.filter(id__in=options['unidades'])
+            faltantes = set(options['unidades']) - set(unidades.values_list('id', flat=True))
+            if faltantes:
+                raise CommandError(f'Unidades inexistentes: {sorted(faltantes)}')
+
+        for unidad in unidades:
+            alias = alias_shard(unidad.id)
+            self._preparar_shard(alias)
+
+            copiadas = self._copiar_unidad(unidad, alias, options['lote'])
+            resumen = ', '.join(f'{n} {nombre}' for nombre, n in copiadas.items())
+            self.stdout.write(f'{unidad.nombre} -> {alias}: {resumen}')
+
+            if options['eliminar_origen']:
+                self._eliminar_origen(unidad)
+
+        self.stdout.write(self.style.SUCCESS('División por unidad completada.'))
+
+    def _preparar_shard(self, alias):
+        configuracion = connections.settings[alias]
+        if configuracion['ENGINE'] == 'django.db.backends.sqlite3':
+            Path(configuracion['NAME']).parent.mkdir(parents=True, exist_ok=True)
+
+        call_command('migrate', database=alias, interactive=False, verbosity=0)
+
+        if (
+            Periodo.objects.using(alias).exists()
+            or PeriodoArchivado.objects.using(alias).exists()
+            or Profesor.objects.using(alias).exists()
+        ):
+            raise CommandError(
+                f'El shard {alias} ya contiene datos; elimínalo antes de volver a dividir.'
+            )
+
+    def _copiar_unidad(self, unidad, alias, lote):
+        origen = DEFAULT_DB_ALIAS
+        conjuntos = [
+            ('unidades', UnidadAcademica.objects.filter(id=unidad.id), True),
+            ('programas', ProgramaAcademico.objects.filter(unidad_academica=unidad), True),
+            ('profesores', Profesor.objects.filter(unidad_academica=unidad), False),
+            ('materias', Materia.objects.filter(programa_academico__unidad_academica=unidad), False),
+            ('periodos', Periodo.objects.filter(unidad_academica=unidad), False),
+            ('periodos archivados', PeriodoArchivado.objects.filter(
+                periodo__unidad_academica=unidad
+            ), False),
+            ('cargas archivadas', CargaArchivada.objects.filter(
+                archivo__periodo__unidad_academica=unidad
+            ), False),
+            ('cargas', Carga.objects.filter(periodo__unidad_academica=unidad), False),
+            ('bloques', BloqueHorario.objects.filter(carga__periodo__unidad_academica=unidad), False),
+        ]
+
+        copiadas = {}
+        with transaction.atomic(using=alias):
+            for nombre, queryset, es_catalogo in conjuntos:
+                modelo = queryset.model
+                filas = queryset.using(origen).order_by('pk').iterator(chunk_size=lote)
+
+                total = 0
+                pendientes = []
+                for fila in filas:
+                    pendientes.append(fila)
+                    if len(pendientes) >= lote:
+                        total += self._insertar(modelo, alias, pendientes, es_catalogo)
+                        pendientes = []
+                if pendientes:
+                    total += self._insertar(modelo, alias, pendientes, es_catalogo)
+                copiadas[nombre] = total
+
+            # Los IDs se copiaron explícitamente: ajustar secuencias (PostgreSQL)
+            conexion = connections[alias]
+            modelos = [queryset.model for _, queryset, _ in conjuntos]
+            sentencias = conexion.ops.sequence_reset_sql(no_style(), modelos)
+            if sentencias:
+                with conexion.cursor() as cursor:
+                    for sentencia in sentencias:
+                        cursor.execute(sentencia)
+
+        return copiadas
+
+    @staticmethod
+    def _insertar(modelo, alias, filas, es_catalogo):
+        # El catálogo puede existir ya en el shard (sincronizado por señales)
+        modelo.objects.using(alias).bulk_create(filas, ignore_conflicts=es_catalogo)
+        return len(filas)
+
+    @staticmethod
+    def _eliminar_origen(unidad):
+        origen = DEFAULT_DB_ALIAS
+        with transaction.atomic(using=origen):
+            CargaLoteService.eliminar_cargas(
+                Carga.objects.using(origen).filter(periodo__unidad_academica=unidad)
+            )
+            Periodo.objects.using(origen).filter(unidad_academica=unidad).delete()
+            Materia.objects.using(origen).filter(
+                programa_academico__unidad_academica=unidad
+            ).delete()
+            Profesor.objects.using(origen).filter(unidad_academica=unidad).delete()
@@ -0,0 +1,35 @@
+"""
+Elimina las claves de idempotencia expiradas.
+
+Uso:
+    python manage.py limpiar_claves_idempotencia
+    python manage.py limpiar_claves_idempotencia --lote 5000
+"""
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.core.models import ClaveIdempotencia
+from common.db import eliminar_por_lotes
+
+
+class Command(BaseCommand):
+    help = 'Elimina las claves de idempotencia expiradas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help='Filas eliminadas por sentencia (limita el tiempo de bloqueo).'
+        )
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        expiradas = ClaveIdempotencia.objects.filter(expira_en__lte=timezone.now())
+
+        total = eliminar_por_lotes(expiradas, lote)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} clave(s) de idempotencia expirada(s) eliminada(s).'
+        ))
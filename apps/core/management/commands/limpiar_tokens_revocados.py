@@ -0,0 +1,38 @@
+"""
+Elimina de la lista negra los refresh tokens ya expirados.
+
+Un token expirado se rechaza por su claim `exp`, así que su fila ya no
+aporta nada; purgarlas mantiene acotados la tabla y el filtro en memoria.
+
+Uso:
+    python manage.py limpiar_tokens_revocados
+    python manage.py limpiar_tokens_revocados --lote 5000
+"""
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.core.models import TokenRevocado
+from common.db import eliminar_por_lotes
+
+
+class Command(BaseCommand):
+    help = 'Elimina de la lista negra los refresh tokens expirados.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help='Filas eliminadas por sentencia (limita el tiempo de bloqueo).'
+        )
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        expirados = TokenRevocado.objects.filter(expira_en__lte=timezone.now())
+
+        total = eliminar_por_lotes(expirados, lote)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} token(s) revocado(s) expirado(s) eliminado(s).'
+        ))
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_clave_idempotencia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenRevocado',
+            fields=[
+                ('jti', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('expira_en', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Token Revocado',
+                'verbose_name_plural': 'Tokens Revocados',
+                'db_table': 'tokens_revocados',
+                'indexes': [models.Index(fields=['expira_en'], name='tokens_revo_expira__eba7b5_idx'), models.Index(fields=['created_at'], name='tokens_revo_created_f4b107_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:13
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_tokens_revocados'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claveidempotencia',
+            name='reclamada_en',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Inicio de la ejecución en curso de la petición'),
+        ),
+    ]
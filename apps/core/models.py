@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class UnidadAcademica(models.Model):
@@ -108,3 +109,70 @@ class Usuario(AbstractUser):
                 raise ValidationError('Un responsable de programa debe estar asociado a un programa académico.')
             if self.unidad_academica:
                 raise ValidationError('Un responsable de programa no puede estar asociado a una unidad.')
+
+
+class ClaveIdempotencia(models.Model):
+    """
+    Registro compacto de una petición de escritura identificada por el
+    header `Idempotency-Key`.
+
+    Guarda la respuesta de la primera ejecución para que los reintentos
+    del cliente la reciban tal cual, sin volver a validar ni escribir.
+    Mientras la petición original se procesa, `status_code` es nulo; si
+    no termina antes de IDEMPOTENCY_PROCESSING_LEASE desde `reclamada_en`
+    (p. ej. el worker murió), un reintento puede volver a reclamarla.
+    """
+    usuario = models.ForeignKey(
+        Usuario,
+        on_delete=models.CASCADE,
+        related_name='claves_idempotencia'
+    )
+    clave = models.CharField(max_length=255)
+    huella = models.CharField(
+        max_length=64,
+        help_text='SHA-256 de método, ruta y cuerpo de la petición original'
+    )
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    respuesta = models.BinaryField(null=True, blank=True)
+    reclamada_en = models.DateTimeField(
+        default=timezone.now,
+        help_text='Inicio de la ejecución en curso de la petición'
+    )
+    expira_en = models.DateTimeField()
+
+    class Meta:
+        db_table = 'claves_idempotencia'
+        verbose_name = 'Clave de Idempotencia'
+        verbose_name_plural = 'Claves de Idempotencia'
+        unique_together = [['usuario', 'clave']]
+        indexes = [
+            models.Index(fields=['expira_en']),
+        ]
+
+    def __str__(self):
+        return f"{self.clave} ({self.usuario_id})"
+
+
+class TokenRevocado(models.Model):
+    """
+    JTI de un refresh token revocado (lista negra).
+
+    Al rotar un refresh token su JTI se inserta aquí: la clave primaria
+    impide usar dos veces el mismo token. Las filas sirven hasta que el
+    token expira; después las elimina `limpiar_tokens_revocados`.
+    """
+    jti = models.CharField(max_length=255, primary_key=True)
+    expira_en = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'tokens_revocados'
+        verbose_name = 'Token Revocado'
+        verbose_name_plural = 'Tokens Revocados'
+        indexes = [
+            models.Index(fields=['expira_en']),
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return self.jti
@@ -2,7 +2,17 @@
 Serializers para el módulo Core.
 """
 
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer
+)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from common.alcance import Alcance
+from common.lista_negra import lista_negra
 from .models import UnidadAcademica, ProgramaAcademico, Usuario
 
 
@@ -110,7 +120,12 @@ class UsuarioSerializer(serializers.ModelSerializer):
         Retorna el ID de la unidad académica del usuario.
         - Si es RESP_UNIDAD: retorna su unidad_academica directa
         - Si es RESP_PROGRAMA: retorna la unidad_academica de su programa
+
+        Usa la anotación unidad_efectiva_id de UsuarioViewSet.get_queryset
+        cuando está disponible.
         """
+        if hasattr(obj, 'unidad_efectiva_id'):
+            return obj.unidad_efectiva_id
         if obj.unidad_academica_id:
             return obj.unidad_academica_id
         elif obj.programa_academico_id and obj.programa_academico:
@@ -235,3 +250,66 @@ class UsuarioListSerializer(serializers.ModelSerializer):
             'unidad_academica',
             'unidad_academica_nombre'
         ]
+
+
+class TokenAlcanceSerializer(TokenObtainPairSerializer):
+    """
+    Serializer de POST /api/token/ que añade al token el alcance del usuario
+    (rol, unidad_id, programa_id). El access token generado al refrescar
+    hereda los claims del refresh token.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim, valor in Alcance.de_usuario(user).claims().items():
+            token[claim] = valor
+        return token
+
+
+class TokenRefreshListaNegraSerializer(TokenRefreshSerializer):
+    """
+    Serializer de POST /api/token/refresh/ con lista negra propia
+    (common.lista_negra) en lugar de la app token_blacklist de simplejwt.
+
+    Rechaza refresh tokens revocados y, al rotar con
+    BLACKLIST_AFTER_ROTATION, revoca el token recibido antes de emitir el
+    nuevo: un mismo refresh token solo puede rotarse una vez.
+
+    Los claims de alcance se vuelven a calcular con el usuario actual: un
+    cambio de rol, unidad o programa se refleja en el siguiente refresh.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        jti = refresh[jwt_settings.JTI_CLAIM]
+
+        if lista_negra.contiene(jti):
+            raise InvalidToken('El token fue revocado.')
+
+        user_id = refresh.payload.get(jwt_settings.USER_ID_CLAIM)
+        usuario = get_user_model().objects.filter(
+            **{jwt_settings.USER_ID_FIELD: user_id}
+        ).first()
+        if usuario is None or not jwt_settings.USER_AUTHENTICATION_RULE(usuario):
+            raise AuthenticationFailed(
+                self.error_messages['no_active_account'],
+                'no_active_account',
+            )
+
+        for claim, valor in Alcance.de_usuario(usuario).claims().items():
+            refresh[claim] = valor
+
+        data = {'access': str(refresh.access_token)}
+
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION and not lista_negra.revocar(jti, refresh['exp']):
+                # Otra petición (quizá en otro proceso) ya rotó este token
+                raise InvalidToken('El token fue revocado.')
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+
+        return data
@@ -0,0 +1,42 @@
+"""
+Señales de core.
+"""
+
+import copy
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from common.routers import alias_shard, shard_existe
+
+
+def _unidad_de_catalogo(instance):
+    return getattr(instance, 'unidad_academica_id', None) or instance.pk
+
+
+def sincronizar_catalogo_shard(sender, instance, using, raw=False, **kwargs):
+    """
+    post_save de UnidadAcademica / ProgramaAcademico: con SHARDING_POR_UNIDAD
+    replica la fila en el shard de su unidad para que las FK del shard
+    (materias, cargas) sigan apuntando a un catálogo al día.
+    """
+    if raw or using != DEFAULT_DB_ALIAS or not settings.SHARDING_POR_UNIDAD:
+        return
+
+    unidad_id = _unidad_de_catalogo(instance)
+    if not shard_existe(unidad_id):
+        return
+
+    copia = copy.copy(instance)
+    copia._state = copy.copy(instance._state)
+    copia.save(using=alias_shard(unidad_id))
+
+
+def eliminar_catalogo_shard(sender, instance, using, **kwargs):
+    """post_delete: quita la fila del shard de su unidad."""
+    if using != DEFAULT_DB_ALIAS or not settings.SHARDING_POR_UNIDAD:
+        return
+
+    unidad_id = _unidad_de_catalogo(instance)
+    if shard_existe(unidad_id):
+        sender.objects.using(alias_shard(unidad_id)).filter(pk=instance.pk).delete()
@@ -0,0 +1,76 @@
+"""
+Tests para el alcance por petición (common.alcance y AlcanceMixin).
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.test import SimpleTestCase, TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Materia
+from common.alcance import Alcance
+
+User = get_user_model()
+
+
+class AlcanceFiltroTestCase(SimpleTestCase):
+    """Tests para Alcance.filtro."""
+
+    def test_responsable_programa(self):
+        alcance = Alcance(rol='RESP_PROGRAMA', unidad_id=1, programa_id=7)
+
+        self.assertEqual(
+            alcance.filtro('programa_academico__unidad_academica_id', 'programa_academico_id'),
+            Q(programa_academico_id=7)
+        )
+        # Sin campo de programa, ve la unidad de su programa
+        self.assertEqual(alcance.filtro('unidad_academica_id'), Q(unidad_academica_id=1))
+
+    def test_responsable_unidad(self):
+        alcance = Alcance(rol='RESP_UNIDAD', unidad_id=3)
+
+        self.assertEqual(
+            alcance.filtro('programa_academico__unidad_academica_id', 'programa_academico_id'),
+            Q(programa_academico__unidad_academica_id=3)
+        )
+
+    def test_sin_alcance(self):
+        self.assertEqual(Alcance().filtro('unidad_academica_id'), Q())
+
+
+class AlcancePorPeticionTestCase(TestCase):
+    """El alcance se resuelve una sola vez por petición."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre='Facultad de Ingeniería')
+        self.programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Software'
+        )
+        otro = ProgramaAcademico.objects.create(unidad_academica=self.unidad, nombre='Ing. Sistemas')
+        Materia.objects.create(
+            programa_academico=self.programa, clave='CS101', nombre='Programación I', horas=4
+        )
+        Materia.objects.create(programa_academico=otro, clave='CS201', nombre='Redes', horas=4)
+
+        self.user = User.objects.create_user(
+            username='resp_programa',
+            password='testpass123',
+            rol=User.Rol.RESP_PROGRAMA,
+            programa_academico=self.programa
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_se_resuelve_una_vez(self):
+        """Shard, get_queryset y filtros comparten el mismo Alcance."""
+        with mock.patch.object(Alcance, 'de_usuario', wraps=Alcance.de_usuario) as de_usuario:
+            response = self.client.get('/api/academico/materias/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([m['clave'] for m in response.data['results']], ['CS101'])
+        self.assertEqual(de_usuario.call_count, 1)
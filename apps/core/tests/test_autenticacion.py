@@ -0,0 +1,77 @@
+"""
+Tests para JWTLecturaSinEstadoAuthentication.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+
+User = get_user_model()
+
+
+class LecturaSinEstadoTestCase(TestCase):
+    """Las lecturas autentican con los claims del token sin cargar el Usuario."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre='Facultad de Ingeniería')
+        self.programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Software'
+        )
+        self.user = User.objects.create_user(
+            username='resp_programa',
+            password='testpass123',
+            rol=User.Rol.RESP_PROGRAMA,
+            programa_academico=self.programa
+        )
+        response = self.client.post('/api/token/', {
+            'username': 'resp_programa',
+            'password': 'testpass123'
+        }, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def _consultas_a_usuarios(self, consultas):
+        return [q for q in consultas.captured_queries if 'FROM "usuarios"' in q['sql']]
+
+    def test_listado_sin_consultar_usuario(self):
+        """GET /cargas/ no consulta la tabla de usuarios."""
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/api/asignaciones/cargas/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._consultas_a_usuarios(consultas), [])
+
+    def test_me_carga_el_usuario_al_necesitarlo(self):
+        """/usuarios/me/ necesita campos del modelo: el Usuario se carga una vez."""
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/api/core/usuarios/me/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['username'], 'resp_programa')
+        self.assertEqual(len(self._consultas_a_usuarios(consultas)), 1)
+
+    def test_escrituras_validan_usuario_activo(self):
+        """Las escrituras cargan el usuario y rechazan cuentas desactivadas."""
+        User.objects.filter(id=self.user.id).update(is_active=False)
+
+        response = self.client.post('/api/asignaciones/periodos/', {'nombre': '2025-1'})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_sin_claims_carga_el_usuario(self):
+        """Tokens emitidos sin claims de alcance autentican como JWTAuthentication."""
+        access = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/api/asignaciones/cargas/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self._consultas_a_usuarios(consultas)), 1)
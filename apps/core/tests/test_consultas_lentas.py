@@ -0,0 +1,114 @@
+"""
+Tests para el registro de consultas lentas.
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica
+from apps.asignaciones.models import Periodo
+from common.consultas_lentas import MonitorConsultasLentas, consultas_lentas, normalizar
+
+User = get_user_model()
+
+URL = '/api/asignaciones/periodos/'
+
+
+class NormalizarTestCase(SimpleTestCase):
+    """Tests para la forma normalizada de las consultas."""
+
+    def test_parametros_y_literales(self):
+        self.assertEqual(
+            normalizar("SELECT * FROM cargas WHERE id = %s AND estado = 'PENDIENTE' LIMIT 21"),
+            'SELECT * FROM cargas WHERE id = ? AND estado = ? LIMIT ?'
+        )
+
+    def test_listas_in_colapsadas(self):
+        self.assertEqual(
+            normalizar('SELECT * FROM t1 WHERE id IN (%s, %s, %s)'),
+            normalizar('SELECT * FROM t1 WHERE id IN (%s,\n %s)')
+        )
+
+
+@override_settings(CONSULTAS_LENTAS_UMBRAL_MS=0)
+class ConsultasLentasTestCase(TestCase):
+    """Tests para ConsultasLentasMiddleware y la página del admin."""
+
+    def setUp(self):
+        consultas_lentas.limpiar()
+        self.addCleanup(consultas_lentas.limpiar)
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre='Facultad de Ingeniería')
+        Periodo.objects.create(unidad_academica=self.unidad, nombre='2025-1')
+        self.resp_unidad = User.objects.create_user(
+            username='resp_unidad',
+            rol=User.Rol.RESP_UNIDAD,
+            unidad_academica=self.unidad
+        )
+        self.client.force_authenticate(user=self.resp_unidad)
+
+    def test_registra_vista_sitio_y_plan(self):
+        with self.assertLogs('consultas_lentas', level='WARNING') as logs:
+            response = self.client.get(URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('asignaciones:periodo-list', logs.output[0])
+
+        entrada = next(e for e in consultas_lentas.entradas() if 'periodos' in e['sql'])
+        self.assertEqual(entrada['vista'], 'GET asignaciones:periodo-list')
+        self.assertTrue(entrada['sitio'])
+
+        peor = next(g for g in consultas_lentas.peores() if g['huella'] == entrada['huella'])
+        self.assertTrue(peor['plan'])
+        self.assertFalse(peor['plan'][0].startswith('EXPLAIN falló'))
+
+    def test_explain_una_vez_por_forma(self):
+        with mock.patch.object(
+            MonitorConsultasLentas, '_explicar', autospec=True, return_value=['plan']
+        ) as explicar, self.assertLogs('consultas_lentas'):
+            self.client.get(URL)
+            llamadas = explicar.call_count
+            self.client.get(URL)
+
+        self.assertGreater(llamadas, 0)
+        self.assertEqual(explicar.call_count, llamadas)
+        peores = consultas_lentas.peores(limite=100)
+        self.assertTrue(all(grupo['veces'] >= 2 for grupo in peores))
+
+    @override_settings(CONSULTAS_LENTAS_MAX=3)
+    def test_buffer_acotado(self):
+        with self.assertLogs('consultas_lentas'):
+            self.client.get(URL)
+            self.client.get(URL)
+
+        self.assertEqual(len(consultas_lentas.entradas()), 3)
+
+    @override_settings(CONSULTAS_LENTAS_UMBRAL_MS=10_000)
+    def test_bajo_el_umbral(self):
+        self.client.get(URL)
+
+        self.assertEqual(consultas_lentas.entradas(), [])
+
+    def test_pagina_admin(self):
+        with self.assertLogs('consultas_lentas'):
+            self.client.get(URL)
+        staff = User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        self.client.force_login(staff)
+
+        with self.assertLogs('consultas_lentas'):
+            response = self.client.get('/admin/consultas-lentas/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, 'asignaciones:periodo-list')
+
+    def test_pagina_admin_requiere_staff(self):
+        self.client.force_login(self.resp_unidad)
+
+        with self.assertLogs('consultas_lentas'):
+            response = self.client.get('/admin/consultas-lentas/')
+
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
@@ -0,0 +1,90 @@
+"""
+Tests para la lista negra de refresh tokens (common.lista_negra).
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.models import TokenRevocado
+from common.lista_negra import FiltroBloom, lista_negra
+
+User = get_user_model()
+
+
+class FiltroBloomTestCase(SimpleTestCase):
+    """Tests para FiltroBloom."""
+
+    def test_sin_falsos_negativos(self):
+        filtro = FiltroBloom(1000)
+        valores = [f'jti-{i}' for i in range(1000)]
+        for valor in valores:
+            filtro.agregar(valor)
+
+        self.assertTrue(all(valor in filtro for valor in valores))
+
+    def test_falsos_positivos_acotados(self):
+        filtro = FiltroBloom(1000, error=0.01)
+        for i in range(1000):
+            filtro.agregar(f'jti-{i}')
+
+        falsos = sum(f'otro-{i}' in filtro for i in range(10000))
+        self.assertLess(falsos, 300)
+
+
+class ListaNegraTestCase(TestCase):
+    """Rotación de refresh tokens con la lista negra."""
+
+    def setUp(self):
+        lista_negra.reiniciar()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.refresh = str(RefreshToken.for_user(self.user))
+
+    def _refrescar(self, refresh):
+        return self.client.post('/api/token/refresh/', {'refresh': refresh}, format='json')
+
+    def test_refresh_rotado_no_se_reutiliza(self):
+        """El refresh token rotado queda revocado; el nuevo sigue sirviendo."""
+        response = self._refrescar(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        nuevo = response.data['refresh']
+
+        self.assertEqual(self._refrescar(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self._refrescar(nuevo).status_code, status.HTTP_200_OK)
+        self.assertEqual(TokenRevocado.objects.count(), 2)
+
+    def test_revocado_en_otro_proceso(self):
+        """Aunque el filtro local no lo tenga, la clave primaria impide rotarlo dos veces."""
+        token = RefreshToken(self.refresh)
+        TokenRevocado.objects.create(jti=token['jti'], expira_en=timezone.now() + timedelta(days=1))
+
+        self.assertEqual(self._refrescar(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_verificacion_sin_consulta_si_no_esta_revocado(self):
+        """Un JTI fuera del filtro no consulta la tabla."""
+        lista_negra.contiene('calentar')
+        token = RefreshToken(self.refresh)
+
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertFalse(lista_negra.contiene(token['jti']))
+        self.assertEqual(len(consultas), 0)
+
+    def test_limpiar_tokens_expirados(self):
+        """El comando elimina solo los tokens ya expirados."""
+        ahora = timezone.now()
+        TokenRevocado.objects.create(jti='expirado', expira_en=ahora - timedelta(minutes=1))
+        TokenRevocado.objects.create(jti='vigente', expira_en=ahora + timedelta(days=1))
+
+        call_command('limpiar_tokens_revocados', stdout=StringIO())
+
+        self.assertEqual(list(TokenRevocado.objects.values_list('jti', flat=True)), ['vigente'])
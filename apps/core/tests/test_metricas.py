@@ -0,0 +1,95 @@
+"""
+Tests para las métricas por endpoint (common.metricas).
+"""
+
+import threading
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica
+from common.metricas import RegistroMetricas, metricas
+
+User = get_user_model()
+
+
+class MetricasTestCase(TestCase):
+    """Tests para MetricasMiddleware y GET /metrics."""
+
+    def setUp(self):
+        metricas.limpiar()
+        self.addCleanup(metricas.limpiar)
+
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre='Facultad de Ingeniería')
+        self.user = User.objects.create_user(
+            username='resp_unidad',
+            password='testpass123',
+            rol=User.Rol.RESP_UNIDAD,
+            unidad_academica=self.unidad
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_etiqueta_con_nombre_de_ruta(self):
+        """Las peticiones se agrupan por ruta de DRF, no por path."""
+        self.client.get('/api/core/unidades-academicas/')
+        self.client.get(f'/api/core/unidades-academicas/{self.unidad.id}/')
+        self.client.get('/api/core/unidades-academicas/999999/')
+
+        totales = metricas.totales()
+
+        lista = totales[('unidadacademica-list', 'GET', '200')]
+        self.assertEqual(lista.peticiones, 1)
+        self.assertGreater(lista.consultas, 0)
+        self.assertGreater(lista.bytes, 0)
+        self.assertEqual(totales[('unidadacademica-detail', 'GET', '200')].peticiones, 1)
+        self.assertEqual(totales[('unidadacademica-detail', 'GET', '404')].peticiones, 1)
+
+    @override_settings(DEBUG=True)
+    def test_exposicion(self):
+        self.client.get('/api/core/unidades-academicas/')
+
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        texto = response.content.decode()
+        etiquetas = 'ruta="unidadacademica-list",metodo="GET",estado="200"'
+        self.assertIn(f'sistema_cargas_http_requests_total{{{etiquetas}}} 1', texto)
+        self.assertIn(f'sistema_cargas_http_request_duration_seconds_bucket{{{etiquetas},le="+Inf"}} 1', texto)
+        self.assertIn('# TYPE sistema_cargas_db_queries_total counter', texto)
+
+    @override_settings(METRICAS_TOKEN='secreto')
+    def test_token_requerido(self):
+        self.assertEqual(self.client.get('/metrics').status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secreto')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICAS_TOKEN='', DEBUG=False)
+    def test_sin_token_ni_debug_no_se_expone(self):
+        self.assertEqual(self.client.get('/metrics').status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RegistroMetricasTestCase(SimpleTestCase):
+    """Los registros de hilos terminados se suman al total y se descartan."""
+
+    def test_hilos_terminados(self):
+        registro = RegistroMetricas()
+
+        for _ in range(5):
+            hilo = threading.Thread(
+                target=registro.registrar,
+                args=('carga-list', 'GET', 200, 0.02, 3, 0.01, 100)
+            )
+            hilo.start()
+            hilo.join()
+        registro.registrar('carga-list', 'GET', 200, 0.02, 3, 0.01, 100)
+
+        self.assertEqual(len(registro._registros), 1)
+        serie = registro.totales()[('carga-list', 'GET', '200')]
+        self.assertEqual(serie.peticiones, 6)
+        self.assertEqual(serie.consultas, 18)
+        self.assertEqual(sum(serie.buckets), 6)
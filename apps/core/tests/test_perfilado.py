@@ -0,0 +1,85 @@
+"""
+Tests para el perfilado bajo demanda (?_profile=cprofile).
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.core.serializers import TokenAlcanceSerializer
+from apps.asignaciones.models import Periodo
+
+User = get_user_model()
+
+URL = '/api/asignaciones/periodos/?_profile=cprofile'
+
+
+@override_settings(PERFILADO_HABILITADO=True)
+class PerfiladoTestCase(TestCase):
+    """Tests para PerfiladoMiddleware."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre='Facultad de Ingeniería')
+        self.programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Software'
+        )
+        Periodo.objects.create(unidad_academica=self.unidad, nombre='2025-1')
+        self.resp_unidad = User.objects.create_user(
+            username='resp_unidad',
+            rol=User.Rol.RESP_UNIDAD,
+            unidad_academica=self.unidad
+        )
+        self.resp_programa = User.objects.create_user(
+            username='resp_programa',
+            rol=User.Rol.RESP_PROGRAMA,
+            programa_academico=self.programa
+        )
+
+    def _autenticar(self, usuario):
+        token = TokenAlcanceSerializer.get_token(usuario).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_informe_para_responsable_de_unidad(self):
+        self._autenticar(self.resp_unidad)
+
+        response = self.client.get(URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        informe = response.json()
+        self.assertEqual(informe['status_code'], 200)
+        self.assertTrue(informe['funciones'])
+        self.assertIn('tiempo_acumulado_ms', informe['funciones'][0])
+        self.assertEqual(informe['total_consultas'], len(informe['consultas']))
+
+        consulta = informe['consultas'][0]
+        self.assertIn('periodos', consulta['sql'])
+        # La pila apunta al código del proyecto que emitió la consulta
+        self.assertTrue(any(marco.startswith(('apps/', 'common/')) for marco in consulta['pila']))
+
+    def test_informe_para_staff_por_sesion(self):
+        staff = User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        self.client.force_login(staff)
+
+        response = self.client.get(URL)
+
+        self.assertIn('funciones', response.json())
+
+    def test_ignorado_para_otros_usuarios(self):
+        self._autenticar(self.resp_programa)
+
+        response = self.client.get(URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('results', response.json())
+
+    @override_settings(PERFILADO_HABILITADO=False)
+    def test_desactivado_por_defecto(self):
+        self._autenticar(self.resp_unidad)
+
+        response = self.client.get(URL)
+
+        self.assertIn('results', response.json())
@@ -0,0 +1,122 @@
+"""
+Tests para los claims de alcance del JWT (TokenAlcanceSerializer).
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+
+User = get_user_model()
+
+
+class TokenAlcanceTestCase(TestCase):
+    """El token lleva rol, unidad_id y programa_id y las vistas filtran con ellos."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre='Facultad de Ingeniería')
+        self.otra_unidad = UnidadAcademica.objects.create(nombre='Otra Facultad')
+        self.programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Software'
+        )
+        self.otro_programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Sistemas'
+        )
+        Materia.objects.create(
+            programa_academico=self.programa, clave='CS101', nombre='Programación I', horas=4
+        )
+        Materia.objects.create(
+            programa_academico=self.otro_programa, clave='CS201', nombre='Redes', horas=4
+        )
+        Profesor.objects.create(
+            unidad_academica=self.unidad, nombre='Dr. Juan Pérez', email='juan@test.com'
+        )
+        Profesor.objects.create(
+            unidad_academica=self.otra_unidad, nombre='Dra. Ana López', email='ana@test.com'
+        )
+
+        self.resp_unidad = User.objects.create_user(
+            username='resp_unidad',
+            password='testpass123',
+            rol=User.Rol.RESP_UNIDAD,
+            unidad_academica=self.unidad
+        )
+        self.resp_programa = User.objects.create_user(
+            username='resp_programa',
+            password='testpass123',
+            rol=User.Rol.RESP_PROGRAMA,
+            programa_academico=self.programa
+        )
+
+    def _tokens(self, username):
+        response = self.client.post('/api/token/', {
+            'username': username,
+            'password': 'testpass123'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_claims_responsable_programa(self):
+        """RESP_PROGRAMA: unidad efectiva (la de su programa) y su programa."""
+        access = AccessToken(self._tokens('resp_programa')['access'])
+
+        self.assertEqual(access['rol'], User.Rol.RESP_PROGRAMA)
+        self.assertEqual(access['unidad_id'], self.unidad.id)
+        self.assertEqual(access['programa_id'], self.programa.id)
+
+    def test_claims_responsable_unidad(self):
+        """RESP_UNIDAD: su unidad y sin programa."""
+        access = AccessToken(self._tokens('resp_unidad')['access'])
+
+        self.assertEqual(access['rol'], User.Rol.RESP_UNIDAD)
+        self.assertEqual(access['unidad_id'], self.unidad.id)
+        self.assertIsNone(access['programa_id'])
+
+    def test_refresh_conserva_claims(self):
+        """El access token obtenido al refrescar hereda el alcance."""
+        refresh = self._tokens('resp_programa')['refresh']
+
+        response = self.client.post('/api/token/refresh/', {'refresh': refresh}, format='json')
+
+        access = AccessToken(response.data['access'])
+        self.assertEqual(access['programa_id'], self.programa.id)
+
+    def test_refresh_recalcula_claims(self):
+        """Un cambio de rol entre el login y el refresh llega a los tokens nuevos."""
+        refresh = self._tokens('resp_programa')['refresh']
+        self.resp_programa.rol = User.Rol.RESP_UNIDAD
+        self.resp_programa.programa_academico = None
+        self.resp_programa.unidad_academica = self.otra_unidad
+        self.resp_programa.save()
+
+        response = self.client.post('/api/token/refresh/', {'refresh': refresh}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for token in (AccessToken(response.data['access']), RefreshToken(response.data['refresh'])):
+            self.assertEqual(token['rol'], User.Rol.RESP_UNIDAD)
+            self.assertEqual(token['unidad_id'], self.otra_unidad.id)
+            self.assertIsNone(token['programa_id'])
+
+    def test_listado_sin_consultar_programa_ni_unidad(self):
+        """Con el token, filtrar por alcance no carga el programa ni la unidad del usuario."""
+        access = self._tokens('resp_programa')['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+        with CaptureQueriesContext(connection) as consultas:
+            materias = self.client.get('/api/academico/materias/')
+            profesores = self.client.get('/api/academico/profesores/')
+
+        self.assertEqual([m['clave'] for m in materias.data['results']], ['CS101'])
+        self.assertEqual([p['nombre'] for p in profesores.data['results']], ['Dr. Juan Pérez'])
+        for consulta in consultas.captured_queries:
+            self.assertNotIn('FROM "programas_academicos"', consulta['sql'])
+            self.assertNotIn('FROM "unidades_academicas"', consulta['sql'])
@@ -0,0 +1,96 @@
+"""
+Tests para UsuarioViewSet.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+
+User = get_user_model()
+
+
+class UsuarioViewSetTestCase(TestCase):
+    """Alcance y costo en consultas del listado de usuarios."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre='Facultad de Ingeniería')
+        self.otra_unidad = UnidadAcademica.objects.create(nombre='Facultad de Medicina')
+        self.programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Software'
+        )
+        self.otro_programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.otra_unidad,
+            nombre='Medicina'
+        )
+
+        self.user = User.objects.create_user(
+            username='resp_unidad',
+            password='testpass123',
+            rol=User.Rol.RESP_UNIDAD,
+            unidad_academica=self.unidad
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _crear_responsables(self, inicio, cantidad):
+        # Cada programa tiene un solo responsable
+        for i in range(inicio, inicio + cantidad):
+            programa = ProgramaAcademico.objects.create(
+                unidad_academica=self.unidad,
+                nombre=f'Programa {i}'
+            )
+            User.objects.create_user(
+                username=f'resp_programa_{i}',
+                rol=User.Rol.RESP_PROGRAMA,
+                programa_academico=programa
+            )
+
+    def _consultas_listado(self):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/api/core/usuarios/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(consultas)
+
+    def test_lista_usuarios_de_la_unidad(self):
+        """Incluye responsables directos y de programas de la unidad, sin duplicados."""
+        self._crear_responsables(0, 2)
+        User.objects.create_user(
+            username='ajeno',
+            rol=User.Rol.RESP_PROGRAMA,
+            programa_academico=self.otro_programa
+        )
+
+        response = self.client.get('/api/core/usuarios/')
+
+        self.assertEqual(
+            [u['username'] for u in response.data['results']],
+            ['resp_programa_0', 'resp_programa_1', 'resp_unidad']
+        )
+
+    def test_consultas_constantes(self):
+        """El número de consultas no crece con el número de usuarios."""
+        self._crear_responsables(0, 2)
+        pocas = self._consultas_listado()
+
+        self._crear_responsables(2, 10)
+        self.assertEqual(self._consultas_listado(), pocas)
+
+    def test_unidad_efectiva_anotada(self):
+        """El detalle usa la unidad anotada, sin cargar el programa."""
+        responsable = User.objects.create_user(
+            username='resp_programa',
+            rol=User.Rol.RESP_PROGRAMA,
+            programa_academico=self.programa
+        )
+
+        response = self.client.get(f'/api/core/usuarios/{responsable.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['unidad_academica_efectiva'], self.unidad.id)
+        self.assertEqual(response.data['programa_academico_nombre'], 'Ing. Software')
@@ -8,6 +8,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.db.models import Q
+from django.db.models.functions import Coalesce
 
 from .models import UnidadAcademica, ProgramaAcademico, Usuario
 from .serializers import (
@@ -18,6 +20,7 @@ from .serializers import (
     UsuarioCreateUpdateSerializer,
     UsuarioListSerializer
 )
+from common.mixins import AlcanceMixin
 from common.permissions import IsResponsableUnidad
 
 
@@ -122,7 +125,7 @@ class ProgramaAcademicoViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class UsuarioViewSet(viewsets.ModelViewSet):
+class UsuarioViewSet(AlcanceMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar Usuarios.
 
@@ -165,19 +168,27 @@ class UsuarioViewSet(viewsets.ModelViewSet):
         """
         Los responsables de unidad ven todos los usuarios de su unidad.
         Los responsables de programa solo ven su propio perfil.
+
+        Cada usuario trae anotada su unidad efectiva (directa o la de su
+        programa), así que listar usuarios cuesta un número fijo de consultas.
         """
-        user = self.request.user
+        alcance = self.alcance
+        queryset = super().get_queryset().annotate(
+            unidad_efectiva_id=Coalesce(
+                'unidad_academica_id',
+                'programa_academico__unidad_academica_id'
+            )
+        )
 
-        if user.rol == Usuario.Rol.RESP_UNIDAD:
+        if alcance.rol == Usuario.Rol.RESP_UNIDAD:
             # Ver todos los usuarios de su unidad
-            return Usuario.objects.filter(
-                unidad_academica=user.unidad_academica
-            ) | Usuario.objects.filter(
-                programa_academico__unidad_academica=user.unidad_academica
+            return queryset.filter(
+                Q(unidad_academica_id=alcance.unidad_id) |
+                Q(programa_academico__unidad_academica_id=alcance.unidad_id)
             )
         else:
             # Solo ver su propio perfil
-            return Usuario.objects.filter(id=user.id)
+            return queryset.filter(id=alcance.usuario_id)
 
     @action(detail=False, methods=['get'])
     def me(self, request):
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'tipo', 'estado', 'progreso', 'usuario', 'created_at']
+    list_filter = ['estado', 'tipo']
+    readonly_fields = ['created_at', 'updated_at', 'iniciado_en', 'finalizado_en']
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.jobs'
+    verbose_name = 'Jobs'
+
+    def ready(self):
+        # Registra las operaciones disponibles para ejecutarse como job
+        from . import operaciones  # noqa: F401
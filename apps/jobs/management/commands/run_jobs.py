@@ -0,0 +1,120 @@
+"""
+Worker de jobs en segundo plano.
+
+Toma jobs pendientes de la tabla `jobs` y los ejecuta en un pool de
+procesos. No requiere broker externo.
+
+Uso:
+    python manage.py run_jobs
+    python manage.py run_jobs --workers 4 --intervalo 2
+    python manage.py run_jobs --una-vez          # vacía la cola y termina
+    python manage.py run_jobs --workers 0        # ejecuta en este proceso
+
+Con el pool, el proceso principal registra un latido de los jobs en curso
+en cada vuelta; al arrancar solo se reencolan los jobs EN_PROCESO sin
+latido durante JOBS_TIMEOUT_HUERFANOS. Con --workers 0 el latido son los
+reportes de progreso de la propia operación.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.jobs.services import JobService
+from apps.jobs.worker import ejecutar_job, inicializar_proceso
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta los jobs pendientes en un pool de procesos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Procesos del pool (0 = ejecutar en el proceso actual).'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=1.0,
+            help='Segundos entre consultas a la cola cuando está vacía.'
+        )
+        parser.add_argument(
+            '--una-vez',
+            action='store_true',
+            help='Procesa los jobs pendientes y termina.'
+        )
+
+    def handle(self, *args, **options):
+        reencolados = JobService.reiniciar_huerfanos()
+        if reencolados:
+            self.stdout.write(self.style.WARNING(
+                f'{reencolados} job(s) interrumpido(s) devuelto(s) a la cola.'
+            ))
+
+        if options['workers'] == 0:
+            self._ejecutar_en_proceso(options['intervalo'], options['una_vez'])
+        else:
+            self._ejecutar_en_pool(options['workers'], options['intervalo'], options['una_vez'])
+
+    def _reportar(self, job_id, estado):
+        self.stdout.write(f'Job #{job_id}: {estado}')
+
+    def _ejecutar_en_proceso(self, intervalo, una_vez):
+        while True:
+            job_id = JobService.reclamar_siguiente()
+            if job_id is None:
+                if una_vez:
+                    return
+                time.sleep(intervalo)
+                continue
+            self._reportar(job_id, JobService.ejecutar(job_id))
+
+    def _ejecutar_en_pool(self, workers, intervalo, una_vez):
+        # Las conexiones abiertas no deben compartirse con los procesos hijos
+        connections.close_all()
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=inicializar_proceso
+        )
+        en_curso = {}
+        ultimo_latido = time.monotonic()
+
+        try:
+            while True:
+                while len(en_curso) < workers:
+                    job_id = JobService.reclamar_siguiente()
+                    if job_id is None:
+                        break
+                    en_curso[pool.submit(ejecutar_job, job_id)] = job_id
+
+                if not en_curso:
+                    if una_vez:
+                        return
+                    time.sleep(intervalo)
+                    continue
+
+                terminados, _ = wait(en_curso, timeout=intervalo, return_when=FIRST_COMPLETED)
+                if time.monotonic() - ultimo_latido >= intervalo:
+                    # Evita que otro run_jobs tome estos jobs por huérfanos
+                    JobService.registrar_latido(en_curso.values())
+                    ultimo_latido = time.monotonic()
+                for futuro in terminados:
+                    job_id = en_curso.pop(futuro)
+                    try:
+                        estado = futuro.result()
+                    except Exception as exc:
+                        # El proceso del pool murió antes de registrar el resultado
+                        JobService.marcar_fallido(job_id, repr(exc))
+                        estado = 'FALLIDO'
+                    self._reportar(job_id, estado)
+        except KeyboardInterrupt:
+            self.stdout.write('Deteniendo worker; esperando jobs en curso...')
+        finally:
+            pool.shutdown(wait=True)
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.db import models
+
+
+class Job(models.Model):
+    """
+    Operación pesada ejecutada en segundo plano por `manage.py run_jobs`.
+
+    La tabla hace de cola: no se necesita un broker externo.
+
+    Estados:
+    - PENDIENTE: En cola, esperando un worker
+    - EN_PROCESO: Reclamado por un worker
+    - COMPLETADO: Terminó; el resultado está en `resultado`
+    - FALLIDO: Terminó con error; el detalle está en `error`
+    """
+
+    class Estado(models.TextChoices):
+        PENDIENTE = 'PENDIENTE', 'Pendiente'
+        EN_PROCESO = 'EN_PROCESO', 'En proceso'
+        COMPLETADO = 'COMPLETADO', 'Completado'
+        FALLIDO = 'FALLIDO', 'Fallido'
+
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='jobs',
+        null=True,
+        blank=True
+    )
+    tipo = models.CharField(
+        max_length=50,
+        help_text='Operación registrada a ejecutar (ej: validar_periodo)'
+    )
+    parametros = models.JSONField(default=dict, blank=True)
+    estado = models.CharField(
+        max_length=10,
+        choices=Estado.choices,
+        default=Estado.PENDIENTE
+    )
+    progreso = models.PositiveSmallIntegerField(
+        default=0,
+        help_text='Porcentaje de avance (0-100)'
+    )
+    mensaje = models.CharField(max_length=255, blank=True)
+    resultado = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    iniciado_en = models.DateTimeField(null=True, blank=True)
+    finalizado_en = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'jobs'
+        verbose_name = 'Job'
+        verbose_name_plural = 'Jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['estado', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} #{self.pk} [{self.get_estado_display()}]"
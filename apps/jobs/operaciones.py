@@ -0,0 +1,52 @@
+"""
+Operaciones de PeriodoService disponibles como job.
+"""
+
+from apps.asignaciones.models import Periodo
+from apps.asignaciones.services import ArchivoService, PeriodoService
+from .registro import registrar
+
+
+def _avance_por_cargas(progreso):
+    """Adapta progreso(procesadas, total) de los services al porcentaje del job."""
+    def avance(procesadas, total):
+        porcentaje = int(procesadas * 100 / total) if total else 100
+        progreso(porcentaje, f'{procesadas}/{total} cargas procesadas')
+    return avance
+
+
+@registrar('validar_periodo', requiere_periodo=True)
+def validar_periodo(parametros, progreso):
+    periodo = Periodo.objects.get(id=parametros['periodo_id'])
+    return PeriodoService.validar_periodo(periodo, progreso=_avance_por_cargas(progreso))
+
+
+@registrar('estadisticas_periodo', requiere_periodo=True)
+def estadisticas_periodo(parametros, progreso):
+    periodo = Periodo.objects.get(id=parametros['periodo_id'])
+    return ArchivoService.obtener_estadisticas(periodo)
+
+
+@registrar('finalizar_periodo', requiere_periodo=True, roles=('RESP_UNIDAD',))
+def finalizar_periodo(parametros, progreso):
+    periodo = Periodo.objects.get(id=parametros['periodo_id'])
+    resultado = PeriodoService.finalizar_periodo(periodo)
+
+    # Las cargas problemáticas son instancias; el resultado guarda solo IDs
+    if 'cargas_problematicas' in resultado:
+        resultado['cargas_problematicas'] = {
+            'pendientes': [c.id for c in resultado['cargas_problematicas']['pendientes']]
+        }
+    return resultado
+
+
+@registrar('purgar_periodo', requiere_periodo=True, roles=('RESP_UNIDAD',))
+def purgar_periodo(parametros, progreso):
+    periodo = Periodo.objects.get(id=parametros['periodo_id'])
+    return PeriodoService.purgar_periodo(periodo)
+
+
+@registrar('archivar_periodo', requiere_periodo=True, roles=('RESP_UNIDAD',))
+def archivar_periodo(parametros, progreso):
+    periodo = Periodo.objects.get(id=parametros['periodo_id'])
+    return ArchivoService.archivar_periodo(periodo)
@@ -0,0 +1,49 @@
+"""
+Registro de operaciones que pueden ejecutarse como job.
+
+Cada operación recibe los parámetros del job y un callback de progreso,
+y retorna un dict serializable a JSON que se guarda como resultado:
+
+    @registrar('validar_periodo', requiere_periodo=True)
+    def validar_periodo(parametros, progreso):
+        progreso(50, 'Mitad del trabajo')
+        return {...}
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Operacion:
+    tipo: str
+    funcion: Callable
+    requiere_periodo: bool = False
+    roles: Optional[Tuple[str, ...]] = None
+
+
+_OPERACIONES: Dict[str, Operacion] = {}
+
+
+def registrar(tipo: str, requiere_periodo: bool = False, roles: Optional[Tuple[str, ...]] = None):
+    """
+    Registra una función como operación ejecutable en segundo plano.
+
+    Args:
+        tipo: Identificador usado al enviar el job
+        requiere_periodo: Si True, `parametros['periodo_id']` es obligatorio
+            y debe pertenecer al alcance del usuario
+        roles: Roles autorizados a enviar el job (None = cualquiera)
+    """
+    def decorador(funcion):
+        _OPERACIONES[tipo] = Operacion(tipo, funcion, requiere_periodo, roles)
+        return funcion
+    return decorador
+
+
+def obtener_operacion(tipo: str) -> Optional[Operacion]:
+    return _OPERACIONES.get(tipo)
+
+
+def tipos_registrados():
+    return sorted(_OPERACIONES)
@@ -0,0 +1,84 @@
+"""
+Serializers para el módulo Jobs.
+"""
+
+from rest_framework import serializers
+
+from apps.asignaciones.models import Periodo
+from common.alcance import alcance_de_peticion
+from .models import Job
+from .registro import obtener_operacion, tipos_registrados
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """
+    Serializer de lectura para consultar el estado de un job.
+    """
+    estado_display = serializers.CharField(
+        source='get_estado_display',
+        read_only=True
+    )
+
+    class Meta:
+        model = Job
+        fields = [
+            'id',
+            'tipo',
+            'parametros',
+            'estado',
+            'estado_display',
+            'progreso',
+            'mensaje',
+            'resultado',
+            'error',
+            'iniciado_en',
+            'finalizado_en',
+            'created_at',
+            'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class JobCreateSerializer(serializers.ModelSerializer):
+    """
+    Serializer para enviar un job.
+    Valida que la operación exista, el rol del usuario y el periodo.
+    """
+
+    class Meta:
+        model = Job
+        fields = ['tipo', 'parametros']
+
+    def validate_tipo(self, value):
+        if obtener_operacion(value) is None:
+            raise serializers.ValidationError(
+                f"Operación no registrada. Disponibles: {', '.join(tipos_registrados())}"
+            )
+        return value
+
+    def validate(self, data):
+        """
+        Valida:
+        1. Que el rol del usuario pueda enviar la operación
+        2. Que el periodo exista y pertenezca a la unidad del usuario
+        """
+        alcance = alcance_de_peticion(self.context['request'])
+        operacion = obtener_operacion(data['tipo'])
+        parametros = data.get('parametros') or {}
+
+        if operacion.roles and alcance.rol not in operacion.roles:
+            raise serializers.ValidationError({
+                'tipo': 'Tu rol no puede ejecutar esta operación.'
+            })
+
+        if operacion.requiere_periodo:
+            periodos = Periodo.objects.filter(alcance.filtro('unidad_academica_id'))
+
+            periodo_id = parametros.get('periodo_id')
+            if not periodo_id or not periodos.filter(id=periodo_id).exists():
+                raise serializers.ValidationError({
+                    'parametros': 'Debe proporcionar un periodo_id válido.'
+                })
+
+        data['parametros'] = parametros
+        return data
@@ -0,0 +1,9 @@
+"""
+Services para la ejecución de jobs en segundo plano.
+"""
+
+from .job_service import JobService
+
+__all__ = [
+    'JobService',
+]
@@ -0,0 +1,175 @@
+"""
+Servicio para encolar, reclamar y ejecutar jobs.
+"""
+
+import traceback
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.jobs.models import Job
+from apps.jobs.registro import obtener_operacion
+from common.alcance import Alcance
+from common.routers import en_unidad
+
+
+class JobService:
+    """
+    Servicio que usa la tabla `jobs` como cola persistente.
+    """
+
+    @staticmethod
+    def encolar(usuario, tipo: str, parametros: Optional[Dict] = None) -> Job:
+        """
+        Crea un job en estado PENDIENTE.
+
+        Args:
+            usuario: Usuario que envía el job
+            tipo: Operación registrada
+            parametros: Parámetros de la operación
+
+        Returns:
+            Job: Instancia creada
+        """
+        return Job.objects.create(
+            usuario=usuario,
+            tipo=tipo,
+            parametros=parametros or {}
+        )
+
+    @staticmethod
+    def reclamar_siguiente() -> Optional[int]:
+        """
+        Reclama el job pendiente más antiguo.
+
+        El UPDATE condicionado al estado garantiza que dos workers no
+        reclamen el mismo job.
+
+        Returns:
+            ID del job reclamado, o None si la cola está vacía
+        """
+        while True:
+            job_id = Job.objects.filter(
+                estado=Job.Estado.PENDIENTE
+            ).order_by('created_at', 'id').values_list('id', flat=True).first()
+
+            if job_id is None:
+                return None
+
+            ahora = timezone.now()
+            reclamado = Job.objects.filter(
+                id=job_id,
+                estado=Job.Estado.PENDIENTE
+            ).update(
+                estado=Job.Estado.EN_PROCESO,
+                iniciado_en=ahora,
+                updated_at=ahora
+            )
+            if reclamado:
+                return job_id
+
+    @staticmethod
+    def reportar_progreso(job_id: int, porcentaje: int, mensaje: str = '') -> None:
+        """
+        Actualiza el avance de un job en ejecución.
+
+        Args:
+            job_id: ID del job
+            porcentaje: Avance de 0 a 100
+            mensaje: Descripción breve del paso actual
+        """
+        Job.objects.filter(id=job_id).update(
+            progreso=max(0, min(100, int(porcentaje))),
+            mensaje=mensaje[:255],
+            updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def marcar_fallido(job_id: int, error: str) -> None:
+        ahora = timezone.now()
+        Job.objects.filter(id=job_id).update(
+            estado=Job.Estado.FALLIDO,
+            error=error,
+            finalizado_en=ahora,
+            updated_at=ahora
+        )
+
+    @staticmethod
+    def registrar_latido(job_ids: Iterable[int]) -> None:
+        """
+        Marca como vivos los jobs que un worker sigue ejecutando.
+
+        Args:
+            job_ids: IDs de los jobs EN_PROCESO del worker
+        """
+        job_ids = list(job_ids)
+        if job_ids:
+            Job.objects.filter(
+                id__in=job_ids,
+                estado=Job.Estado.EN_PROCESO
+            ).update(updated_at=timezone.now())
+
+    @staticmethod
+    def reiniciar_huerfanos() -> int:
+        """
+        Devuelve a la cola los jobs que quedaron EN_PROCESO porque su
+        worker terminó de forma abrupta.
+
+        Solo se consideran huérfanos los jobs sin latido ni progreso
+        (`updated_at`) durante JOBS_TIMEOUT_HUERFANOS: los que otro worker
+        sigue ejecutando no se tocan.
+
+        Returns:
+            int: Número de jobs reencolados
+        """
+        ahora = timezone.now()
+        return Job.objects.filter(
+            estado=Job.Estado.EN_PROCESO,
+            updated_at__lt=ahora - settings.JOBS_TIMEOUT_HUERFANOS
+        ).update(
+            estado=Job.Estado.PENDIENTE,
+            progreso=0,
+            mensaje='',
+            updated_at=ahora
+        )
+
+    @staticmethod
+    def ejecutar(job_id: int) -> str:
+        """
+        Ejecuta un job ya reclamado y guarda su resultado o error.
+
+        Args:
+            job_id: ID del job (estado EN_PROCESO)
+
+        Returns:
+            str: Estado final del job
+        """
+        job = Job.objects.select_related('usuario__programa_academico').get(id=job_id)
+        operacion = obtener_operacion(job.tipo)
+
+        if operacion is None:
+            JobService.marcar_fallido(job_id, f'Operación no registrada: {job.tipo}')
+            return Job.Estado.FALLIDO
+
+        def progreso(porcentaje, mensaje=''):
+            JobService.reportar_progreso(job_id, porcentaje, mensaje)
+
+        try:
+            # Con sharding por unidad, el job opera sobre el shard de su usuario
+            with en_unidad(Alcance.de_usuario(job.usuario).unidad_id):
+                resultado = operacion.funcion(job.parametros, progreso)
+        except Exception:
+            JobService.marcar_fallido(job_id, traceback.format_exc())
+            return Job.Estado.FALLIDO
+
+        ahora = timezone.now()
+        Job.objects.filter(id=job_id).update(
+            estado=Job.Estado.COMPLETADO,
+            progreso=100,
+            resultado=resultado,
+            finalizado_en=ahora,
+            updated_at=ahora
+        )
+        return Job.Estado.COMPLETADO
+
@@ -0,0 +1,170 @@
+"""
+Tests para el módulo Jobs (cola en base de datos y worker).
+"""
+
+from datetime import time, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico
+from apps.academico.models import Profesor, Materia
+from apps.asignaciones.models import Periodo, Carga, BloqueHorario
+from apps.jobs.models import Job
+from apps.jobs.services import JobService
+
+User = get_user_model()
+
+
+class JobTestCase(TestCase):
+    """Tests para enviar, reclamar y ejecutar jobs."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.unidad = UnidadAcademica.objects.create(nombre="Facultad de Ingeniería")
+        self.programa = ProgramaAcademico.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Ing. Software'
+        )
+        self.materia = Materia.objects.create(
+            programa_academico=self.programa,
+            clave='CS101',
+            nombre='Programación I',
+            horas=2
+        )
+        self.profesor = Profesor.objects.create(
+            unidad_academica=self.unidad,
+            nombre='Dr. Juan Pérez',
+            email='juan@test.com'
+        )
+        self.periodo = Periodo.objects.create(
+            unidad_academica=self.unidad,
+            nombre='2025-1'
+        )
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            rol=User.Rol.RESP_PROGRAMA,
+            programa_academico=self.programa
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _crear_carga(self, dia, inicio, fin):
+        carga = Carga.objects.create(
+            programa_academico=self.programa,
+            materia=self.materia,
+            profesor=self.profesor,
+            periodo=self.periodo,
+            estado=Carga.Estado.CORRECTA
+        )
+        BloqueHorario.objects.create(
+            carga=carga, dia=dia, hora_inicio=time(inicio), hora_fin=time(fin)
+        )
+        return carga
+
+    def test_enviar_job(self):
+        """POST /api/jobs/ encola el job y responde 202."""
+        response = self.client.post('/api/jobs/', {
+            'tipo': 'validar_periodo',
+            'parametros': {'periodo_id': self.periodo.id}
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['estado'], Job.Estado.PENDIENTE)
+
+    def test_enviar_job_tipo_desconocido(self):
+        """Una operación no registrada se rechaza."""
+        response = self.client.post('/api/jobs/', {'tipo': 'no_existe'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_enviar_job_rol_no_autorizado(self):
+        """finalizar_periodo solo lo puede enviar un responsable de unidad."""
+        response = self.client.post('/api/jobs/', {
+            'tipo': 'finalizar_periodo',
+            'parametros': {'periodo_id': self.periodo.id}
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_enviar_job_periodo_fuera_de_alcance(self):
+        """Un periodo de otra unidad se rechaza."""
+        otra = UnidadAcademica.objects.create(nombre="Otra")
+        periodo = Periodo.objects.create(unidad_academica=otra, nombre='2025-1')
+
+        response = self.client.post('/api/jobs/', {
+            'tipo': 'validar_periodo',
+            'parametros': {'periodo_id': periodo.id}
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ejecutar_validar_periodo(self):
+        """El worker ejecuta el job y guarda resultado y progreso."""
+        carga1 = self._crear_carga('LUN', 8, 10)
+        carga2 = self._crear_carga('LUN', 9, 11)
+        self._crear_carga('MAR', 8, 10)
+
+        job = JobService.encolar(self.user, 'validar_periodo', {'periodo_id': self.periodo.id})
+        call_command('run_jobs', workers=0, una_vez=True, stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.estado, Job.Estado.COMPLETADO)
+        self.assertEqual(job.progreso, 100)
+        self.assertEqual(job.resultado['total_cargas'], 3)
+        self.assertEqual(job.resultado['conflictos'], [{
+            'carga_id': carga1.id,
+            'carga_conflictiva_id': carga2.id,
+            'profesor_id': self.profesor.id,
+            'dia': 'LUN'
+        }])
+
+    def test_consultar_job(self):
+        """GET /api/jobs/{id}/ devuelve el estado; otros usuarios no lo ven."""
+        job = JobService.encolar(self.user, 'estadisticas_periodo', {'periodo_id': self.periodo.id})
+        JobService.ejecutar(JobService.reclamar_siguiente())
+
+        response = self.client.get(f'/api/jobs/{job.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['estado'], Job.Estado.COMPLETADO)
+        self.assertEqual(response.data['resultado']['total_cargas'], 0)
+
+        otro = User.objects.create_user(username='otro', password='x')
+        self.client.force_authenticate(user=otro)
+        response = self.client.get(f'/api/jobs/{job.id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_job_fallido_guarda_error(self):
+        """Una excepción en la operación marca el job como FALLIDO."""
+        job = JobService.encolar(self.user, 'validar_periodo', {'periodo_id': 999999})
+        JobService.ejecutar(JobService.reclamar_siguiente())
+
+        job.refresh_from_db()
+        self.assertEqual(job.estado, Job.Estado.FALLIDO)
+        self.assertIn('DoesNotExist', job.error)
+
+    def test_reclamar_no_repite_job(self):
+        """Un job reclamado no vuelve a entregarse."""
+        JobService.encolar(self.user, 'estadisticas_periodo', {'periodo_id': self.periodo.id})
+
+        self.assertIsNotNone(JobService.reclamar_siguiente())
+        self.assertIsNone(JobService.reclamar_siguiente())
+
+    def test_reiniciar_solo_huerfanos_sin_latido(self):
+        """Solo vuelven a la cola los jobs EN_PROCESO sin latido reciente."""
+        viejo = JobService.encolar(self.user, 'estadisticas_periodo', {'periodo_id': self.periodo.id})
+        vivo = JobService.encolar(self.user, 'estadisticas_periodo', {'periodo_id': self.periodo.id})
+        JobService.reclamar_siguiente()
+        JobService.reclamar_siguiente()
+        hace_una_hora = timezone.now() - timedelta(hours=1)
+        Job.objects.update(updated_at=hace_una_hora)
+        JobService.registrar_latido([vivo.id])
+
+        self.assertEqual(JobService.reiniciar_huerfanos(), 1)
+
+        viejo.refresh_from_db()
+        vivo.refresh_from_db()
+        self.assertEqual(viejo.estado, Job.Estado.PENDIENTE)
+        self.assertEqual(vivo.estado, Job.Estado.EN_PROCESO)
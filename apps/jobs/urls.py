@@ -0,0 +1,17 @@
+"""
+URLs para el módulo Jobs.
+"""
+
+from django.urls import path, include
+from rest_framework.routers import SimpleRouter
+from .views import JobViewSet
+
+app_name = 'jobs'
+
+# SimpleRouter: el prefijo vacío no choca con la vista raíz de DefaultRouter
+router = SimpleRouter()
+router.register(r'', JobViewSet, basename='job')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,55 @@
+"""
+ViewSets para el módulo Jobs.
+"""
+
+from rest_framework import mixins, status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from common.idempotencia import idempotente
+from common.mixins import ShardUnidadMixin
+from .models import Job
+from .serializers import JobSerializer, JobCreateSerializer
+from .services import JobService
+
+
+class JobViewSet(ShardUnidadMixin,
+                 mixins.CreateModelMixin,
+                 mixins.ListModelMixin,
+                 mixins.RetrieveModelMixin,
+                 viewsets.GenericViewSet):
+    """
+    ViewSet para enviar jobs y consultar su estado.
+
+    list: Listar los jobs del usuario
+    create: Enviar un job (responde 202 y se ejecuta con `run_jobs`)
+    retrieve: Consultar estado, progreso y resultado de un job
+    """
+    queryset = Job.objects.all()
+    permission_classes = [IsAuthenticated]
+    filterset_fields = ['tipo', 'estado']
+    ordering = ['-created_at']
+
+    def get_serializer_class(self):
+        if self.action == 'create':
+            return JobCreateSerializer
+        return JobSerializer
+
+    def get_queryset(self):
+        """
+        Cada usuario solo ve los jobs que envió.
+        """
+        return super().get_queryset().filter(usuario_id=self.request.user.pk)
+
+    @idempotente
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job = JobService.encolar(
+            usuario=request.user,
+            tipo=serializer.validated_data['tipo'],
+            parametros=serializer.validated_data['parametros']
+        )
+
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
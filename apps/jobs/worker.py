@@ -0,0 +1,18 @@
+"""
+Puntos de entrada para los procesos del pool de `run_jobs`.
+
+Con el contexto spawn cada proceso importa este módulo antes de
+configurar Django, por lo que no debe importar modelos a nivel de módulo.
+"""
+
+
+def inicializar_proceso():
+    """Prepara Django en cada proceso del pool."""
+    import django
+    django.setup()
+
+
+def ejecutar_job(job_id: int) -> str:
+    """Ejecuta un job reclamado dentro de un proceso del pool."""
+    from apps.jobs.services import JobService
+    return JobService.ejecutar(job_id)
@@ -0,0 +1,98 @@
+"""
+Alcance (unidad / programa) de un usuario, embebido en los claims del JWT.
+
+TokenAlcanceSerializer copia en el token el rol del usuario, su unidad
+efectiva y, si solo responde de un programa, ese programa. Cada petición
+resuelve su Alcance una sola vez (ver AlcanceMixin) desde request.auth, de
+modo que filtrar por unidad o programa no requiere cargar el usuario, su
+programa ni su unidad.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from django.db.models import Q
+
+CLAIM_ROL = 'rol'
+CLAIM_UNIDAD = 'unidad_id'
+CLAIM_PROGRAMA = 'programa_id'
+
+
+@dataclass(frozen=True)
+class Alcance:
+    """
+    Qué datos puede ver un usuario:
+    - programa_id: solo los de ese programa (responsable de programa)
+    - unidad_id: los de esa unidad (responsable de unidad); para un
+      responsable de programa es la unidad de su programa
+    - ambos None: sin restricción
+    """
+    usuario_id: Optional[int] = None
+    rol: Optional[str] = None
+    unidad_id: Optional[int] = None
+    programa_id: Optional[int] = None
+
+    @classmethod
+    def de_usuario(cls, user):
+        """Alcance calculado desde el usuario (puede consultar su programa)."""
+        unidad_id = getattr(user, 'unidad_academica_id', None)
+        programa_id = None
+        if not unidad_id and getattr(user, 'programa_academico_id', None):
+            programa_id = user.programa_academico_id
+            unidad_id = user.programa_academico.unidad_academica_id
+
+        return cls(
+            usuario_id=getattr(user, 'pk', None),
+            rol=getattr(user, 'rol', None),
+            unidad_id=unidad_id,
+            programa_id=programa_id,
+        )
+
+    def claims(self):
+        """Claims del token: rol, unidad_id y programa_id."""
+        return {
+            CLAIM_ROL: self.rol,
+            CLAIM_UNIDAD: self.unidad_id,
+            CLAIM_PROGRAMA: self.programa_id,
+        }
+
+    def filtro(self, campo_unidad, campo_programa=None):
+        """
+        Q que restringe un queryset al alcance.
+
+        Args:
+            campo_unidad: Lookup hasta el ID de la unidad (p. ej. 'unidad_academica_id')
+            campo_programa: Lookup hasta el ID del programa; sin él, un
+                responsable de programa ve toda la unidad de su programa
+        """
+        if self.programa_id and campo_programa:
+            return Q(**{campo_programa: self.programa_id})
+        if self.unidad_id:
+            return Q(**{campo_unidad: self.unidad_id})
+        return Q()
+
+
+def alcance_de_peticion(request):
+    """
+    Alcance del usuario de la petición, resuelto una vez y guardado en la
+    petición. Se toma de los claims del token; sin ellos (tokens anteriores,
+    sesión, force_authenticate) se calcula desde el usuario.
+    """
+    alcance = getattr(request, '_alcance', None)
+    if alcance is not None:
+        return alcance
+
+    token = getattr(request, 'auth', None)
+    payload = getattr(token, 'payload', None)
+    if payload is not None and CLAIM_UNIDAD in payload:
+        alcance = Alcance(
+            usuario_id=request.user.pk,
+            rol=payload.get(CLAIM_ROL),
+            unidad_id=payload[CLAIM_UNIDAD],
+            programa_id=payload.get(CLAIM_PROGRAMA),
+        )
+    else:
+        alcance = Alcance.de_usuario(request.user)
+
+    request._alcance = alcance
+    return alcance
@@ -0,0 +1,82 @@
+"""
+Autenticación JWT sin consulta del usuario en peticiones de lectura.
+"""
+
+from django.utils.functional import LazyObject, empty
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from common.alcance import CLAIM_PROGRAMA, CLAIM_ROL, CLAIM_UNIDAD
+
+
+class UsuarioDeToken(LazyObject):
+    """
+    Usuario construido con los claims de un token ya verificado.
+
+    Responde sin consultar la base de datos a lo que el token ya sabe (pk,
+    rol, unidad y programa, is_authenticated); el Usuario completo se carga
+    la primera vez que se pide cualquier otro atributo (p. ej. el
+    serializer de /usuarios/me/) y desde entonces se delega en él.
+    """
+
+    def __init__(self, autenticacion, token):
+        self.__dict__['_autenticacion'] = autenticacion
+        self.__dict__['_token'] = token
+
+        payload = token.payload
+        user_id = payload[api_settings.USER_ID_CLAIM]
+        programa_id = payload.get(CLAIM_PROGRAMA)
+        self.__dict__['_claims'] = {
+            'pk': user_id,
+            api_settings.USER_ID_FIELD: user_id,
+            'rol': payload.get(CLAIM_ROL),
+            # unidad_id es la unidad efectiva; la propia solo si no es de programa
+            'unidad_academica_id': None if programa_id else payload.get(CLAIM_UNIDAD),
+            'programa_academico_id': programa_id,
+            'is_authenticated': True,
+            'is_anonymous': False,
+        }
+        super().__init__()
+
+    def _setup(self):
+        self._wrapped = JWTAuthentication.get_user(self._autenticacion, self._token)
+
+    def __getattr__(self, name):
+        claims = self.__dict__['_claims']
+        if name in claims and self._wrapped is empty:
+            return claims[name]
+        if self._wrapped is empty:
+            self._setup()
+        return getattr(self._wrapped, name)
+
+    def __bool__(self):
+        # IsAuthenticated evalúa `request.user and ...`
+        return True
+
+
+class JWTLecturaSinEstadoAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que, en GET/HEAD/OPTIONS con un token que incluye los
+    claims de alcance (ver TokenAlcanceSerializer), no consulta el Usuario:
+    devuelve un UsuarioDeToken que lo carga solo si la vista lo necesita.
+
+    Las escrituras y los tokens sin claims de alcance siguen cargando el
+    usuario (y validando is_active) como JWTAuthentication.
+    """
+
+    def authenticate(self, request):
+        if request.method not in SAFE_METHODS:
+            return super().authenticate(request)
+
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if CLAIM_ROL not in validated_token.payload:
+            return self.get_user(validated_token), validated_token
+        return UsuarioDeToken(self, validated_token), validated_token
@@ -0,0 +1,225 @@
+"""
+Registro de consultas lentas con su plan de ejecución.
+
+ConsultasLentasMiddleware instala en cada petición un execute_wrapper que,
+para las consultas que tardan al menos CONSULTAS_LENTAS_UMBRAL_MS, escribe
+en el logger 'consultas_lentas' el SQL, los parámetros, la duración, la
+vista que atendía la petición y el sitio del proyecto que emitió la
+consulta, y guarda la entrada en un buffer circular de
+CONSULTAS_LENTAS_MAX elementos.
+
+Las consultas se agrupan por forma (SQL normalizado: literales y
+parámetros como '?', listas IN colapsadas) y la primera vez que una forma
+resulta lenta se obtiene su plan con EXPLAIN QUERY PLAN (SQLite) o EXPLAIN
+(PostgreSQL). Los peores ofensores por tiempo acumulado se consultan en
+/admin/consultas-lentas/ (staff). Como las métricas, el buffer es de cada
+proceso.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.contrib import admin
+from django.db import DatabaseError, transaction
+from django.template.response import TemplateResponse
+from django.utils import timezone
+
+from common.perfilado import pila_llamadas
+
+logger = logging.getLogger('consultas_lentas')
+
+MAX_LARGO_PARAMETROS = 500
+SENTENCIAS_EXPLICABLES = ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT')
+
+_CADENAS = re.compile(r"'(?:[^']|'')*'")
+_NUMEROS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_LISTAS = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_ESPACIOS = re.compile(r'\s+')
+
+
+def normalizar(sql):
+    """Forma de la consulta: sin literales ni parámetros concretos."""
+    forma = _CADENAS.sub('?', sql)
+    forma = forma.replace('%s', '?')
+    forma = _NUMEROS.sub('?', forma)
+    forma = _LISTAS.sub('(?...)', forma)
+    return _ESPACIOS.sub(' ', forma).strip()
+
+
+class RegistroConsultasLentas:
+    """Buffer circular de consultas lentas y planes por forma."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entradas = deque(maxlen=settings.CONSULTAS_LENTAS_MAX)
+        self._planes = OrderedDict()
+
+    def registrar(self, entrada):
+        with self._lock:
+            if self._entradas.maxlen != settings.CONSULTAS_LENTAS_MAX:
+                self._entradas = deque(self._entradas, maxlen=settings.CONSULTAS_LENTAS_MAX)
+            self._entradas.append(entrada)
+
+    def tiene_plan(self, huella):
+        with self._lock:
+            return huella in self._planes
+
+    def guardar_plan(self, huella, plan):
+        with self._lock:
+            self._planes[huella] = plan
+            while len(self._planes) > settings.CONSULTAS_LENTAS_MAX:
+                self._planes.popitem(last=False)
+
+    def entradas(self):
+        with self._lock:
+            return list(self._entradas)
+
+    def peores(self, limite=20):
+        """
+        Formas con más tiempo acumulado en el buffer, con el ejemplo más
+        lento de cada una y su plan.
+        """
+        with self._lock:
+            entradas = list(self._entradas)
+            planes = dict(self._planes)
+
+        grupos = {}
+        for entrada in entradas:
+            grupo = grupos.get(entrada['huella'])
+            if grupo is None:
+                grupo = grupos[entrada['huella']] = {
+                    'huella': entrada['huella'],
+                    'forma': entrada['forma'],
+                    'veces': 0,
+                    'total_ms': 0.0,
+                    'maximo_ms': 0.0,
+                    'vistas': set(),
+                    'ejemplo': entrada,
+                }
+            grupo['veces'] += 1
+            grupo['total_ms'] += entrada['duracion_ms']
+            grupo['vistas'].add(entrada['vista'])
+            if entrada['duracion_ms'] >= grupo['maximo_ms']:
+                grupo['maximo_ms'] = entrada['duracion_ms']
+                grupo['ejemplo'] = entrada
+
+        resultado = sorted(grupos.values(), key=lambda g: g['total_ms'], reverse=True)[:limite]
+        for grupo in resultado:
+            grupo['total_ms'] = round(grupo['total_ms'], 3)
+            grupo['promedio_ms'] = round(grupo['total_ms'] / grupo['veces'], 3)
+            grupo['vistas'] = sorted(grupo['vistas'])
+            grupo['plan'] = planes.get(grupo['huella'], [])
+        return resultado
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._planes.clear()
+
+
+consultas_lentas = RegistroConsultasLentas()
+
+
+class MonitorConsultasLentas:
+    """
+    execute_wrapper de una petición: registra las consultas que superan el
+    umbral. `request` se consulta en cada registro porque resolver_match
+    se asigna después de instalar el wrapper.
+    """
+
+    def __init__(self, request, registro=consultas_lentas):
+        self.request = request
+        self.registro = registro
+        self._explicando = False
+
+    def __call__(self, execute, sql, params, many, context):
+        # Las consultas del propio EXPLAIN (y sus savepoints) no se registran
+        if self._explicando:
+            return execute(sql, params, many, context)
+
+        inicio = time.perf_counter()
+        resultado = execute(sql, params, many, context)
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        if duracion_ms >= settings.CONSULTAS_LENTAS_UMBRAL_MS:
+            self._registrar(sql, params, many, context['connection'], duracion_ms)
+        return resultado
+
+    def _registrar(self, sql, params, many, conexion, duracion_ms):
+        forma = normalizar(sql)
+        huella = hashlib.sha1(forma.encode()).hexdigest()[:12]
+        pila = pila_llamadas()
+        entrada = {
+            'fecha': timezone.now().isoformat(),
+            'huella': huella,
+            'forma': forma,
+            'sql': sql,
+            'parametros': repr(params)[:MAX_LARGO_PARAMETROS],
+            'duracion_ms': round(duracion_ms, 3),
+            'alias': conexion.alias,
+            'vista': self._vista(),
+            'sitio': pila[-1] if pila else '',
+            'pila': pila,
+        }
+        self.registro.registrar(entrada)
+
+        if (
+            settings.CONSULTAS_LENTAS_EXPLAIN
+            and not many
+            and not self.registro.tiene_plan(huella)
+            and sql.lstrip().upper().startswith(SENTENCIAS_EXPLICABLES)
+        ):
+            self.registro.guardar_plan(huella, self._explicar(conexion, sql, params))
+
+        logger.warning(
+            'Consulta lenta (%.1f ms) en %s desde %s: %s; parámetros: %s',
+            duracion_ms, entrada['vista'], entrada['sitio'] or '?', sql, entrada['parametros'],
+            extra={'consulta_lenta': entrada}
+        )
+
+    def _vista(self):
+        match = getattr(self.request, 'resolver_match', None)
+        vista = (match.view_name if match else None) or self.request.path
+        return f'{self.request.method} {vista}'
+
+    def _explicar(self, conexion, sql, params):
+        """Plan de la consulta como lista de líneas; el error si falla."""
+        prefijo = 'EXPLAIN QUERY PLAN ' if conexion.vendor == 'sqlite' else 'EXPLAIN '
+        self._explicando = True
+        try:
+            # El savepoint evita que un EXPLAIN fallido aborte la transacción
+            with transaction.atomic(using=conexion.alias):
+                with conexion.cursor() as cursor:
+                    cursor.execute(prefijo + sql, params)
+                    filas = cursor.fetchall()
+        except DatabaseError as e:
+            return [f'EXPLAIN falló: {e}']
+        finally:
+            self._explicando = False
+        # SQLite: (id, parent, notused, detail); PostgreSQL: (línea,)
+        return [str(fila[-1]) for fila in filas]
+
+
+def vista_consultas_lentas(request):
+    """
+    GET /admin/consultas-lentas/
+    Peores consultas del buffer de este proceso (envuelta en admin_view).
+    """
+    try:
+        limite = max(1, int(request.GET.get('limite', 20)))
+    except ValueError:
+        limite = 20
+
+    return TemplateResponse(request, 'admin/consultas_lentas.html', {
+        **admin.site.each_context(request),
+        'title': 'Consultas lentas',
+        'umbral_ms': settings.CONSULTAS_LENTAS_UMBRAL_MS,
+        'capacidad': settings.CONSULTAS_LENTAS_MAX,
+        'total': len(consultas_lentas.entradas()),
+        'peores': consultas_lentas.peores(limite),
+    })
@@ -17,3 +17,15 @@ class PeriodoFinalizadoException(APIException):
     status_code = 400
     default_detail = 'No se pueden realizar cambios en un periodo finalizado.'
     default_code = 'periodo_finalizado'
+
+
+class ClaveIdempotenciaReutilizadaException(APIException):
+    status_code = 422
+    default_detail = 'La clave de idempotencia ya se usó con una petición distinta.'
+    default_code = 'clave_idempotencia_reutilizada'
+
+
+class PeticionEnProcesoException(APIException):
+    status_code = 409
+    default_detail = 'Hay una petición con la misma clave de idempotencia en proceso.'
+    default_code = 'peticion_en_proceso'
@@ -0,0 +1,178 @@
+"""
+Soporte para el header `Idempotency-Key` en endpoints de escritura.
+
+Un cliente que reintenta un POST/PUT/PATCH con la misma clave recibe la
+respuesta almacenada de la primera ejecución, sin volver a ejecutar
+validaciones ni escrituras.
+"""
+
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from apps.core.models import ClaveIdempotencia
+from common.exceptions import (
+    ClaveIdempotenciaReutilizadaException,
+    PeticionEnProcesoException
+)
+
+HEADER_IDEMPOTENCIA = 'Idempotency-Key'
+HEADER_REPETIDA = 'Idempotent-Replayed'
+
+
+def _calcular_huella(request):
+    """Huella de la petición: método, ruta y cuerpo en JSON canónico."""
+    cuerpo = json.dumps(request.data, sort_keys=True, default=str)
+    contenido = f"{request.method}\n{request.path}\n{cuerpo}"
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def _repetir_respuesta(registro):
+    """Construye la respuesta almacenada para un reintento."""
+    return Response(
+        json.loads(bytes(registro.respuesta)),
+        status=registro.status_code,
+        headers={HEADER_REPETIDA: 'true'}
+    )
+
+
+def _buscar(request, clave):
+    """Registro de la clave para el usuario de la petición, si existe."""
+    return ClaveIdempotencia.objects.filter(
+        usuario_id=request.user.pk,
+        clave=clave
+    ).first()
+
+
+def _responder_existente(registro, huella):
+    """Repite la respuesta de una clave ya reclamada o rechaza la petición."""
+    if registro.huella != huella:
+        raise ClaveIdempotenciaReutilizadaException()
+    if registro.status_code is None:
+        raise PeticionEnProcesoException()
+    return _repetir_respuesta(registro)
+
+
+def _tomar_reclamo_vencido(registro, ahora):
+    """
+    Reclama de nuevo una clave cuya ejecución no terminó dentro de
+    IDEMPOTENCY_PROCESSING_LEASE (p. ej. el worker murió a mitad de la
+    petición). El UPDATE condicionado al `reclamada_en` leído garantiza
+    que entre reintentos concurrentes solo uno la toma.
+
+    Returns:
+        True si esta petición tomó la clave
+    """
+    if registro.reclamada_en > ahora - settings.IDEMPOTENCY_PROCESSING_LEASE:
+        return False
+    tomada = ClaveIdempotencia.objects.filter(
+        pk=registro.pk,
+        status_code__isnull=True,
+        reclamada_en=registro.reclamada_en
+    ).update(reclamada_en=ahora)
+    if tomada:
+        registro.reclamada_en = ahora
+    return bool(tomada)
+
+
+def ejecutar_idempotente(request, clave, ejecutar):
+    """
+    Ejecuta `ejecutar()` una sola vez por (usuario, clave).
+
+    - Si la clave ya tiene respuesta vigente, la repite.
+    - Si la clave está en proceso (otra petición concurrente), responde 409;
+      pasado IDEMPOTENCY_PROCESSING_LEASE sin respuesta, la reclama de nuevo.
+    - Si la clave se usó con otra petición (otra huella), responde 422.
+    - Solo se almacenan respuestas 2xx; un error libera la clave para
+      que el cliente pueda reintentar.
+
+    La clave se reclama en una transacción propia y corta, antes de
+    ejecutar la vista: así las peticiones concurrentes ven la fila en
+    proceso y responden 409 en lugar de esperar al INSERT bloqueado.
+    """
+    if len(clave) > 255:
+        raise ValidationError({HEADER_IDEMPOTENCIA: 'La clave no puede exceder 255 caracteres.'})
+
+    ahora = timezone.now()
+    huella = _calcular_huella(request)
+
+    registro = _buscar(request, clave)
+
+    if registro and registro.expira_en <= ahora:
+        registro.delete()
+        registro = None
+
+    if registro:
+        tomada = (
+            registro.huella == huella
+            and registro.status_code is None
+            and _tomar_reclamo_vencido(registro, ahora)
+        )
+        if not tomada:
+            return _responder_existente(registro, huella)
+    else:
+        try:
+            with transaction.atomic():
+                registro = ClaveIdempotencia.objects.create(
+                    usuario_id=request.user.pk,
+                    clave=clave,
+                    huella=huella,
+                    reclamada_en=ahora,
+                    expira_en=ahora + settings.IDEMPOTENCY_KEY_TTL
+                )
+        except IntegrityError:
+            # Otra petición reclamó la clave entre la lectura y el INSERT
+            registro = _buscar(request, clave)
+            if registro is None:
+                raise PeticionEnProcesoException()
+            return _responder_existente(registro, huella)
+
+    # Si otra petición volvió a reclamar la clave (reclamo vencido), el
+    # resultado de esta ya no se guarda ni libera la clave
+    propia = ClaveIdempotencia.objects.filter(
+        pk=registro.pk,
+        reclamada_en=registro.reclamada_en
+    )
+
+    try:
+        response = ejecutar()
+    except Exception:
+        propia.delete()
+        raise
+
+    if 200 <= response.status_code < 300:
+        propia.update(
+            status_code=response.status_code,
+            respuesta=JSONRenderer().render(response.data)
+        )
+    else:
+        propia.delete()
+
+    return response
+
+
+def idempotente(metodo):
+    """
+    Decorador para métodos de ViewSet que aceptan `Idempotency-Key`.
+
+    Sin el header (o sin usuario autenticado) la petición se ejecuta
+    normalmente. No decorar `partial_update`: DRF lo resuelve llamando a `update`.
+    """
+    @wraps(metodo)
+    def envoltura(self, request, *args, **kwargs):
+        clave = request.headers.get(HEADER_IDEMPOTENCIA)
+        if not clave or not request.user.is_authenticated:
+            return metodo(self, request, *args, **kwargs)
+        return ejecutar_idempotente(
+            request,
+            clave,
+            lambda: metodo(self, request, *args, **kwargs)
+        )
+    return envoltura
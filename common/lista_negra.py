@@ -0,0 +1,138 @@
+"""
+Lista negra de refresh tokens con verificación en memoria.
+
+La tabla TokenRevocado es la fuente de verdad. Cada proceso mantiene un
+filtro de Bloom con los JTI revocados vigentes: si un JTI no está en el
+filtro no está revocado y no se consulta la base; solo un posible acierto
+(revocado o falso positivo) se confirma con una consulta por clave primaria.
+
+El filtro se sincroniza con las filas nuevas cada LISTA_NEGRA_SINCRONIZACION
+segundos y se reconstruye, sin los tokens ya expirados, cada
+LISTA_NEGRA_RECONSTRUCCION segundos. Un token revocado en otro proceso
+puede no estar aún en el filtro local, pero no puede reutilizarse para
+rotar: revocar() inserta su JTI y la clave primaria rechaza el segundo uso.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.core.models import TokenRevocado
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom sobre un bytearray: sin falsos negativos y con una tasa
+    de falsos positivos cercana a `error` mientras no se supere `capacidad`.
+    """
+
+    def __init__(self, capacidad, error=0.001):
+        capacidad = max(capacidad, 1)
+        self.bits = max(int(-capacidad * math.log(error) / (math.log(2) ** 2)), 8)
+        self.hashes = max(int(round(self.bits / capacidad * math.log(2))), 1)
+        self._datos = bytearray((self.bits + 7) // 8)
+
+    def _posiciones(self, valor):
+        # Doble hashing (Kirsch-Mitzenmacher) sobre un solo digest
+        digest = hashlib.blake2b(valor.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def agregar(self, valor):
+        for posicion in self._posiciones(valor):
+            self._datos[posicion >> 3] |= 1 << (posicion & 7)
+
+    def __contains__(self, valor):
+        return all(
+            self._datos[posicion >> 3] & (1 << (posicion & 7))
+            for posicion in self._posiciones(valor)
+        )
+
+
+class ListaNegraTokens:
+    """Verificación y registro de JTI revocados (ver docstring del módulo)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta el filtro; se reconstruye en la siguiente verificación."""
+        self._filtro = None
+        self._desde = None
+        self._sincronizar_en = 0.0
+        self._reconstruir_en = 0.0
+
+    def contiene(self, jti):
+        """True si el JTI está revocado."""
+        self._sincronizar()
+        if jti not in self._filtro:
+            return False
+        return TokenRevocado.objects.filter(jti=jti).exists()
+
+    def revocar(self, jti, exp):
+        """
+        Revoca un JTI hasta `exp` (timestamp del claim exp).
+
+        Returns:
+            False si ya estaba revocado (el token se usó antes)
+        """
+        try:
+            with transaction.atomic(using=TokenRevocado.objects.db):
+                TokenRevocado.objects.create(
+                    jti=jti,
+                    expira_en=datetime.fromtimestamp(exp, tz=dt_timezone.utc)
+                )
+        except IntegrityError:
+            return False
+
+        self._sincronizar()
+        self._filtro.agregar(jti)
+        return True
+
+    def _sincronizar(self):
+        ahora = time.monotonic()
+        if self._filtro is not None and ahora < self._sincronizar_en:
+            return
+
+        with self._lock:
+            if self._filtro is None or ahora >= self._reconstruir_en:
+                self._reconstruir(ahora)
+            elif ahora >= self._sincronizar_en:
+                self._cargar_nuevos(ahora)
+
+    def _reconstruir(self, ahora):
+        vigentes = TokenRevocado.objects.filter(expira_en__gt=timezone.now())
+        total = vigentes.count()
+        filtro = FiltroBloom(max(settings.LISTA_NEGRA_CAPACIDAD, total * 2))
+
+        marca = timezone.now()
+        for jti in vigentes.values_list('jti', flat=True).iterator(
+            chunk_size=settings.DB_ITERATOR_CHUNK_SIZE
+        ):
+            filtro.agregar(jti)
+
+        self._filtro = filtro
+        self._desde = marca
+        self._sincronizar_en = ahora + settings.LISTA_NEGRA_SINCRONIZACION
+        self._reconstruir_en = ahora + settings.LISTA_NEGRA_RECONSTRUCCION
+
+    def _cargar_nuevos(self, ahora):
+        # Ventana solapada: filas de transacciones que confirmaron tarde
+        marca = timezone.now()
+        desde = self._desde - timedelta(seconds=settings.LISTA_NEGRA_SINCRONIZACION)
+        for jti in TokenRevocado.objects.filter(created_at__gte=desde).values_list('jti', flat=True):
+            self._filtro.agregar(jti)
+
+        self._desde = marca
+        self._sincronizar_en = ahora + settings.LISTA_NEGRA_SINCRONIZACION
+
+
+lista_negra = ListaNegraTokens()
@@ -0,0 +1,182 @@
+"""
+Métricas por endpoint en formato de exposición de texto de Prometheus.
+
+MetricasMiddleware registra, por ruta de DRF (p. ej. 'carga-list',
+'periodo-estadisticas'), método y código de estado: número de peticiones,
+histograma de latencia, consultas y tiempo en base de datos, y bytes de
+respuesta. Se etiqueta con el nombre de la ruta y no con el path para que
+el número de series no crezca con los IDs.
+
+Cada hilo escribe solo en su propio registro, así que actualizar un
+contador no toma ningún candado; GET /metrics suma los registros de todos
+los hilos del proceso. Los registros de los hilos que terminaron se suman
+a un total compartido y se descartan, de modo que la memoria no crece con
+servidores que crean un hilo por petición. Con varios procesos (workers)
+cada uno expone los suyos, como es habitual en Prometheus.
+
+Con DEBUG=False, /metrics solo responde si METRICAS_TOKEN está definido.
+"""
+
+import hmac
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+PREFIJO = 'sistema_cargas'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Serie:
+    """Acumulados de una combinación de etiquetas en un hilo."""
+    __slots__ = ('peticiones', 'buckets', 'duracion', 'consultas', 'tiempo_db', 'bytes')
+
+    def __init__(self, n_buckets):
+        self.peticiones = 0
+        self.buckets = [0] * n_buckets
+        self.duracion = 0.0
+        self.consultas = 0
+        self.tiempo_db = 0.0
+        self.bytes = 0
+
+
+class RegistroMetricas:
+    """Registros por hilo de las series (ver docstring del módulo)."""
+
+    def __init__(self):
+        self._local = threading.local()
+        # El candado protege la lista de registros, no los contadores
+        self._lock = threading.Lock()
+        self._registros = {}
+        self._terminados = {}
+
+    def _series(self):
+        series = getattr(self._local, 'series', None)
+        if series is None:
+            series = self._local.series = {}
+            with self._lock:
+                self._recoger_terminados()
+                self._registros[threading.current_thread()] = series
+        return series
+
+    def _recoger_terminados(self):
+        """Pasa al total compartido los registros de hilos que ya terminaron."""
+        for hilo in [hilo for hilo in self._registros if not hilo.is_alive()]:
+            _sumar(self._terminados, self._registros.pop(hilo))
+
+    def registrar(self, ruta, metodo, estado, duracion, consultas, tiempo_db, tamano):
+        limites = settings.METRICAS_BUCKETS_LATENCIA
+        series = self._series()
+        clave = (ruta, metodo, str(estado))
+        serie = series.get(clave)
+        if serie is None:
+            serie = series[clave] = _Serie(len(limites) + 1)
+
+        serie.peticiones += 1
+        serie.buckets[bisect_left(limites, duracion)] += 1
+        serie.duracion += duracion
+        serie.consultas += consultas
+        serie.tiempo_db += tiempo_db
+        serie.bytes += tamano
+
+    def totales(self):
+        """Suma de las series de todos los hilos, por etiquetas."""
+        totales = {}
+        with self._lock:
+            self._recoger_terminados()
+            _sumar(totales, self._terminados)
+            for series in self._registros.values():
+                _sumar(totales, series)
+        return totales
+
+    def limpiar(self):
+        with self._lock:
+            for series in self._registros.values():
+                series.clear()
+            self._terminados.clear()
+
+    def exponer(self):
+        """Texto de exposición de Prometheus con las series acumuladas."""
+        limites = settings.METRICAS_BUCKETS_LATENCIA
+        totales = sorted(self.totales().items())
+        lineas = []
+
+        def metrica(nombre, tipo, ayuda):
+            lineas.append(f'# HELP {PREFIJO}_{nombre} {ayuda}')
+            lineas.append(f'# TYPE {PREFIJO}_{nombre} {tipo}')
+
+        metrica('http_requests_total', 'counter', 'Peticiones atendidas.')
+        for clave, serie in totales:
+            lineas.append(f'{PREFIJO}_http_requests_total{{{_etiquetas(clave)}}} {serie.peticiones}')
+
+        metrica('http_request_duration_seconds', 'histogram', 'Latencia de las peticiones.')
+        for clave, serie in totales:
+            etiquetas = _etiquetas(clave)
+            acumulado = 0
+            for limite, cantidad in zip(limites, serie.buckets):
+                acumulado += cantidad
+                lineas.append(
+                    f'{PREFIJO}_http_request_duration_seconds_bucket'
+                    f'{{{etiquetas},le="{limite}"}} {acumulado}'
+                )
+            lineas.append(
+                f'{PREFIJO}_http_request_duration_seconds_bucket'
+                f'{{{etiquetas},le="+Inf"}} {serie.peticiones}'
+            )
+            lineas.append(f'{PREFIJO}_http_request_duration_seconds_sum{{{etiquetas}}} {serie.duracion:.6f}')
+            lineas.append(f'{PREFIJO}_http_request_duration_seconds_count{{{etiquetas}}} {serie.peticiones}')
+
+        metrica('db_queries_total', 'counter', 'Consultas SQL ejecutadas.')
+        for clave, serie in totales:
+            lineas.append(f'{PREFIJO}_db_queries_total{{{_etiquetas(clave)}}} {serie.consultas}')
+
+        metrica('db_duration_seconds_total', 'counter', 'Tiempo en consultas SQL.')
+        for clave, serie in totales:
+            lineas.append(f'{PREFIJO}_db_duration_seconds_total{{{_etiquetas(clave)}}} {serie.tiempo_db:.6f}')
+
+        metrica('http_response_bytes_total', 'counter', 'Bytes de respuesta enviados.')
+        for clave, serie in totales:
+            lineas.append(f'{PREFIJO}_http_response_bytes_total{{{_etiquetas(clave)}}} {serie.bytes}')
+
+        return '\n'.join(lineas) + '\n'
+
+
+def _sumar(totales, series):
+    """Suma `series` (por etiquetas) sobre `totales`."""
+    for clave, serie in list(series.items()):
+        total = totales.get(clave)
+        if total is None:
+            total = totales[clave] = _Serie(len(serie.buckets))
+        total.peticiones += serie.peticiones
+        total.buckets = [a + b for a, b in zip(total.buckets, serie.buckets)]
+        total.duracion += serie.duracion
+        total.consultas += serie.consultas
+        total.tiempo_db += serie.tiempo_db
+        total.bytes += serie.bytes
+
+
+def _etiquetas(clave):
+    ruta, metodo, estado = clave
+    return f'ruta="{ruta}",metodo="{metodo}",estado="{estado}"'
+
+
+metricas = RegistroMetricas()
+
+
+def vista_metricas(request):
+    """
+    GET /metrics
+    Si METRICAS_TOKEN está definido exige `Authorization: Bearer <token>`;
+    sin él solo responde con DEBUG.
+    """
+    token = settings.METRICAS_TOKEN
+    if not settings.METRICAS_HABILITADAS or not (token or settings.DEBUG):
+        raise Http404
+
+    if token:
+        recibido = request.META.get('HTTP_AUTHORIZATION', '')
+        if not hmac.compare_digest(recibido, f'Bearer {token}'):
+            return HttpResponse(status=401)
+
+    return HttpResponse(metricas.exponer(), content_type=CONTENT_TYPE)
@@ -0,0 +1,191 @@
+"""
+Middleware compartido.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.http import JsonResponse
+
+from common import perfilado, trazas
+from common.consultas_lentas import MonitorConsultasLentas
+from common.metricas import metricas
+from common.routers import restaurar_alias_lectura, usar_alias_lectura
+
+METODOS_SEGUROS = ('GET', 'HEAD', 'OPTIONS')
+
+logger_trazas = logging.getLogger('trazas')
+
+
+class LecturaReplicaMiddleware:
+    """
+    Dirige las lecturas de las peticiones GET/HEAD/OPTIONS a la réplica.
+
+    Tras una escritura, el mismo cliente (identificado por un hash de su
+    header Authorization, o su IP si no lo envía) lee del primario durante
+    REPLICA_STICKY_SECONDS para no ver datos anteriores a su propio cambio.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'LECTURAS_EN_REPLICA', False):
+            return self.get_response(request)
+
+        clave = self._clave_cliente(request)
+
+        if request.method in METODOS_SEGUROS:
+            alias = None if cache.get(clave) else settings.REPLICA_ALIAS
+            token = usar_alias_lectura(alias)
+            try:
+                return self.get_response(request)
+            finally:
+                restaurar_alias_lectura(token)
+
+        response = self.get_response(request)
+        if response.status_code < 500:
+            cache.set(clave, True, timeout=settings.REPLICA_STICKY_SECONDS)
+        return response
+
+    @staticmethod
+    def _clave_cliente(request):
+        identidad = (
+            request.META.get('HTTP_AUTHORIZATION')
+            or request.META.get('REMOTE_ADDR', '')
+        )
+        huella = hashlib.sha256(identidad.encode()).hexdigest()
+        return f'replica:primario:{huella}'
+
+
+class MetricasMiddleware:
+    """
+    Registra en common.metricas la latencia, las consultas SQL (de todas las
+    bases), su tiempo y el tamaño de la respuesta de cada petición,
+    etiquetadas con el nombre de la ruta resuelta ('carga-list',
+    'periodo-estadisticas'...). Debe ir primero en MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICAS_HABILITADAS:
+            return self.get_response(request)
+
+        medicion = _MedicionConsultas()
+        inicio = time.perf_counter()
+        with ExitStack() as pila:
+            for conexion in connections.all():
+                pila.enter_context(conexion.execute_wrapper(medicion))
+            response = self.get_response(request)
+        duracion = time.perf_counter() - inicio
+
+        match = getattr(request, 'resolver_match', None)
+        ruta = (match.url_name if match else None) or 'sin_ruta'
+        tamano = 0 if response.streaming else len(response.content)
+
+        metricas.registrar(
+            ruta,
+            request.method,
+            response.status_code,
+            duracion,
+            medicion.consultas,
+            medicion.tiempo,
+            tamano
+        )
+        return response
+
+
+class ConsultasLentasMiddleware:
+    """
+    Instala MonitorConsultasLentas en todas las bases durante la petición
+    (ver common.consultas_lentas).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.CONSULTAS_LENTAS_HABILITADAS:
+            return self.get_response(request)
+
+        monitor = MonitorConsultasLentas(request)
+        with ExitStack() as pila:
+            for conexion in connections.all():
+                pila.enter_context(conexion.execute_wrapper(monitor))
+            return self.get_response(request)
+
+
+class TrazasMiddleware:
+    """
+    Con TRAZAS_HABILITADAS abre una traza de common.trazas por petición y
+    cuenta sus consultas en todas las bases. Al terminar escribe el árbol
+    en JSON en el logger 'trazas' y, con DEBUG y el header X-Traza en la
+    petición, lo devuelve en el header X-Traza de la respuesta.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.TRAZAS_HABILITADAS:
+            return self.get_response(request)
+
+        with trazas.traza_peticion(request.method) as traza:
+            with ExitStack() as pila:
+                for conexion in connections.all():
+                    pila.enter_context(conexion.execute_wrapper(traza))
+                response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        traza.raiz.nombre = f'{request.method} {(match.view_name if match else None) or request.path}'
+        traza.raiz.atributos['status_code'] = response.status_code
+        contenido = json.dumps(traza.como_dict(), separators=(',', ':'))
+
+        if traza.raiz.duracion_ms >= settings.TRAZAS_UMBRAL_MS:
+            logger_trazas.info(contenido)
+        if settings.DEBUG and trazas.HEADER in request.headers:
+            response[trazas.HEADER] = contenido
+        return response
+
+
+class PerfiladoMiddleware:
+    """
+    Con `?_profile=cprofile` (PERFILADO_HABILITADO, usuario staff o
+    responsable de unidad) responde con el informe de common.perfilado en
+    lugar del contenido. Para cualquier otro usuario el parámetro se ignora.
+    Va después de AuthenticationMiddleware para reconocer la sesión.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not perfilado.solicitado(request) or not perfilado.usuario_autorizado(request):
+            return self.get_response(request)
+
+        _, informe = perfilado.perfilar(lambda: self.get_response(request))
+        return JsonResponse(informe)
+
+
+class _MedicionConsultas:
+    """execute_wrapper que cuenta consultas y acumula su duración."""
+
+    def __init__(self):
+        self.consultas = 0
+        self.tiempo = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas += 1
+            self.tiempo += time.perf_counter() - inicio
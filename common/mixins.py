@@ -0,0 +1,50 @@
+"""
+Mixins compartidos para ViewSets.
+"""
+
+from common.alcance import alcance_de_peticion
+from common.routers import activar_unidad, restaurar_unidad
+
+
+class AlcanceMixin:
+    """
+    Resuelve el Alcance del usuario una vez por petición, justo después de
+    autenticar, y restringe get_queryset() con él.
+
+    Cada ViewSet declara los lookups hasta el ID de la unidad y, si aplica,
+    del programa de sus objetos (ver Alcance.filtro).
+    """
+    campo_unidad = None
+    campo_programa = None
+
+    def perform_authentication(self, request):
+        super().perform_authentication(request)
+        alcance_de_peticion(request)
+
+    @property
+    def alcance(self):
+        return alcance_de_peticion(self.request)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.campo_unidad is None:
+            return queryset
+        return queryset.filter(self.alcance.filtro(self.campo_unidad, self.campo_programa))
+
+
+class ShardUnidadMixin:
+    """
+    Activa el shard de la unidad del usuario autenticado durante la petición
+    (ver UnidadShardRouter). Sin SHARDING_POR_UNIDAD el router lo ignora.
+    """
+
+    def perform_authentication(self, request):
+        super().perform_authentication(request)
+        self._token_unidad = activar_unidad(alcance_de_peticion(request).unidad_id)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_token_unidad', None)
+        if token is not None:
+            restaurar_unidad(token)
+            self._token_unidad = None
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,166 @@
+"""
+Perfilado bajo demanda de una petición con `?_profile=cprofile`.
+
+Solo con PERFILADO_HABILITADO y para usuarios staff o responsables de
+unidad (ver PerfiladoMiddleware). La petición se ejecuta bajo cProfile y
+cada consulta SQL se registra con su duración y la pila de llamadas del
+proyecto que la emitió; la respuesta se sustituye por el informe en JSON,
+con el código de estado original en `status_code`.
+
+Sirve para ver en producción, p. ej., las N+1 del PeriodoSerializer
+anidado en el listado de cargas: las consultas repetidas comparten pila.
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import time
+import traceback
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+PARAMETRO = '_profile'
+MODO_CPROFILE = 'cprofile'
+
+# Instrumentación (middlewares y execute_wrappers): no aporta a la pila
+_OMITIR = (
+    'common/middleware.py',
+    'common/perfilado.py',
+    'common/consultas_lentas.py',
+    'common/trazas.py',
+)
+
+
+class _RegistroConsultas:
+    """execute_wrapper que guarda SQL, duración y pila de cada consulta."""
+
+    def __init__(self):
+        self.consultas = []
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas.append({
+                'sql': sql,
+                'duracion_ms': round((time.perf_counter() - inicio) * 1000, 3),
+                'alias': context['connection'].alias,
+                'pila': pila_llamadas(),
+            })
+
+
+def pila_llamadas():
+    """
+    Pila de la consulta en curso (llamar desde un execute_wrapper): marcos
+    del proyecto sin instrumentación, del más externo al más interno, más
+    el marco que llamó al ORM si está en una dependencia (p. ej. la
+    paginación de DRF en un listado genérico). Devuelve los últimos
+    PERFILADO_PROFUNDIDAD_PILA como 'archivo:línea función'.
+    """
+    raiz = os.path.join(str(settings.BASE_DIR), '')
+
+    def del_proyecto(archivo):
+        return archivo.startswith(raiz) and 'site-packages' not in archivo
+
+    marcos = [
+        (marco, os.path.relpath(marco.filename, raiz).replace(os.sep, '/'))
+        for marco in traceback.extract_stack()
+    ]
+    # Descartar el ORM y los execute_wrappers, del más interno hacia fuera
+    while marcos and ('/django/db/' in marcos[-1][0].filename.replace(os.sep, '/')
+                      or marcos[-1][1] in _OMITIR):
+        marcos.pop()
+
+    pila = [
+        f'{archivo}:{marco.lineno} {marco.name}'
+        for marco, archivo in marcos
+        if del_proyecto(marco.filename) and archivo not in _OMITIR
+    ]
+    if marcos and not del_proyecto(marcos[-1][0].filename):
+        marco = marcos[-1][0]
+        archivo = marco.filename.replace(os.sep, '/').split('site-packages/', 1)[-1]
+        pila.append(f'{archivo}:{marco.lineno} {marco.name}')
+    return pila[-settings.PERFILADO_PROFUNDIDAD_PILA:]
+
+
+def solicitado(request):
+    return settings.PERFILADO_HABILITADO and request.GET.get(PARAMETRO) == MODO_CPROFILE
+
+
+def usuario_autorizado(request):
+    """
+    Usuario de la sesión o, si no hay, del token (con las clases de
+    autenticación de DRF); True si es staff o responsable de unidad.
+    """
+    from apps.core.models import Usuario
+
+    usuario = getattr(request, 'user', None)
+    if usuario is None or not usuario.is_authenticated:
+        usuario = None
+        peticion = Request(request)
+        for clase in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+            try:
+                resultado = clase().authenticate(peticion)
+            except APIException:
+                return False
+            if resultado is not None:
+                usuario = resultado[0]
+                break
+
+    if usuario is None:
+        return False
+    # rol sale de los claims del token; is_staff puede requerir cargar el usuario
+    return getattr(usuario, 'rol', None) == Usuario.Rol.RESP_UNIDAD or bool(usuario.is_staff)
+
+
+def perfilar(ejecutar):
+    """
+    Ejecuta `ejecutar()` (la petición) bajo cProfile registrando su SQL.
+
+    Returns:
+        (response, informe)
+    """
+    registro = _RegistroConsultas()
+    perfil = cProfile.Profile()
+    inicio = time.perf_counter()
+
+    with ExitStack() as pila:
+        for conexion in connections.all():
+            pila.enter_context(conexion.execute_wrapper(registro))
+        perfil.enable()
+        try:
+            response = ejecutar()
+        finally:
+            perfil.disable()
+
+    duracion = time.perf_counter() - inicio
+    return response, {
+        'status_code': response.status_code,
+        'duracion_ms': round(duracion * 1000, 3),
+        'funciones': _funciones(perfil),
+        'total_consultas': len(registro.consultas),
+        'tiempo_db_ms': round(sum(c['duracion_ms'] for c in registro.consultas), 3),
+        'consultas': registro.consultas,
+    }
+
+
+def _funciones(perfil):
+    """Las PERFILADO_MAX_FUNCIONES funciones con más tiempo acumulado."""
+    estadisticas = pstats.Stats(perfil, stream=sys.stderr).stats
+    filas = sorted(estadisticas.items(), key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            'funcion': f'{archivo}:{linea}({nombre})',
+            'llamadas': llamadas,
+            'tiempo_propio_ms': round(propio * 1000, 3),
+            'tiempo_acumulado_ms': round(acumulado * 1000, 3),
+        }
+        for (archivo, linea, nombre), (_, llamadas, propio, acumulado, _) in filas[:settings.PERFILADO_MAX_FUNCIONES]
+    ]
@@ -0,0 +1,53 @@
+"""
+Runner de tests del proyecto (TEST_RUNNER).
+
+Reinicia antes de cada test el estado en memoria del proceso que, de otro
+modo, pasaría de un test al siguiente: las cubetas de common.throttles.
+Así ningún test depende del orden de ejecución ni tiene que limpiarlas en
+su setUp. También aplica a los procesos de `manage.py test --parallel`.
+"""
+
+import unittest
+
+from django.test.runner import (
+    DiscoverRunner,
+    ParallelTestSuite,
+    RemoteTestResult,
+    RemoteTestRunner
+)
+
+from common.throttles import cubetas
+
+
+def reiniciar_estado_en_memoria():
+    """Vacía el estado por proceso compartido entre tests."""
+    cubetas.limpiar()
+
+
+class _ReinicioPorTest:
+    """Mezcla para resultados de unittest: reinicia el estado al empezar cada test."""
+
+    def startTest(self, test):
+        reiniciar_estado_en_memoria()
+        super().startTest(test)
+
+
+class _ResultadoRemoto(_ReinicioPorTest, RemoteTestResult):
+    pass
+
+
+class _RunnerRemoto(RemoteTestRunner):
+    resultclass = _ResultadoRemoto
+
+
+class _SuiteParalela(ParallelTestSuite):
+    runner_class = _RunnerRemoto
+
+
+class RunnerPruebas(DiscoverRunner):
+    """DiscoverRunner que aísla el estado en memoria entre tests."""
+    parallel_test_suite = _SuiteParalela
+
+    def get_resultclass(self):
+        base = super().get_resultclass() or unittest.TextTestResult
+        return type(base.__name__, (_ReinicioPorTest, base), {})
@@ -0,0 +1,178 @@
+"""
+Routers de base de datos.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Apps cuyos datos se particionan por UnidadAcademica. El catálogo (core:
+# usuarios, unidades, programas) y los jobs viven siempre en el primario.
+APPS_POR_UNIDAD = ('academico', 'asignaciones')
+
+PREFIJO_SHARD = 'unidad_'
+
+# Unidad del usuario autenticado en la petición en curso (None = sin shard).
+# La fija ShardUnidadMixin tras autenticar.
+_unidad_actual = ContextVar('unidad_actual', default=None)
+
+# Alias de lectura para la petición en curso (None = primario).
+# Lo fija LecturaReplicaMiddleware solo en peticiones de lectura.
+_alias_lectura = ContextVar('alias_lectura', default=None)
+
+
+def usar_alias_lectura(alias):
+    """
+    Fija el alias de lectura del contexto actual.
+
+    Returns:
+        Token para restaurar el valor anterior con restaurar_alias_lectura()
+    """
+    return _alias_lectura.set(alias)
+
+
+def restaurar_alias_lectura(token):
+    _alias_lectura.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Envía las lecturas a la réplica cuando la petición en curso lo permite.
+
+    Las escrituras (y todo lo que ocurre fuera de una petición de lectura:
+    validaciones de POST/PUT/PATCH/DELETE, jobs, comandos) van al primario.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _alias_lectura.get()
+        if alias and getattr(settings, 'LECTURAS_EN_REPLICA', False):
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primario y réplica contienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica recibe el esquema por replicación (o es el mismo archivo)
+        return db == 'default'
+
+
+def activar_unidad(unidad_id):
+    """
+    Fija la unidad (shard) del contexto actual.
+
+    Returns:
+        Token para restaurar el valor anterior con restaurar_unidad()
+    """
+    return _unidad_actual.set(unidad_id)
+
+
+def restaurar_unidad(token):
+    _unidad_actual.reset(token)
+
+
+@contextmanager
+def en_unidad(unidad_id):
+    """Ejecuta el bloque con las lecturas/escrituras en el shard de la unidad."""
+    token = activar_unidad(unidad_id)
+    try:
+        yield
+    finally:
+        restaurar_unidad(token)
+
+
+def es_alias_shard(alias):
+    return alias.startswith(PREFIJO_SHARD)
+
+
+def configuracion_shard(unidad_id):
+    """
+    Configuración de DATABASES para el shard de una unidad: la de
+    settings.DATABASE_SHARDS si existe, si no un archivo SQLite en SHARDS_DIR.
+    """
+    configuracion = settings.DATABASE_SHARDS.get(unidad_id)
+    if configuracion:
+        return dict(configuracion)
+
+    primaria = connections.settings[DEFAULT_DB_ALIAS]
+    if primaria['ENGINE'] != 'django.db.backends.sqlite3':
+        raise ImproperlyConfigured(
+            f'No hay shard configurado en DATABASE_SHARDS para la unidad {unidad_id}'
+        )
+    return {
+        'ENGINE': primaria['ENGINE'],
+        'NAME': str(Path(settings.SHARDS_DIR) / f'{PREFIJO_SHARD}{unidad_id}.sqlite3'),
+        'OPTIONS': dict(primaria.get('OPTIONS', {})),
+    }
+
+
+def shard_existe(unidad_id):
+    """True si el shard de la unidad está configurado o ya fue creado."""
+    if unidad_id in settings.DATABASE_SHARDS:
+        return True
+    return Path(configuracion_shard(unidad_id)['NAME']).exists()
+
+
+def alias_shard(unidad_id):
+    """
+    Devuelve el alias del shard de una unidad, registrándolo en
+    `connections` la primera vez que se usa.
+    """
+    alias = f'{PREFIJO_SHARD}{unidad_id}'
+    if alias not in connections.settings:
+        # configure_settings completa los valores por defecto (TIME_ZONE, TEST...)
+        configuradas = connections.configure_settings({
+            DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+            alias: configuracion_shard(unidad_id),
+        })
+        connections.settings[alias] = configuradas[alias]
+    return alias
+
+
+class UnidadShardRouter:
+    """
+    Con SHARDING_POR_UNIDAD, envía los modelos de APPS_POR_UNIDAD al shard de
+    la unidad activa (lecturas y escrituras). Sin unidad activa (superusuario,
+    comandos, migraciones) no decide y se usa el primario.
+
+    Los shards tienen el esquema completo para que las FK al catálogo
+    (unidad, programas) se cumplan; dividir_por_unidad copia ese catálogo.
+    """
+
+    def _alias(self, model, hints):
+        if model._meta.app_label not in APPS_POR_UNIDAD:
+            return None
+        if not getattr(settings, 'SHARDING_POR_UNIDAD', False):
+            return None
+
+        # Objetos relacionados se leen de la misma base que su instancia
+        instancia = hints.get('instance')
+        if instancia is not None and instancia._state.db and es_alias_shard(instancia._state.db):
+            return instancia._state.db
+
+        unidad_id = _unidad_actual.get()
+        if unidad_id is None:
+            return None
+        return alias_shard(unidad_id)
+
+    def db_for_read(self, model, **hints):
+        return self._alias(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._alias(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if es_alias_shard(db):
+            return True
+        return None
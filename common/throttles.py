@@ -0,0 +1,132 @@
+"""
+Throttling por cubetas de tokens para los endpoints costosos.
+
+Cada petición a una acción costosa consume THROTTLE_COSTOS[accion] tokens
+(1 si la acción no aparece) de dos cubetas:
+- CubetaUsuarioThrottle: una por usuario, compartida por todas las acciones
+  costosas; frena a un cliente que sondea estos endpoints.
+- CubetaEndpointThrottle: una por acción, compartida por todos los usuarios;
+  acota la carga total que un endpoint puede poner sobre los workers.
+
+La capacidad y la recarga salen de DEFAULT_THROTTLE_RATES con el formato
+de DRF ('120/min' = cubeta de 120 tokens que se recarga por completo en un
+minuto). Las cubetas viven en memoria del proceso: con varios workers cada
+uno aplica su propio límite. Al rechazar, DRF responde 429 con Retry-After.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class _Cubetas:
+    """
+    Cubetas de tokens en proceso, por clave, con un candado para que leer,
+    recargar y consumir sea una sola operación atómica. Guarda como mucho
+    THROTTLE_MAX_CUBETAS; descarta primero las usadas hace más tiempo (que,
+    inactivas, ya estarían llenas).
+    """
+
+    def __init__(self):
+        self._cubetas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consumir(self, clave, costo, capacidad, recarga):
+        """
+        Consume `costo` tokens de la cubeta `clave`.
+
+        Args:
+            clave: Identificador de la cubeta
+            costo: Tokens que consume la petición
+            capacidad: Tokens de una cubeta llena
+            recarga: Tokens recuperados por segundo
+
+        Returns:
+            0 si se consumieron, o los segundos hasta tener tokens suficientes
+        """
+        costo = min(costo, capacidad)
+        ahora = time.monotonic()
+        with self._lock:
+            tokens, instante = self._cubetas.pop(clave, (capacidad, ahora))
+            tokens = min(capacidad, tokens + (ahora - instante) * recarga)
+
+            espera = 0
+            if tokens >= costo:
+                tokens -= costo
+            else:
+                espera = (costo - tokens) / recarga
+
+            self._cubetas[clave] = (tokens, ahora)
+            while len(self._cubetas) > settings.THROTTLE_MAX_CUBETAS:
+                self._cubetas.popitem(last=False)
+            return espera
+
+    def limpiar(self):
+        with self._lock:
+            self._cubetas.clear()
+
+
+cubetas = _Cubetas()
+
+
+class CubetaThrottle(SimpleRateThrottle):
+    """
+    Base de los throttles por cubeta. Las subclases definen `scope` y
+    get_cache_key(); la tasa del scope da capacidad y recarga.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        clave = self.get_cache_key(request, view)
+        if clave is None:
+            return True
+
+        capacidad, duracion = self.num_requests, self.duration
+        self.espera = cubetas.consumir(
+            clave,
+            self.costo(view),
+            capacidad,
+            capacidad / duracion
+        )
+        return self.espera == 0
+
+    def wait(self):
+        return self.espera
+
+    @staticmethod
+    def costo(view):
+        """Tokens que consume la acción de la vista (THROTTLE_COSTOS)."""
+        return settings.THROTTLE_COSTOS.get(getattr(view, 'action', None), 1)
+
+    @staticmethod
+    def endpoint(view):
+        return f"{getattr(view, 'basename', type(view).__name__)}.{getattr(view, 'action', None)}"
+
+
+class CubetaUsuarioThrottle(CubetaThrottle):
+    """Cubeta por usuario (o por IP si no está autenticado)."""
+    scope = 'costoso_usuario'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class CubetaEndpointThrottle(CubetaThrottle):
+    """Cubeta por acción, compartida por todos los usuarios."""
+    scope = 'costoso_endpoint'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.endpoint(view)}
+
+
+# throttle_classes de las acciones costosas
+THROTTLES_COSTOSOS = [CubetaUsuarioThrottle, CubetaEndpointThrottle]
@@ -0,0 +1,184 @@
+"""
+Trazas por petición: árbol de tramos de la capa de servicios.
+
+Con TRAZAS_HABILITADAS, TrazasMiddleware abre una traza por petición y
+cuenta sus consultas SQL. Los métodos decorados con @trazar (validadores,
+PeriodoService y validate/create/update de los serializers de escritura de
+cargas) abren un tramo hijo del tramo en curso que registra su duración,
+las consultas hechas dentro (incluidas las de sus hijos) y atributos
+tomados de los argumentos: profesor_id, periodo_id, carga_id, num_bloques...
+
+Al terminar la petición la traza se escribe en JSON en el logger 'trazas'
+(si dura al menos TRAZAS_UMBRAL_MS) y, con DEBUG y el header `X-Traza` en
+la petición, se devuelve también en el header `X-Traza` de la respuesta.
+
+Sin traza activa @trazar solo consulta una ContextVar. A partir de
+TRAZAS_MAX_TRAMOS los tramos se miden igual (su tiempo queda en el padre)
+pero no se agregan al árbol; se cuentan en `tramos_omitidos`.
+"""
+
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+HEADER = 'X-Traza'
+
+_traza_actual = ContextVar('traza_actual', default=None)
+
+# Argumentos que identifican un modelo: se reportan como <nombre>_id
+_MODELOS = ('profesor', 'periodo', 'carga', 'materia', 'programa_academico')
+# Argumentos con una colección: se reporta num_<nombre>
+_COLECCIONES = ('bloques', 'cargas', 'cambios')
+# Diccionarios de datos de los serializers: se inspeccionan sus claves
+_DATOS = ('data', 'attrs', 'validated_data')
+
+
+class Tramo:
+    """Un nodo del árbol: nombre, atributos, duración y consultas."""
+    __slots__ = ('nombre', 'atributos', 'inicio', 'duracion_ms', 'consultas', 'hijos')
+
+    def __init__(self, nombre, atributos=None):
+        self.nombre = nombre
+        self.atributos = atributos or {}
+        self.inicio = time.perf_counter()
+        self.duracion_ms = 0.0
+        self.consultas = 0
+        self.hijos = []
+
+    def como_dict(self):
+        tramo = {
+            'nombre': self.nombre,
+            'duracion_ms': round(self.duracion_ms, 3),
+            'consultas': self.consultas,
+        }
+        if self.atributos:
+            tramo['atributos'] = self.atributos
+        if self.hijos:
+            tramo['hijos'] = [hijo.como_dict() for hijo in self.hijos]
+        return tramo
+
+
+class Traza:
+    """Traza de una petición: tramo raíz, pila de tramos abiertos y consultas."""
+
+    def __init__(self, nombre):
+        self.raiz = Tramo(nombre)
+        self._pila = [self.raiz]
+        self.consultas = 0
+        self.tramos = 1
+        self.tramos_omitidos = 0
+
+    def abrir(self, nombre, atributos):
+        tramo = Tramo(nombre, atributos)
+        if self.tramos < settings.TRAZAS_MAX_TRAMOS:
+            self._pila[-1].hijos.append(tramo)
+            self.tramos += 1
+        else:
+            self.tramos_omitidos += 1
+        tramo.consultas = self.consultas
+        self._pila.append(tramo)
+        return tramo
+
+    def cerrar(self, tramo):
+        tramo.duracion_ms = (time.perf_counter() - tramo.inicio) * 1000
+        tramo.consultas = self.consultas - tramo.consultas
+        self._pila.pop()
+
+    def terminar(self):
+        self.raiz.duracion_ms = (time.perf_counter() - self.raiz.inicio) * 1000
+        self.raiz.consultas = self.consultas
+
+    def como_dict(self):
+        traza = self.raiz.como_dict()
+        if self.tramos_omitidos:
+            traza['tramos_omitidos'] = self.tramos_omitidos
+        return traza
+
+    def __call__(self, execute, sql, params, many, context):
+        """execute_wrapper: cuenta las consultas de la petición."""
+        self.consultas += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def traza_peticion(nombre):
+    """Activa una traza nueva para el contexto actual (la petición)."""
+    traza = Traza(nombre)
+    token = _traza_actual.set(traza)
+    try:
+        yield traza
+    finally:
+        traza.terminar()
+        _traza_actual.reset(token)
+
+
+@contextmanager
+def tramo(nombre, **atributos):
+    """Tramo hijo del tramo en curso; no hace nada sin traza activa."""
+    traza = _traza_actual.get()
+    if traza is None:
+        yield None
+        return
+    actual = traza.abrir(nombre, atributos)
+    try:
+        yield actual
+    finally:
+        traza.cerrar(actual)
+
+
+def trazar(funcion):
+    """
+    Decorador: ejecuta la función dentro de un tramo '<Clase>.<método>'
+    con los atributos que se pueden extraer de sus argumentos. Aplicarlo
+    debajo de @staticmethod.
+    """
+    nombre = funcion.__qualname__
+    firma = inspect.signature(funcion)
+
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        traza = _traza_actual.get()
+        if traza is None:
+            return funcion(*args, **kwargs)
+
+        try:
+            argumentos = firma.bind(*args, **kwargs).arguments
+        except TypeError:
+            argumentos = {}
+        actual = traza.abrir(nombre, atributos_de(argumentos))
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            traza.cerrar(actual)
+
+    return envoltura
+
+
+def atributos_de(argumentos):
+    """
+    Atributos de un tramo a partir de los argumentos de la llamada. No
+    evalúa querysets: las colecciones solo se cuentan si son listas o tuplas.
+    """
+    atributos = {}
+    for nombre, valor in argumentos.items():
+        if valor is None:
+            continue
+        if nombre in _DATOS and isinstance(valor, dict):
+            atributos.update(atributos_de(valor))
+        elif nombre == 'instance':
+            atributos['id'] = getattr(valor, 'pk', None)
+        elif nombre in _MODELOS:
+            atributos[f'{nombre}_id'] = getattr(valor, 'pk', valor)
+            if nombre == 'carga':
+                for campo in ('profesor_id', 'periodo_id'):
+                    if getattr(valor, campo, None) is not None:
+                        atributos.setdefault(campo, getattr(valor, campo))
+        elif nombre.endswith('_id') and isinstance(valor, int):
+            atributos[nombre] = valor
+        elif nombre in _COLECCIONES and isinstance(valor, (list, tuple)):
+            atributos[f'num_{nombre}'] = len(valor)
+    return atributos
@@ -6,6 +6,8 @@ from pathlib import Path
 from datetime import timedelta
 from decouple import config
 
+from common.db import configuracion_desde_url, configuracion_replica
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -33,17 +35,23 @@ LOCAL_APPS = [
     'apps.core',
     'apps.academico',
     'apps.asignaciones',
+    'apps.jobs',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'common.middleware.MetricasMiddleware',
+    'common.middleware.ConsultasLentasMiddleware',
+    'common.middleware.TrazasMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'common.middleware.LecturaReplicaMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'common.middleware.PerfiladoMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -69,13 +77,77 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Por defecto SQLite; con DATABASE_URL (p. ej. postgres://...) se usa esa base
+# con conexiones persistentes. DB_DISABLE_SERVER_SIDE_CURSORS=True si hay un
+# pgbouncer en modo transacción delante de PostgreSQL.
+DATABASE_URL = config('DATABASE_URL', default='')
+
+if DATABASE_URL:
+    DATABASES = {
+        'default': configuracion_desde_url(
+            DATABASE_URL,
+            conn_max_age=config('DB_CONN_MAX_AGE', default=60, cast=int),
+            conn_health_checks=config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+            disable_server_side_cursors=config(
+                'DB_DISABLE_SERVER_SIDE_CURSORS', default=False, cast=bool
+            ),
+        )
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
     }
+
+# Réplica de lectura: con LECTURAS_EN_REPLICA las peticiones GET/HEAD/OPTIONS
+# leen del alias 'replica' (DATABASE_REPLICA_URL, o una segunda conexión de
+# solo lectura a la base primaria). Tras una escritura, el cliente lee del
+# primario durante REPLICA_STICKY_SECONDS (la marca se guarda en la caché;
+# con varios workers debe ser una caché compartida).
+DATABASE_REPLICA_URL = config('DATABASE_REPLICA_URL', default='')
+DATABASES['replica'] = configuracion_replica(
+    DATABASES['default'],
+    DATABASE_REPLICA_URL,
+    conn_max_age=config('DB_CONN_MAX_AGE', default=60, cast=int),
+    conn_health_checks=config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+)
+LECTURAS_EN_REPLICA = config(
+    'LECTURAS_EN_REPLICA', default=bool(DATABASE_REPLICA_URL), cast=bool
+)
+REPLICA_ALIAS = 'replica'
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=5, cast=int)
+
+# Sharding por unidad: con SHARDING_POR_UNIDAD los datos de academico y
+# asignaciones de cada UnidadAcademica viven en su propia base (alias
+# unidad_<id>). Por defecto un archivo SQLite en SHARDS_DIR; DATABASE_SHARDS
+# permite fijar la URL de cada unidad: "1=postgres://...;2=postgres://...".
+# Los shards se crean y pueblan con `python manage.py dividir_por_unidad`.
+SHARDING_POR_UNIDAD = config('SHARDING_POR_UNIDAD', default=False, cast=bool)
+SHARDS_DIR = config('SHARDS_DIR', default=str(BASE_DIR / 'shards'))
+DATABASE_SHARDS = {
+    int(unidad): configuracion_desde_url(url.strip())
+    for unidad, url in (
+        entrada.split('=', 1)
+        for entrada in config('DATABASE_SHARDS', default='').split(';')
+        if entrada.strip()
+    )
 }
 
+DATABASE_ROUTERS = [
+    'common.routers.UnidadShardRouter',
+    'common.routers.ReplicaRouter',
+]
+
+# Tamaño de lote al recorrer querysets grandes con .iterator()
+# (en PostgreSQL se lee con un cursor del lado del servidor)
+DB_ITERATOR_CHUNK_SIZE = config('DB_ITERATOR_CHUNK_SIZE', default=2000, cast=int)
+
+# PRAGMAs aplicados a cada conexión SQLite (ver common.db.configurar_sqlite).
+# Vacío en desarrollo; production.py define el perfil ajustado.
+SQLITE_PRAGMAS = {}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -110,7 +182,8 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication que no consulta el usuario en peticiones de lectura
+        'common.autenticacion.JWTLecturaSinEstadoAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -119,8 +192,56 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'common.pagination.StandardResultsSetPagination',
     'PAGE_SIZE': 20,
+    # Cubetas de tokens de las acciones costosas (common.throttles)
+    'DEFAULT_THROTTLE_RATES': {
+        'costoso_usuario': config('THROTTLE_COSTOSO_USUARIO', default='120/min'),
+        'costoso_endpoint': config('THROTTLE_COSTOSO_ENDPOINT', default='1200/min'),
+    },
 }
 
+# Tokens que consume cada acción costosa (1 si no aparece) y máximo de
+# cubetas que cada proceso mantiene en memoria
+THROTTLE_COSTOS = {
+    'validar_disponibilidad': 4,
+    'validar': 4,
+    'estadisticas': 4,
+    'cargas_problematicas': 4,
+    'simular': 10,
+    'actualizar_lote': 10,
+    'eliminar_lote': 10,
+}
+THROTTLE_MAX_CUBETAS = config('THROTTLE_MAX_CUBETAS', default=10000, cast=int)
+
+# Runner de tests: reinicia las cubetas en memoria antes de cada test
+TEST_RUNNER = 'common.pruebas.RunnerPruebas'
+
+# Métricas por endpoint en GET /metrics (common.metricas). Con
+# METRICAS_TOKEN definido se exige 'Authorization: Bearer <token>'; sin
+# él /metrics solo responde con DEBUG
+METRICAS_HABILITADAS = config('METRICAS_HABILITADAS', default=True, cast=bool)
+METRICAS_TOKEN = config('METRICAS_TOKEN', default='')
+METRICAS_BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# ?_profile=cprofile (common.perfilado): desactivado por defecto; cuántas
+# funciones incluir en el informe y cuántos marcos de pila por consulta
+PERFILADO_HABILITADO = config('PERFILADO_HABILITADO', default=False, cast=bool)
+PERFILADO_MAX_FUNCIONES = config('PERFILADO_MAX_FUNCIONES', default=40, cast=int)
+PERFILADO_PROFUNDIDAD_PILA = config('PERFILADO_PROFUNDIDAD_PILA', default=8, cast=int)
+
+# Consultas lentas (common.consultas_lentas): umbral en ms, tamaño del
+# buffer circular (y de planes guardados) y si se obtiene el plan con EXPLAIN
+CONSULTAS_LENTAS_HABILITADAS = config('CONSULTAS_LENTAS_HABILITADAS', default=True, cast=bool)
+CONSULTAS_LENTAS_UMBRAL_MS = config('CONSULTAS_LENTAS_UMBRAL_MS', default=200, cast=float)
+CONSULTAS_LENTAS_MAX = config('CONSULTAS_LENTAS_MAX', default=500, cast=int)
+CONSULTAS_LENTAS_EXPLAIN = config('CONSULTAS_LENTAS_EXPLAIN', default=True, cast=bool)
+
+# Trazas por petición (common.trazas): desactivadas por defecto; se
+# registran las peticiones de al menos TRAZAS_UMBRAL_MS y cada árbol guarda
+# como mucho TRAZAS_MAX_TRAMOS tramos
+TRAZAS_HABILITADAS = config('TRAZAS_HABILITADAS', default=False, cast=bool)
+TRAZAS_UMBRAL_MS = config('TRAZAS_UMBRAL_MS', default=0, cast=float)
+TRAZAS_MAX_TRAMOS = config('TRAZAS_MAX_TRAMOS', default=500, cast=int)
+
 # Simple JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -128,7 +249,39 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    # Añade rol, unidad_id y programa_id (alcance del usuario) al token
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.core.serializers.TokenAlcanceSerializer',
+    # Lista negra propia (common.lista_negra), sin la app token_blacklist
+    'TOKEN_REFRESH_SERIALIZER': 'apps.core.serializers.TokenRefreshListaNegraSerializer',
 }
 
+# Lista negra de refresh tokens: capacidad del filtro de Bloom por proceso,
+# segundos entre sincronizaciones con la tabla y entre reconstrucciones
+# (descartan los tokens expirados)
+LISTA_NEGRA_CAPACIDAD = config('LISTA_NEGRA_CAPACIDAD', default=100000, cast=int)
+LISTA_NEGRA_SINCRONIZACION = config('LISTA_NEGRA_SINCRONIZACION', default=5, cast=int)
+LISTA_NEGRA_RECONSTRUCCION = config('LISTA_NEGRA_RECONSTRUCCION', default=3600, cast=int)
+
+# Idempotency-Key: tiempo de vida de las respuestas almacenadas, y plazo
+# tras el que una petición en proceso sin respuesta (worker caído) deja
+# de bloquear la clave y un reintento puede volver a reclamarla
+IDEMPOTENCY_KEY_TTL = timedelta(
+    seconds=config('IDEMPOTENCY_KEY_TTL', default=86400, cast=int)
+)
+IDEMPOTENCY_PROCESSING_LEASE = timedelta(
+    seconds=config('IDEMPOTENCY_PROCESSING_LEASE', default=60, cast=int)
+)
+
+# Jobs: un job EN_PROCESO sin latido ni progreso durante este tiempo se
+# considera huérfano y run_jobs lo devuelve a la cola al arrancar
+JOBS_TIMEOUT_HUERFANOS = timedelta(
+    seconds=config('JOBS_TIMEOUT_HUERFANOS', default=600, cast=int)
+)
+
+# Snapshots de periodos finalizados: documentos descomprimidos que cada
+# proceso mantiene en memoria (LRU) y segundos antes de releerlos de la base
+SNAPSHOT_CACHE_SIZE = config('SNAPSHOT_CACHE_SIZE', default=32, cast=int)
+SNAPSHOT_CACHE_TTL = config('SNAPSHOT_CACHE_TTL', default=300, cast=int)
+
 # Custom User Model
 AUTH_USER_MODEL = 'core.Usuario'
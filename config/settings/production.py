@@ -7,15 +7,40 @@ from .base import *
 # DEBUG - Cambiar a True temporalmente para diagnosticar errores
 DEBUG = config('DEBUG', default=False, cast=bool)
 
-# Database - Mantener SQLite
-# La base de datos se guardará en un volumen persistente de Render
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+# Database
+# Con DATABASE_URL se usa la configuración de base.py (PostgreSQL con
+# conexiones persistentes). Sin ella se mantiene SQLite: la base de datos
+# se guardará en un volumen persistente de Render.
+# Perfil de conexión SQLite para varios workers de gunicorn:
+# - WAL: los lectores no se bloquean detrás de un escritor
+# - synchronous=NORMAL: seguro con WAL, evita un fsync por commit
+# - busy_timeout: espera el lock en lugar de "database is locked"
+# - mmap_size / cache_size / temp_store: menos lecturas a disco
+SQLITE_BUSY_TIMEOUT_MS = config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int)
+
+SQLITE_PRAGMAS = {
+    'busy_timeout': SQLITE_BUSY_TIMEOUT_MS,
+    'journal_mode': config('SQLITE_JOURNAL_MODE', default='WAL'),
+    'synchronous': config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+    'cache_size': config('SQLITE_CACHE_SIZE', default=-65536, cast=int),  # KiB si es negativo (64 MB)
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=268435456, cast=int),  # 256 MB
+    'temp_store': config('SQLITE_TEMP_STORE', default='MEMORY'),
 }
 
+if not DATABASE_URL:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                # Timeout del driver en segundos (equivale a busy_timeout)
+                'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000,
+            },
+        }
+    }
+    if not DATABASE_REPLICA_URL:
+        DATABASES['replica'] = configuracion_replica(DATABASES['default'])
+
 # Allowed hosts
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost').split(',')
 
@@ -8,8 +8,16 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
+from common.consultas_lentas import vista_consultas_lentas
+from common.metricas import vista_metricas
+
 urlpatterns = [
     # Admin
+    path(
+        'admin/consultas-lentas/',
+        admin.site.admin_view(vista_consultas_lentas),
+        name='consultas_lentas'
+    ),
     path('admin/', admin.site.urls),
 
     # JWT Authentication
@@ -20,4 +28,8 @@ urlpatterns = [
     path('api/core/', include('apps.core.urls')),
     path('api/academico/', include('apps.academico.urls')),
     path('api/asignaciones/', include('apps.asignaciones.urls')),
+    path('api/jobs/', include('apps.jobs.urls')),
+
+    # Métricas (formato Prometheus)
+    path('metrics', vista_metricas, name='metricas'),
 ]
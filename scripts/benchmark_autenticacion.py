@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Benchmark de autenticación JWT en GET /api/asignaciones/cargas/.
+
+Compara peticiones por segundo y consultas por petición con
+JWTAuthentication (carga el Usuario en cada petición) contra
+JWTLecturaSinEstadoAuthentication (usa los claims del token en lecturas).
+
+Crea una base de pruebas temporal (la de tests de Django), la puebla con
+cargas de un programa y hace las peticiones con el cliente de pruebas como
+un responsable de programa con token Bearer.
+
+Ejecución:
+    python scripts/benchmark_autenticacion.py
+    python scripts/benchmark_autenticacion.py --segundos 10 --page-size 1
+    python scripts/benchmark_autenticacion.py --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import time as hora
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework_simplejwt.authentication import JWTAuthentication  # noqa: E402
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico, Usuario  # noqa: E402
+from apps.core.serializers import TokenAlcanceSerializer  # noqa: E402
+from apps.academico.models import Profesor, Materia  # noqa: E402
+from apps.asignaciones.models import Periodo, Carga, BloqueHorario  # noqa: E402
+from apps.asignaciones.views import CargaViewSet  # noqa: E402
+from common.autenticacion import JWTLecturaSinEstadoAuthentication  # noqa: E402
+
+MODOS = {
+    'jwt': JWTAuthentication,
+    'sin_estado': JWTLecturaSinEstadoAuthentication,
+}
+
+URL = '/api/asignaciones/cargas/'
+
+
+def poblar(cargas):
+    unidad = UnidadAcademica.objects.create(nombre='Facultad de Ingeniería')
+    programa = ProgramaAcademico.objects.create(unidad_academica=unidad, nombre='Ing. Software')
+    periodo = Periodo.objects.create(unidad_academica=unidad, nombre='2025-1')
+    profesores = Profesor.objects.bulk_create([
+        Profesor(unidad_academica=unidad, nombre=f'Profesor {i}', email=f'profesor{i}@test.com')
+        for i in range(20)
+    ])
+    materias = Materia.objects.bulk_create([
+        Materia(programa_academico=programa, clave=f'SW{i:03d}', nombre=f'Materia {i}', horas=2)
+        for i in range(cargas)
+    ])
+    creadas = Carga.objects.bulk_create([
+        Carga(
+            programa_academico=programa,
+            materia=materia,
+            profesor=profesores[i % len(profesores)],
+            periodo=periodo,
+            estado=Carga.Estado.CORRECTA
+        )
+        for i, materia in enumerate(materias)
+    ])
+    BloqueHorario.objects.bulk_create([
+        BloqueHorario(carga=carga, dia='LUN', hora_inicio=hora(8, 0), hora_fin=hora(10, 0))
+        for carga in creadas
+    ])
+
+    usuario = Usuario.objects.create_user(
+        username='resp_programa',
+        password='desarrollo123',
+        rol=Usuario.Rol.RESP_PROGRAMA,
+        programa_academico=programa
+    )
+    return str(TokenAlcanceSerializer.get_token(usuario).access_token)
+
+
+def medir(modo, token, segundos, page_size):
+    CargaViewSet.authentication_classes = [MODOS[modo]]
+    cliente = APIClient()
+    cliente.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    url = f'{URL}?page_size={page_size}'
+
+    consultas = []
+
+    def registrar(execute, sql, params, many, context):
+        consultas.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(registrar):
+        respuesta = cliente.get(url)
+    assert respuesta.status_code == 200, respuesta.status_code
+
+    peticiones = 0
+    inicio = time.perf_counter()
+    fin = inicio + segundos
+    while time.perf_counter() < fin:
+        cliente.get(url)
+        peticiones += 1
+    transcurrido = time.perf_counter() - inicio
+
+    return {
+        'modo': modo,
+        'peticiones_por_segundo': round(peticiones / transcurrido, 1),
+        'consultas_por_peticion': len(consultas),
+        'consultas_a_usuarios': sum('FROM "usuarios"' in sql for sql in consultas),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de autenticación JWT')
+    parser.add_argument('--segundos', type=float, default=5, help='Duración por modo')
+    parser.add_argument('--cargas', type=int, default=200, help='Cargas del programa')
+    parser.add_argument(
+        '--page-size', type=int, default=20,
+        help='Cargas por página (con 1 se aísla el costo de autenticación)'
+    )
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args()
+
+    setup_test_environment(debug=False)
+    nombre_original = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    original = CargaViewSet.authentication_classes
+    try:
+        token = poblar(args.cargas)
+        resultados = [medir(modo, token, args.segundos, args.page_size) for modo in MODOS]
+    finally:
+        CargaViewSet.authentication_classes = original
+        connection.creation.destroy_test_db(nombre_original, verbosity=0)
+        teardown_test_environment()
+
+    if args.json:
+        print(json.dumps(resultados, indent=2))
+        return
+
+    print(f"{'Modo':<12} {'Peticiones/s':>13} {'Consultas/petición':>19} {'A usuarios':>11}")
+    for r in resultados:
+        print(
+            f"{r['modo']:<12} {r['peticiones_por_segundo']:>13} "
+            f"{r['consultas_por_peticion']:>19} {r['consultas_a_usuarios']:>11}"
+        )
+
+
+if __name__ == '__main__':
+    main()
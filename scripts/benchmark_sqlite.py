@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+"""
+Benchmark del perfil de conexión SQLite (PRAGMAs) bajo workers concurrentes.
+
+Compara el throughput de lecturas y escrituras con la configuración por
+defecto de SQLite contra el perfil de producción (WAL, synchronous=NORMAL,
+busy_timeout, mmap_size, cache_size, temp_store), usando procesos que
+simulan workers de gunicorn sobre un archivo temporal.
+
+Lecturas: consulta de ocupación de un profesor en un periodo (la misma
+forma que usa ValidadorConflictos). Escrituras: una carga con 3 bloques
+por transacción.
+
+Ejecución:
+    python scripts/benchmark_sqlite.py
+    python scripts/benchmark_sqlite.py --lectores 8 --escritores 2 --segundos 10
+    python scripts/benchmark_sqlite.py --json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.db import aplicar_pragmas  # noqa: E402
+
+PERFILES = {
+    'default': {},
+    'ajustado': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    },
+}
+
+PROFESORES = 500
+PERIODOS = 4
+DIAS = ['LUN', 'MAR', 'MIE', 'JUE', 'VIE']
+
+CONSULTA_OCUPACION = (
+    'SELECT b.carga_id, b.dia, b.hora_inicio, b.hora_fin '
+    'FROM bloques_horarios b JOIN cargas c ON c.id = b.carga_id '
+    'WHERE c.profesor_id = ? AND c.periodo_id = ?'
+)
+
+
+def conectar(ruta, pragmas):
+    # timeout=5 es el valor por defecto del driver (igual que Django)
+    conexion = sqlite3.connect(ruta, timeout=5, isolation_level=None)
+    aplicar_pragmas(conexion, pragmas)
+    return conexion
+
+
+def preparar_base(ruta, cargas_iniciales):
+    conexion = sqlite3.connect(ruta, isolation_level=None)
+    conexion.executescript('''
+        CREATE TABLE cargas (
+            id INTEGER PRIMARY KEY,
+            profesor_id INTEGER,
+            periodo_id INTEGER NOT NULL,
+            estado TEXT NOT NULL
+        );
+        CREATE TABLE bloques_horarios (
+            id INTEGER PRIMARY KEY,
+            carga_id INTEGER NOT NULL REFERENCES cargas(id),
+            dia TEXT NOT NULL,
+            hora_inicio TEXT NOT NULL,
+            hora_fin TEXT NOT NULL
+        );
+        CREATE INDEX cargas_profesor_periodo ON cargas (profesor_id, periodo_id);
+        CREATE INDEX bloques_carga ON bloques_horarios (carga_id);
+    ''')
+    rnd = random.Random(0)
+    conexion.execute('BEGIN')
+    for _ in range(cargas_iniciales):
+        _insertar_carga(conexion, rnd)
+    conexion.execute('COMMIT')
+    conexion.close()
+
+
+def _insertar_carga(conexion, rnd):
+    cursor = conexion.execute(
+        'INSERT INTO cargas (profesor_id, periodo_id, estado) VALUES (?, ?, ?)',
+        (rnd.randint(1, PROFESORES), rnd.randint(1, PERIODOS), 'CORRECTA')
+    )
+    for _ in range(3):
+        inicio = rnd.randint(7, 19)
+        conexion.execute(
+            'INSERT INTO bloques_horarios (carga_id, dia, hora_inicio, hora_fin) VALUES (?, ?, ?, ?)',
+            (cursor.lastrowid, rnd.choice(DIAS), f'{inicio:02d}:00:00', f'{inicio + 2:02d}:00:00')
+        )
+
+
+def trabajador(ruta, pragmas, tipo, segundos, semilla, resultados):
+    rnd = random.Random(semilla)
+    conexion = conectar(ruta, pragmas)
+    operaciones = 0
+    errores = 0
+    fin = time.perf_counter() + segundos
+
+    while time.perf_counter() < fin:
+        try:
+            if tipo == 'lectura':
+                conexion.execute(
+                    CONSULTA_OCUPACION,
+                    (rnd.randint(1, PROFESORES), rnd.randint(1, PERIODOS))
+                ).fetchall()
+            else:
+                conexion.execute('BEGIN IMMEDIATE')
+                _insertar_carga(conexion, rnd)
+                conexion.execute('COMMIT')
+            operaciones += 1
+        except sqlite3.OperationalError:
+            errores += 1
+            if conexion.in_transaction:
+                conexion.execute('ROLLBACK')
+
+    conexion.close()
+    resultados.put((tipo, operaciones, errores))
+
+
+def ejecutar_perfil(nombre, pragmas, args):
+    directorio = tempfile.mkdtemp(prefix='bench_sqlite_')
+    ruta = os.path.join(directorio, 'bench.sqlite3')
+    preparar_base(ruta, args.cargas)
+
+    resultados = multiprocessing.Queue()
+    procesos = [
+        multiprocessing.Process(
+            target=trabajador,
+            args=(ruta, pragmas, tipo, args.segundos, i, resultados)
+        )
+        for i, tipo in enumerate(['lectura'] * args.lectores + ['escritura'] * args.escritores)
+    ]
+    for proceso in procesos:
+        proceso.start()
+
+    totales = {'lectura': [0, 0], 'escritura': [0, 0]}
+    for _ in procesos:
+        tipo, operaciones, errores = resultados.get()
+        totales[tipo][0] += operaciones
+        totales[tipo][1] += errores
+    for proceso in procesos:
+        proceso.join()
+
+    for archivo in os.listdir(directorio):
+        os.remove(os.path.join(directorio, archivo))
+    os.rmdir(directorio)
+
+    return {
+        'perfil': nombre,
+        'lecturas_por_segundo': round(totales['lectura'][0] / args.segundos, 1),
+        'escrituras_por_segundo': round(totales['escritura'][0] / args.segundos, 1),
+        'errores_lectura': totales['lectura'][1],
+        'errores_escritura': totales['escritura'][1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de PRAGMAs de SQLite')
+    parser.add_argument('--lectores', type=int, default=4, help='Procesos lectores')
+    parser.add_argument('--escritores', type=int, default=2, help='Procesos escritores')
+    parser.add_argument('--segundos', type=float, default=5, help='Duración por perfil')
+    parser.add_argument('--cargas', type=int, default=20000, help='Cargas iniciales')
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args()
+
+    resultados = [ejecutar_perfil(nombre, pragmas, args) for nombre, pragmas in PERFILES.items()]
+
+    if args.json:
+        print(json.dumps(resultados, indent=2))
+        return
+
+    print(f"{'Perfil':<10} {'Lecturas/s':>12} {'Escrituras/s':>14} {'Err. lect.':>11} {'Err. escr.':>11}")
+    for r in resultados:
+        print(
+            f"{r['perfil']:<10} {r['lecturas_por_segundo']:>12} {r['escrituras_por_segundo']:>14} "
+            f"{r['errores_lectura']:>11} {r['errores_escritura']:>11}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,376 @@
+#!/usr/bin/env python
+"""
+Generador de datos sintéticos a escala de producción.
+
+IMPORTANTE: Este script es EXCLUSIVO para entorno de desarrollo.
+NO ejecutar en producción.
+
+A diferencia de populate_dev_data.py (un registro a la vez con
+get_or_create), inserta con bulk_create por lotes y genera distribuciones
+realistas:
+- Materias de 3 a 6 horas repartidas en bloques de 1 a 3 horas en días
+  distintos, entre las 7:00 y las 21:00
+- Cargas correctas sin solapamientos por profesor y periodo
+- Una fracción de cargas pendientes (sin profesor, sin bloques o con horas
+  que no coinciden con la materia)
+- Una fracción de conflictos deliberados (bloques que se solapan con otra
+  carga del mismo profesor en el periodo)
+
+Con la misma --semilla se obtienen los mismos datos. Escribe en la base
+por defecto; con SHARDING_POR_UNIDAD, repartir después con
+`python manage.py dividir_por_unidad`.
+
+Ejecución:
+    python scripts/generar_datos_masivos.py
+    python scripts/generar_datos_masivos.py --unidades 20 --profesores 5000 --cargas 200000 --semilla 7
+    python scripts/generar_datos_masivos.py --limpiar
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import time as hora
+
+import django
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import transaction  # noqa: E402
+
+from apps.core.models import UnidadAcademica, ProgramaAcademico  # noqa: E402
+from apps.academico.models import Profesor, Materia  # noqa: E402
+from apps.asignaciones.models import Periodo, Carga, BloqueHorario  # noqa: E402
+from apps.asignaciones.services import CargaLoteService  # noqa: E402
+
+User = get_user_model()
+
+PREFIJO_UNIDAD = 'Unidad Sintética'
+PREFIJO_USUARIO = 'sintetico_'
+PASSWORD = 'desarrollo123'
+
+# Horas por semana de las materias y su frecuencia
+HORAS_MATERIA = [3, 4, 5, 6]
+PESOS_HORAS = [15, 35, 15, 35]
+
+# Formas de repartir las horas de una materia en bloques
+DIVISIONES = {
+    3: [(3,), (2, 1)],
+    4: [(2, 2)],
+    5: [(3, 2), (2, 2, 1)],
+    6: [(2, 2, 2), (3, 3)],
+}
+
+DIAS = ['LUN', 'MAR', 'MIE', 'JUE', 'VIE']
+HORA_INICIO = 7
+HORAS_POR_DIA = 14  # 7:00 a 21:00
+
+# Intentos (profesores distintos) antes de dejar una carga sin profesor
+INTENTOS_PROFESOR = 8
+
+
+def insertar(modelo, objetos, lote):
+    """bulk_create por lotes; devuelve los objetos con su PK."""
+    creados = []
+    for i in range(0, len(objetos), lote):
+        creados.extend(modelo.objects.bulk_create(objetos[i:i + lote], batch_size=lote))
+    if creados and creados[0].pk is None:
+        sys.exit('La base de datos no devuelve las PK de bulk_create (se requiere SQLite >= 3.35 o PostgreSQL).')
+    return creados
+
+
+class Horarios:
+    """
+    Ocupación semanal de cada profesor por periodo: una máscara de bits por
+    día, un bit por hora a partir de las 7:00.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.ocupado = defaultdict(int)
+
+    def colocar(self, profesor_id, periodo_id, duraciones):
+        """
+        Busca días distintos con huecos libres para los bloques.
+
+        Returns:
+            Lista de (dia, inicio, duracion), o None si no caben
+        """
+        dias = self.rng.sample(range(len(DIAS)), len(duraciones))
+        bloques = []
+        for dia, duracion in zip(dias, duraciones):
+            mascara = self.ocupado[(profesor_id, periodo_id, dia)]
+            ventana = (1 << duracion) - 1
+            libres = [
+                inicio for inicio in range(HORAS_POR_DIA - duracion + 1)
+                if not mascara & (ventana << inicio)
+            ]
+            if not libres:
+                return None
+            bloques.append((dia, self.rng.choice(libres), duracion))
+
+        self.ocupar(profesor_id, periodo_id, bloques)
+        return bloques
+
+    def solapar(self, profesor_id, periodo_id, duraciones):
+        """
+        Bloques cuyo primero se solapa con una hora ya ocupada del profesor
+        (conflicto deliberado). None si el profesor no tiene nada asignado.
+        """
+        ocupados = [
+            (dia, inicio)
+            for dia in range(len(DIAS))
+            for inicio in range(HORAS_POR_DIA)
+            if self.ocupado[(profesor_id, periodo_id, dia)] & (1 << inicio)
+        ]
+        if not ocupados:
+            return None
+
+        dia, inicio = self.rng.choice(ocupados)
+        inicio = min(inicio, HORAS_POR_DIA - duraciones[0])
+        otros_dias = self.rng.sample([d for d in range(len(DIAS)) if d != dia], len(duraciones) - 1)
+        bloques = [(dia, inicio, duraciones[0])] + [
+            (otro, self.rng.randrange(HORAS_POR_DIA - duracion + 1), duracion)
+            for otro, duracion in zip(otros_dias, duraciones[1:])
+        ]
+        self.ocupar(profesor_id, periodo_id, bloques)
+        return bloques
+
+    def ocupar(self, profesor_id, periodo_id, bloques):
+        for dia, inicio, duracion in bloques:
+            self.ocupado[(profesor_id, periodo_id, dia)] |= ((1 << duracion) - 1) << inicio
+
+
+def bloque_horario(carga_id, dia, inicio, duracion):
+    # Asignar IDs (no instancias) evita el costo de los descriptores de FK
+    return BloqueHorario(
+        carga_id=carga_id,
+        dia=DIAS[dia],
+        hora_inicio=hora(HORA_INICIO + inicio),
+        hora_fin=hora(HORA_INICIO + inicio + duracion)
+    )
+
+
+def generar_maestros(args, rng):
+    """Unidades, programas, materias, profesores, responsables y periodos."""
+    unidades = insertar(UnidadAcademica, [
+        UnidadAcademica(nombre=f'{PREFIJO_UNIDAD} {i:03d}')
+        for i in range(1, args.unidades + 1)
+    ], args.lote)
+
+    programas = insertar(ProgramaAcademico, [
+        ProgramaAcademico(unidad_academica=unidad, nombre=f'Programa {j:02d} - {unidad.nombre}')
+        for unidad in unidades
+        for j in range(1, args.programas + 1)
+    ], args.lote)
+
+    materias = insertar(Materia, [
+        Materia(
+            programa_academico=programa,
+            clave=f'M{programa.id}-{k:03d}',
+            nombre=f'Materia {k:03d}',
+            horas=rng.choices(HORAS_MATERIA, PESOS_HORAS)[0]
+        )
+        for programa in programas
+        for k in range(1, args.materias + 1)
+    ], args.lote)
+
+    profesores = insertar(Profesor, [
+        Profesor(
+            unidad_academica=unidades[n % len(unidades)],
+            nombre=f'Profesor Sintético {n:05d}',
+            email=f'profesor{n:05d}@sintetico.edu'
+        )
+        for n in range(args.profesores)
+    ], args.lote)
+
+    password = make_password(PASSWORD)
+    insertar(User, [
+        User(
+            username=f'{PREFIJO_USUARIO}unidad_{unidad.id}',
+            password=password,
+            rol=User.Rol.RESP_UNIDAD,
+            unidad_academica=unidad
+        )
+        for unidad in unidades
+    ] + [
+        User(
+            username=f'{PREFIJO_USUARIO}programa_{programa.id}',
+            password=password,
+            rol=User.Rol.RESP_PROGRAMA,
+            programa_academico=programa
+        )
+        for programa in programas
+    ], args.lote)
+
+    periodos = insertar(Periodo, [
+        Periodo(unidad_academica=unidad, nombre=f'{2020 + k // 2}-{k % 2 + 1}')
+        for unidad in unidades
+        for k in range(args.periodos)
+    ], args.lote)
+
+    return unidades, programas, materias, profesores, periodos
+
+
+def generar_cargas(args, rng, programas, materias, profesores, periodos):
+    """Cargas y bloques por lotes; devuelve el conteo por tipo."""
+    programas_por_unidad = defaultdict(list)
+    for programa in programas:
+        programas_por_unidad[programa.unidad_academica_id].append(programa.id)
+    materias_por_programa = defaultdict(list)
+    for materia in materias:
+        materias_por_programa[materia.programa_academico_id].append((materia.id, materia.horas))
+    profesores_por_unidad = defaultdict(list)
+    for profesor in profesores:
+        profesores_por_unidad[profesor.unidad_academica_id].append(profesor.id)
+
+    horarios = Horarios(rng)
+    conteo = defaultdict(int)
+
+    def nueva_carga(periodo):
+        programa_id = rng.choice(programas_por_unidad[periodo.unidad_academica_id])
+        materia_id, horas = rng.choice(materias_por_programa[programa_id])
+        candidatos = profesores_por_unidad[periodo.unidad_academica_id]
+        duraciones = rng.choice(DIVISIONES[horas])
+        carga = Carga(
+            programa_academico_id=programa_id,
+            materia_id=materia_id,
+            periodo_id=periodo.id,
+            estado=Carga.Estado.CORRECTA
+        )
+
+        azar = rng.random()
+        if azar < args.pendientes:
+            carga.estado = Carga.Estado.PENDIENTE
+            tipo = rng.choices(['sin_profesor', 'sin_bloques', 'horas_distintas'], [50, 25, 25])[0]
+            conteo[f'pendientes_{tipo}'] += 1
+            if tipo == 'sin_profesor':
+                return carga, [(dia, rng.randrange(HORAS_POR_DIA - 1), 2) for dia in rng.sample(range(len(DIAS)), 2)]
+            carga.profesor_id = rng.choice(candidatos) if candidatos else None
+            if tipo == 'sin_bloques' or carga.profesor_id is None:
+                return carga, []
+            # Falta un bloque: las horas no suman las de la materia
+            bloques = horarios.colocar(carga.profesor_id, periodo.id, duraciones[:-1] or (1,))
+            return carga, bloques or []
+
+        if azar < args.pendientes + args.conflictos and candidatos:
+            profesor_id = rng.choice(candidatos)
+            bloques = horarios.solapar(profesor_id, periodo.id, duraciones)
+            if bloques:
+                carga.profesor_id = profesor_id
+                conteo['conflictos'] += 1
+                return carga, bloques
+
+        for profesor_id in rng.sample(candidatos, min(INTENTOS_PROFESOR, len(candidatos))):
+            bloques = horarios.colocar(profesor_id, periodo.id, duraciones)
+            if bloques:
+                carga.profesor_id = profesor_id
+                conteo['correctas'] += 1
+                return carga, bloques
+
+        # Sin profesor con horario libre: queda pendiente
+        carga.estado = Carga.Estado.PENDIENTE
+        conteo['pendientes_sin_hueco'] += 1
+        return carga, []
+
+    total_bloques = 0
+    for inicio in range(0, args.cargas, args.lote):
+        lote = [
+            nueva_carga(periodos[indice % len(periodos)])
+            for indice in range(inicio, min(inicio + args.lote, args.cargas))
+        ]
+        with transaction.atomic():
+            cargas = Carga.objects.bulk_create([carga for carga, _ in lote], batch_size=args.lote)
+            bloques = [
+                bloque_horario(carga.pk, *bloque)
+                for carga, (_, bloques_carga) in zip(cargas, lote)
+                for bloque in bloques_carga
+            ]
+            BloqueHorario.objects.bulk_create(bloques, batch_size=args.lote)
+        total_bloques += len(bloques)
+
+    conteo['bloques'] = total_bloques
+    return dict(conteo)
+
+
+def limpiar():
+    """
+    Elimina lo generado por este script. Las cargas se borran con
+    CargaLoteService.eliminar_cargas (DELETE masivo); el resto, en cascada.
+    """
+    with transaction.atomic():
+        CargaLoteService.eliminar_cargas(
+            Carga.objects.filter(periodo__unidad_academica__nombre__startswith=PREFIJO_UNIDAD)
+        )
+        User.objects.filter(username__startswith=PREFIJO_USUARIO).delete()
+        UnidadAcademica.objects.filter(nombre__startswith=PREFIJO_UNIDAD).delete()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generador de datos sintéticos a gran escala')
+    parser.add_argument('--unidades', type=int, default=20, help='Unidades académicas')
+    parser.add_argument('--programas', type=int, default=5, help='Programas por unidad')
+    parser.add_argument('--materias', type=int, default=40, help='Materias por programa')
+    parser.add_argument('--profesores', type=int, default=5000, help='Profesores (repartidos entre unidades)')
+    parser.add_argument('--periodos', type=int, default=4, help='Periodos por unidad')
+    parser.add_argument('--cargas', type=int, default=200000, help='Cargas en total')
+    parser.add_argument('--pendientes', type=float, default=0.10, help='Fracción de cargas pendientes')
+    parser.add_argument('--conflictos', type=float, default=0.02, help='Fracción de conflictos deliberados')
+    parser.add_argument('--semilla', type=int, default=42, help='Semilla del generador aleatorio')
+    parser.add_argument('--lote', type=int, default=5000, help='Filas por bulk_create')
+    parser.add_argument('--limpiar', action='store_true', help='Eliminar antes los datos sintéticos')
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args()
+
+    if args.unidades < 1 or args.programas < 1 or args.materias < 1 or args.periodos < 1:
+        parser.error('--unidades, --programas, --materias y --periodos deben ser al menos 1')
+
+    rng = random.Random(args.semilla)
+    tiempos = {}
+
+    if args.limpiar:
+        inicio = time.perf_counter()
+        limpiar()
+        tiempos['limpiar'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with transaction.atomic():
+        unidades, programas, materias, profesores, periodos = generar_maestros(args, rng)
+    tiempos['maestros'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    conteo = generar_cargas(args, rng, programas, materias, profesores, periodos)
+    tiempos['cargas'] = time.perf_counter() - inicio
+
+    resultado = {
+        'unidades': len(unidades),
+        'programas': len(programas),
+        'materias': len(materias),
+        'profesores': len(profesores),
+        'periodos': len(periodos),
+        'cargas': args.cargas,
+        **conteo,
+        'segundos': {fase: round(segundos, 2) for fase, segundos in tiempos.items()},
+    }
+
+    if args.json:
+        print(json.dumps(resultado, indent=2))
+        return
+
+    for clave, valor in resultado.items():
+        if clave != 'segundos':
+            print(f'{clave:<28} {valor:>10}')
+    for fase, segundos in resultado['segundos'].items():
+        print(f'{"segundos_" + fase:<28} {segundos:>10}')
+    print(f'\nUsuarios: {PREFIJO_USUARIO}unidad_<id> / {PREFIJO_USUARIO}programa_<id> (contraseña: {PASSWORD})')
+
+
+if __name__ == '__main__':
+    main()